@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -48,6 +48,91 @@ class Settings(BaseSettings):
     VERIFIER_MODEL_NAME: str = "gemini-2.5-flash"
     VERIFIER_TEMP: float = 0.0
 
+    PROMPT_CACHING_ENABLED: bool = True  # mark static prompt prefixes and older history as cacheable (Anthropic)
+    PROMPT_CACHE_TTL: str = "5m"  # "5m" or "1h" (1h costs more to write; pays off for slow-paced conversations)
+    PROMPT_CACHE_MIN_TOKENS: int = 1024  # Anthropic does not cache shorter prefixes (2048-4096 on Haiku models)
+
+    # --------------------
+    # Routing
+    # --------------------
+    ROUTER_FAST_PATH_ENABLED: bool = True
+    ROUTER_FAST_PATH_THRESHOLD: float = 0.9  # min confidence to skip the router LLM
+    ROUTER_CLASSIFIER_MIN_SAMPLES: int = 50  # past decisions needed before the n-gram classifier is trusted
+    ROUTER_DECISIONS_FILE_NAME: str = "router_decisions.jsonl"
+    ROUTER_DECISIONS_LOG_ENABLED: bool = True  # persist router LLM decisions (raw user queries!) to train the classifier
+    ROUTER_DECISIONS_MAX_BYTES: int = 1_000_000  # rotate the log at this size; one previous generation is kept
+
+    # --------------------
+    # Tool execution
+    # --------------------
+    TOOL_MAX_WORKERS: int = 8  # bound on concurrently running tool calls
+    TOOL_MAX_ABANDONED: int = 8  # timed-out calls still running in the background; beyond this new calls are refused
+    TOOL_TIMEOUT_SECONDS: float = 30.0
+    TOOL_TIMEOUTS: Dict[str, float] = {  # per-tool overrides
+        "search_flights_tool": 45.0,
+        "search_flight_matrix_tool": 60.0,
+        "itinerary_briefing_tool": 60.0,
+        "get_current_local_datetime": 5.0,
+    }
+    TOOL_MEMO_ENABLED: bool = True  # reuse a tool's result for the same arguments within one conversation
+    TOOL_MEMO_FILE_NAME: str = "tool_memo.sqlite3"
+    TOOL_MEMO_DEFAULT_TTL_SECONDS: float = 3600
+    TOOL_MEMO_TTLS: Dict[str, float] = {  # per-tool TTL in seconds; 0 = never memoize
+        "get_current_time": 0,
+        "get_current_times_tool": 0,
+        "get_current_local_datetime": 0,
+        "search_flights_tool": 5 * 60,  # prices and availability move quickly
+        "search_flight_matrix_tool": 5 * 60,
+        "get_place_climate": 30 * 24 * 3600,
+        "get_travel_warnings": 24 * 3600,
+        "get_israeli_embassy_contacts": 24 * 3600,
+        "get_entry_requirements": 24 * 3600,
+        "get_entry_requirements_batch_tool": 24 * 3600,
+        "travel_recommendations_tool": 24 * 3600,
+    }
+
+    # --------------------
+    # Geocoding
+    # --------------------
+    GEOCODE_CACHE_ENABLED: bool = True
+    GEOCODE_INDEX_FILE_NAME: str = "geocode_index.sqlite3"
+    GEOCODE_GAZETTEER_FILE_NAME: str = "gazetteer_cities.json"
+    GEOCODE_LRU_SIZE: int = 1024
+    GEOCODE_FUZZY_CUTOFF: float = 0.88  # difflib similarity needed to accept a near-miss name
+
+    # --------------------
+    # Climate
+    # --------------------
+    CLIMATE_NORMALS_FILE_NAME: str = "climate_normals.sqlite3"
+    CLIMATE_GRID_DEGREES: float = 0.25  # ERA5 native resolution; places in one cell share normals
+
+    # --------------------
+    # Timezones
+    # --------------------
+    TIMEZONE_TRANSITION_YEARS: int = 2  # years after the current one covered by each zone's DST transition table
+    TIMEZONE_REMOTE_CROSSCHECK: bool = False  # also query WorldTimeAPI and log where it disagrees with local tzdata
+
+    # --------------------
+    # Datasets
+    # --------------------
+    TRAVEL_WARNINGS_WARMUP: bool = True  # load the travel warnings dataset on a background thread at boot
+    DATASET_BINARY_CACHE: bool = True  # load cached datasets from a memory-mapped columnar copy instead of JSON
+    DATASET_REFRESH_RETRY_SECONDS: float = 300  # after a failed background refresh, wait this long before retrying
+
+    # --------------------
+    # Semantic answer cache (DIRECT route)
+    # --------------------
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.85  # cosine similarity needed to reuse a stored answer
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 2000
+    SEMANTIC_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    SEMANTIC_CACHE_DIM: int = 1024  # hashed embedding size
+
+    # --------------------
+    # Finalization
+    # --------------------
+    SPECULATIVE_FINALIZATION: bool = False  # publish PLAN answers before the verifier's verdict
+
     # --------------------
     # Summarization
     # --------------------
@@ -70,6 +155,38 @@ class Settings(BaseSettings):
     AMADEUS_TOKEN_URL: str = (
         "https://test.api.amadeus.com/v1/security/oauth2/token"
     )
+    AMADEUS_TOKEN_REFRESH_MARGIN_SECONDS: float = 300  # refresh in the background this long before expiry
+    AMADEUS_CACHE_BACKEND: str = "sqlite"  # "memory" (per process), "sqlite" (shared on the host) or "none"
+    AMADEUS_CACHE_FILE_NAME: str = "amadeus_responses.sqlite3"
+    AMADEUS_CACHE_MAX_ENTRIES: int = 512  # in-process LRU size
+    AMADEUS_CACHE_MEMORY_TTL_SECONDS: float = 300  # cap on how long the in-process tier keeps an entry
+    AMADEUS_CACHE_TTLS: Dict[str, float] = {  # GET path prefix -> TTL seconds (longest prefix wins)
+        "/v1/reference-data/locations": 30 * 24 * 3600,  # city / airport reference data rarely changes
+        "/v1/shopping/activities": 6 * 3600,
+        "/v2/shopping/flight-offers": 5 * 60,  # prices and availability move quickly
+    }
+    FLIGHT_CURRENCY_CODE: str = "EUR"  # pinned on every offer search so prices from different searches are comparable
+    FLIGHT_MATRIX_MAX_QUERIES: int = 30  # cap on origin x destination x date combinations per batch search
+    FLIGHT_MATRIX_CONCURRENCY: int = 4  # concurrent flight-offer requests per batch search
+    FLIGHT_MATRIX_TOP_OFFERS: int = 5  # cheapest offers listed with the price matrix
+
+    # --------------------
+    # Visa requirements
+    # --------------------
+    VISA_MATRIX_FILE_NAME: str = "visa_matrix.sqlite3"
+    VISA_MATRIX_TTL_SECONDS: float = 7 * 24 * 3600  # visa rules change rarely
+    VISA_MATRIX_VERSION: str = "1"  # bump to invalidate every stored rule (provider or normalized shape changed)
+    VISA_BATCH_CONCURRENCY: int = 3  # concurrent lookups per multi-destination request
+    VISA_PREWARM_ON_STARTUP: bool = False  # fill missing / stale matrix entries on a background thread at boot
+    VISA_PREWARM_PASSPORTS: List[str] = ["IL"]
+    VISA_PREWARM_DESTINATIONS: List[str] = []  # empty = every country in app/data/country_aliases.json
+    VISA_PREWARM_MAX_CALLS: int = 150  # per run; leaves most of the RapidAPI daily quota to live traffic
+
+    # --------------------
+    # Itinerary briefing
+    # --------------------
+    ITINERARY_MAX_STOPS: int = 10
+    ITINERARY_CONCURRENCY: int = 8  # concurrent per-country / per-stop lookups in one briefing
 
     # --------------------
     # Weather
@@ -89,7 +206,47 @@ class Settings(BaseSettings):
     # --------------------
     # HTTP
     # --------------------
-    HTTP_TIMEOUT: int = 10
+    HTTP_TIMEOUT: int = 10  # default when a host has no entry in HTTP_HOST_TIMEOUTS
+    HTTP_HOST_TIMEOUTS: Dict[str, float] = {
+        "data.gov.il": 20.0,
+        "visa-requirement.p.rapidapi.com": 15.0,
+        "worldtimeapi.org": 5.0,  # a dead time API must not stall a turn
+        "test.api.amadeus.com": 10.0,
+    }
+    HTTP_POOL_CONNECTIONS: int = 10  # number of per-host pools kept alive
+    HTTP_POOL_MAXSIZE: int = 20  # keep-alive connections per host
+    HTTP_MAX_RETRIES: int = 2
+    HTTP_BACKOFF_FACTOR: float = 0.3  # sleeps 0.3s, 0.6s, ... between retries
+    HTTP_RETRY_STATUSES: list[int] = [429, 500, 502, 503, 504]
+    HTTP2_ENABLED: bool = True  # async client only; requires the optional `h2` package
+    HTTP_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive failed calls before a host's circuit opens
+    HTTP_BREAKER_RESET_SECONDS: float = 30.0  # how long an open circuit fails fast before a probe call
+    HTTP_HEDGE_ENABLED: bool = True  # send a second copy of a GET that is slower than the endpoint's p95
+    HTTP_HEDGE_MIN_SAMPLES: int = 20  # successful calls needed before an endpoint's p95 is trusted
+    HTTP_HEDGE_MIN_DELAY: float = 0.05  # never hedge earlier than this (seconds)
+    HTTP_HEDGE_WINDOW: int = 200  # recent latencies kept per endpoint (host + path)
+    HTTP_HEDGE_KEY_PARAMS: List[str] = ["resource_id"]  # query parameters that select a different resource on one path
+    HTTP_HEDGE_WORKERS: int = 16  # threads for hedged sync requests
+
+    # --------------------
+    # Rate limits
+    # --------------------
+    RATE_LIMITS: Dict[str, Dict[str, float]] = {  # provider -> rate (req/s), burst, daily (0 = unlimited), max_wait (s)
+        "amadeus": {"rate": 10, "burst": 10, "daily": 0, "max_wait": 5},  # test tier: 10 TPS
+        "rapidapi": {"rate": 1, "burst": 3, "daily": 500, "max_wait": 5},
+        "open_meteo": {"rate": 8, "burst": 20, "daily": 10_000, "max_wait": 5},  # free tier: 600/min, 10k/day
+        "worldtimeapi": {"rate": 2, "burst": 5, "daily": 0, "max_wait": 3},
+    }
+    RATE_LIMIT_HOSTS: Dict[str, str] = {  # host -> provider in RATE_LIMITS
+        "test.api.amadeus.com": "amadeus",
+        "api.amadeus.com": "amadeus",
+        "visa-requirement.p.rapidapi.com": "rapidapi",
+        "api.open-meteo.com": "open_meteo",
+        "archive-api.open-meteo.com": "open_meteo",
+        "geocoding-api.open-meteo.com": "open_meteo",
+        "worldtimeapi.org": "worldtimeapi",
+    }
+    RATE_LIMIT_QUOTA_FILE_NAME: str = "provider_quotas.sqlite3"
 
     # --------------------
     # Database
@@ -1,14 +1,17 @@
 from __future__ import annotations
-from datetime import datetime
-from collections import defaultdict
 from typing import Dict, Any, Union
-import requests
-from app.config.settings import settings
+from app.domain.climate_normals import compute_monthly_normals, get_normals_store, grid_cell
+from app.domain.geocoding import lookup_place, remember_place
+from app.infrastructure.async_http import ahttp_get
+from app.infrastructure.http_client import http_get
 
 """
 Domain logic for climate data using Open-Meteo API.
 Fetches historical climate data for a given place and month.
-Returns average temperature and precipitation.
+Returns average temperature and precipitation, plus temperature range, percentiles,
+rainy days and year-over-year variability for the month.
+Place names are resolved through the local geocoding index first; the geocoding API is only called on a miss.
+Monthly normals are stored per grid cell, so one ERA5 download answers all 12 months for that location.
 """
 
 # ------------------------------------------------------------
@@ -57,91 +60,148 @@ def _normalize_month(month: Union[str, int]) -> tuple[int, str]:
 # Fetch & normalize
 # ------------------------------------------------------------
 
+def _geocode_params(place_name: str) -> Dict[str, Any]:
+    return {
+        "name": place_name,
+        "count": 1,
+        "language": "en",
+        "format": "json",
+    }
+
+
+def _parse_geocode(data: Dict[str, Any], place_name: str) -> Dict[str, Any]:
+    if not data.get("results"):
+        raise ClimateServiceError(
+            f"No coordinates found for '{place_name}'."
+        )
+
+    r = data["results"][0]
+    return {
+        "name": r["name"],
+        "country": r.get("country", "Unknown"),
+        "country_code": r.get("country_code"),
+        "latitude": r["latitude"],
+        "longitude": r["longitude"],
+    }
+
+
+def _climate_params(latitude: float, longitude: float) -> Dict[str, Any]:
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "start_date": "2010-01-01",
+        "end_date": "2020-12-31",
+        "daily": [
+            "temperature_2m_mean",
+            "precipitation_sum",
+        ],
+        "timezone": "UTC",
+    }
+
+
+def _month_from_normals(normals: Dict[int, Dict[str, float]], month_num: int) -> Dict[str, float]:
+    if month_num not in normals:
+        raise ClimateServiceError("No climate data for given month.")
+
+    return dict(normals[month_num])
+
+
 def _geocode(place_name: str) -> Dict[str, Any]:
+    cached = lookup_place(place_name)
+    if cached:
+        return cached
+
     try:
-        response = requests.get(
+        response = http_get(
             GEOCODE_URL,
-            params={
-                "name": place_name,
-                "count": 1,
-                "language": "en",
-                "format": "json",
-            },
-            timeout=settings.HTTP_TIMEOUT,
+            params=_geocode_params(place_name),
         )
         response.raise_for_status()
-        data = response.json()
+        location = _parse_geocode(response.json(), place_name)
 
-        if not data.get("results"):
-            raise ClimateServiceError(
-                f"No coordinates found for '{place_name}'."
-            )
+    except Exception as exc:
+        raise ClimateServiceError("Failed to geocode place") from exc
 
-        r = data["results"][0]
-        return {
-            "name": r["name"],
-            "country": r.get("country", "Unknown"),
-            "latitude": r["latitude"],
-            "longitude": r["longitude"],
-        }
+    remember_place(place_name, location)
+    return location
+
+
+async def _ageocode(place_name: str) -> Dict[str, Any]:
+    cached = lookup_place(place_name)
+    if cached:
+        return cached
+
+    try:
+        response = await ahttp_get(
+            GEOCODE_URL,
+            params=_geocode_params(place_name),
+        )
+        response.raise_for_status()
+        location = _parse_geocode(response.json(), place_name)
 
     except Exception as exc:
         raise ClimateServiceError("Failed to geocode place") from exc
 
+    remember_place(place_name, location)
+    return location
+
 
 def _fetch_monthly_climate(
     latitude: float,
     longitude: float,
     month_num: int,
 ) -> Dict[str, float]:
-    try:
-        response = requests.get(
-            CLIMATE_URL,
-            params={
-                "latitude": latitude,
-                "longitude": longitude,
-                "start_date": "2010-01-01",
-                "end_date": "2020-12-31",
-                "daily": [
-                    "temperature_2m_mean",
-                    "precipitation_sum",
-                ],
-                "timezone": "UTC",
-            },
-            timeout=settings.HTTP_TIMEOUT,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        dates = data["daily"]["time"]
-        temps = data["daily"]["temperature_2m_mean"]
-        rain = data["daily"]["precipitation_sum"]
-
-        month_temps = []
-        rain_by_year = defaultdict(float)
-
-        for d, t, r in zip(dates, temps, rain):
-            dt = datetime.fromisoformat(d)
-            if dt.month == month_num:
-                month_temps.append(t)
-                rain_by_year[dt.year] += r
-
-        if not month_temps:
-            raise ClimateServiceError("No climate data for given month.")
-
-        return {
-            "average_temperature_c": round(
-                sum(month_temps) / len(month_temps), 1
-            ),
-            "average_precipitation_mm": round(
-                sum(rain_by_year.values()) / len(rain_by_year), 1
-            ),
-        }
+    cell = grid_cell(latitude, longitude)
+    store = get_normals_store()
 
-    except Exception as exc:
-        raise ClimateServiceError(
-            "Failed to fetch climate data"
-        ) from exc
+    normals = store.get(cell)
+    if normals is None:
+        try:
+            response = http_get(
+                CLIMATE_URL,
+                params=_climate_params(*cell),
+            )
+            response.raise_for_status()
+            normals = compute_monthly_normals(response.json())
+
+        except Exception as exc:
+            raise ClimateServiceError(
+                "Failed to fetch climate data"
+            ) from exc
+
+        if normals:
+            store.put(cell, normals)
+
+    return _month_from_normals(normals, month_num)
+
+
+async def _afetch_monthly_climate(
+    latitude: float,
+    longitude: float,
+    month_num: int,
+) -> Dict[str, float]:
+    cell = grid_cell(latitude, longitude)
+    store = get_normals_store()
+
+    normals = store.get(cell)
+    if normals is None:
+        try:
+            response = await ahttp_get(
+                CLIMATE_URL,
+                params=_climate_params(*cell),
+            )
+            response.raise_for_status()
+            normals = compute_monthly_normals(response.json())
+
+        except Exception as exc:
+            raise ClimateServiceError(
+                "Failed to fetch climate data"
+            ) from exc
+
+        if normals:
+            store.put(cell, normals)
+
+    return _month_from_normals(normals, month_num)
 
 
 # ------------------------------------------------------------
@@ -164,7 +224,13 @@ def fetch_climate_data(
             "country": str,        # Country name
             "month": str,          # Month name capitalized
             "average_temperature_c": float,
-            "average_precipitation_mm": float,
+            "min_temperature_c": float,         # coldest / warmest daily mean
+            "max_temperature_c": float,
+            "temperature_p10_c": float,
+            "temperature_p90_c": float,
+            "average_precipitation_mm": float,  # mean monthly total
+            "average_rainy_days": float,        # days with >= 1 mm
+            "temperature_yoy_variance": float,  # spread of the monthly mean between years
         }
     """
 
@@ -178,7 +244,31 @@ def fetch_climate_data(
 
     return {
         "place": location["name"],
-        "country": location["country"],
+        "country": location.get("country") or "Unknown",
+        "month": month_name.capitalize(),
+        **climate,
+    }
+
+
+async def afetch_climate_data(
+    place_name: str,
+    month: Union[str, int],
+) -> Dict[str, Any]:
+    """
+    Async counterpart of fetch_climate_data (same inputs and outputs).
+    """
+
+    month_num, month_name = _normalize_month(month)
+    location = await _ageocode(place_name)
+    climate = await _afetch_monthly_climate(
+        location["latitude"],
+        location["longitude"],
+        month_num,
+    )
+
+    return {
+        "place": location["name"],
+        "country": location.get("country") or "Unknown",
         "month": month_name.capitalize(),
         **climate,
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,137 @@
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from app.config.settings import settings
+from app.domain.climate_stats import STATS_VERSION, aggregate_monthly
+
+"""
+Persistent store of monthly climate normals, keyed by a rounded lat/lon grid cell.
+One ERA5 download yields all 12 monthly normals for a cell; they are computed in a single grouped pass
+(see climate_stats) and persisted, so every later month for a nearby place is answered locally.
+"""
+
+# ------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------
+
+NORMALS_PATH = settings.CACHE_DIR / settings.CLIMATE_NORMALS_FILE_NAME
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def grid_cell(latitude: float, longitude: float) -> tuple[float, float]:
+    """
+    Snap coordinates to the centre of their grid cell (settings.CLIMATE_GRID_DEGREES).
+    """
+    step = settings.CLIMATE_GRID_DEGREES
+    return (
+        round(round(latitude / step) * step, 4),
+        round(round(longitude / step) * step, 4),
+    )
+
+
+def _cell_key(cell: tuple[float, float]) -> str:
+    # Versioned so rows computed with an older statistics shape are recomputed
+    return f"v{STATS_VERSION}:{cell[0]:.4f},{cell[1]:.4f}"
+
+
+def compute_monthly_normals(data: Dict[str, Any]) -> Dict[int, Dict[str, float]]:
+    """
+    Compute normals for every month present in an ERA5 daily payload, in one pass.
+    inputs:
+        data: Open-Meteo archive response with daily time / temperature_2m_mean / precipitation_sum
+    outputs:
+        {month_num: statistics} as produced by climate_stats.aggregate_monthly
+    """
+    return aggregate_monthly(data["daily"])
+
+# ------------------------------------------------------------
+# Store
+# ------------------------------------------------------------
+
+class ClimateNormalsStore:
+    """
+    Thread-safe normals store: in-process dict in front of a SQLite table (one row per grid cell).
+    """
+
+    def __init__(self, *, path=NORMALS_PATH):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Dict[int, Dict[str, float]]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS normals ("
+                " cell TEXT PRIMARY KEY, normals TEXT NOT NULL, computed_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, cell: tuple[float, float]) -> Optional[Dict[int, Dict[str, float]]]:
+        """
+        All stored monthly normals for a grid cell, or None if the cell was never fetched.
+        """
+        key = _cell_key(cell)
+
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+
+            row = self._connection().execute(
+                "SELECT normals FROM normals WHERE cell = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+
+            # JSON object keys are strings; months are ints everywhere else
+            normals = {int(m): values for m, values in json.loads(row[0]).items()}
+            self._memory[key] = normals
+            return normals
+
+    def put(self, cell: tuple[float, float], normals: Dict[int, Dict[str, float]]) -> None:
+        key = _cell_key(cell)
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO normals (cell, normals, computed_at) VALUES (?, ?, ?)",
+                (key, json.dumps(normals), time.time()),
+            )
+            conn.commit()
+            self._memory[key] = normals
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+# ------------------------------------------------------------
+# Singleton
+# ------------------------------------------------------------
+
+_normals_store: Optional[ClimateNormalsStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_normals_store() -> ClimateNormalsStore:
+    """
+    Returns the shared ClimateNormalsStore, creating it lazily on first use.
+    """
+    global _normals_store
+
+    if _normals_store is None:
+        with _STORE_LOCK:
+            if _normals_store is None:
+                _normals_store = ClimateNormalsStore()
+
+    return _normals_store
@@ -0,0 +1,215 @@
+from __future__ import annotations
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
+
+try:  # a project dependency; the pure-Python path remains for minimal environments
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+"""
+Aggregation engine for ERA5 daily climate series.
+Parses the date column once and groups rows by month and by (year, month) to produce per-month statistics:
+mean / min / max / 10th and 90th percentile of the daily mean temperature, mean monthly precipitation,
+mean rainy-day count and the year-over-year variance of the monthly mean temperature.
+Missing values (None / NaN) are masked out. Uses NumPy (a project dependency) and falls back to an
+equivalent single-pass pure-Python implementation when it is not importable.
+"""
+
+# ------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------
+
+STATS_VERSION = 2  # bump when the output shape changes (invalidates persisted normals)
+
+RAINY_DAY_MM = 1.0  # WMO convention for a "rain day"
+PERCENTILES = (10, 90)
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def _is_missing(value: Optional[float]) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Linear-interpolation percentile (same definition as numpy.percentile's default).
+    """
+    position = (len(sorted_values) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def _variance(values: Sequence[float]) -> float:
+    mean = sum(values) / len(values)
+    return sum((v - mean) ** 2 for v in values) / len(values)
+
+
+def _month_stats(
+    *,
+    mean: float,
+    t_min: float,
+    t_max: float,
+    percentiles: Sequence[float],
+    precipitation: float,
+    rainy_days: float,
+    yoy_variance: float,
+) -> Dict[str, float]:
+    return {
+        "average_temperature_c": round(float(mean), 1),
+        "min_temperature_c": round(float(t_min), 1),
+        "max_temperature_c": round(float(t_max), 1),
+        **{
+            f"temperature_p{q}_c": round(float(value), 1)
+            for q, value in zip(PERCENTILES, percentiles)
+        },
+        "average_precipitation_mm": round(float(precipitation), 1),
+        "average_rainy_days": round(float(rainy_days), 1),
+        "temperature_yoy_variance": round(float(yoy_variance), 2),
+    }
+
+# ------------------------------------------------------------
+# Implementations
+# ------------------------------------------------------------
+
+def _aggregate_python(daily: Dict[str, List[Any]]) -> Dict[int, Dict[str, float]]:
+    temps_by_month: Dict[int, List[float]] = defaultdict(list)
+    temp_by_group: Dict[tuple[int, int], List[float]] = defaultdict(lambda: [0.0, 0])
+    rain_by_group: Dict[tuple[int, int], List[float]] = defaultdict(lambda: [0.0, 0])
+
+    # ISO dates are fixed-width ("YYYY-MM-DD"), so slicing avoids parsing each row
+    for d, t, r in zip(daily["time"], daily["temperature_2m_mean"], daily["precipitation_sum"]):
+        group = (int(d[5:7]), int(d[:4]))
+
+        if not _is_missing(t):
+            temps_by_month[group[0]].append(t)
+            acc = temp_by_group[group]
+            acc[0] += t
+            acc[1] += 1
+
+        if not _is_missing(r):
+            acc = rain_by_group[group]
+            acc[0] += r
+            acc[1] += r >= RAINY_DAY_MM
+
+    result: Dict[int, Dict[str, float]] = {}
+
+    for month in sorted(temps_by_month):
+        groups = [g for g in rain_by_group if g[0] == month]
+        if not groups:
+            continue
+
+        temps = sorted(temps_by_month[month])
+        result[month] = _month_stats(
+            mean=sum(temps) / len(temps),
+            t_min=temps[0],
+            t_max=temps[-1],
+            percentiles=[_percentile(temps, q) for q in PERCENTILES],
+            precipitation=sum(rain_by_group[g][0] for g in groups) / len(groups),
+            rainy_days=sum(rain_by_group[g][1] for g in groups) / len(groups),
+            yoy_variance=_variance([t / n for (m, _), (t, n) in temp_by_group.items() if m == month]),
+        )
+
+    return result
+
+
+def _parse_days(times: List[str]):
+    # ERA5 daily series are contiguous: derive the column from its endpoints instead of parsing every row
+    first, last = np.datetime64(times[0], "D"), np.datetime64(times[-1], "D")
+    if (last - first).astype(np.int64) + 1 == len(times):
+        return first + np.arange(len(times))
+
+    return np.asarray(times, dtype="datetime64[D]")
+
+
+def _aggregate_numpy(daily: Dict[str, List[Any]]) -> Dict[int, Dict[str, float]]:
+    days = _parse_days(daily["time"])
+    months = days.astype("datetime64[M]").astype(np.int64) % 12  # 0..11
+    years = days.astype("datetime64[Y]").astype(np.int64)
+
+    # None -> NaN under dtype=float, then masked
+    temps = np.ma.masked_invalid(np.asarray(daily["temperature_2m_mean"], dtype=float))
+    rain = np.ma.masked_invalid(np.asarray(daily["precipitation_sum"], dtype=float))
+    temp_ok = ~np.ma.getmaskarray(temps)
+    rain_ok = ~np.ma.getmaskarray(rain)
+
+    # (year, month) groups as one flat index: totals, counts and rainy days via bincount
+    group = (years - years.min()) * 12 + months
+    n_groups = int(group.max()) + 1
+    group_month = np.arange(n_groups) % 12
+
+    rain_total = np.bincount(group, weights=rain.filled(0.0), minlength=n_groups)
+    rain_days_present = np.bincount(group, weights=rain_ok, minlength=n_groups)
+    rainy_days = np.bincount(group, weights=rain.filled(0.0) >= RAINY_DAY_MM, minlength=n_groups)
+    temp_total = np.bincount(group, weights=temps.filled(0.0), minlength=n_groups)
+    temp_days = np.bincount(group, weights=temp_ok, minlength=n_groups)
+
+    # Per-month daily temperatures: one sort by (month, value), then split at month boundaries,
+    # leaving every month's values already ordered for min / max / percentiles
+    valid_months = months[temp_ok]
+    valid_temps = temps.compressed()
+    order = np.lexsort((valid_temps, valid_months))
+    counts = np.bincount(valid_months, minlength=12)
+    by_month = np.split(valid_temps[order], np.cumsum(counts)[:-1])
+
+    result: Dict[int, Dict[str, float]] = {}
+
+    for m, values in enumerate(by_month):
+        rain_groups = (group_month == m) & (rain_days_present > 0)
+        temp_groups = (group_month == m) & (temp_days > 0)
+        if values.size == 0 or not rain_groups.any():
+            continue
+
+        result[m + 1] = _month_stats(
+            mean=values.mean(),
+            t_min=values[0],
+            t_max=values[-1],
+            percentiles=[_percentile(values, q) for q in PERCENTILES],
+            precipitation=rain_total[rain_groups].mean(),
+            rainy_days=rainy_days[rain_groups].mean(),
+            yoy_variance=np.var(temp_total[temp_groups] / temp_days[temp_groups]),
+        )
+
+    return result
+
+# ------------------------------------------------------------
+# Public API
+# ------------------------------------------------------------
+
+def aggregate_monthly(
+    daily: Dict[str, List[Any]],
+    *,
+    use_numpy: Optional[bool] = None,
+) -> Dict[int, Dict[str, float]]:
+    """
+    Per-month climate statistics for an ERA5 daily series.
+    inputs:
+        daily: The "daily" block of an Open-Meteo archive response
+               (time / temperature_2m_mean / precipitation_sum)
+        use_numpy: Force (True) or disable (False) the NumPy path; default uses it when installed
+    outputs:
+        {month_num: {
+            "average_temperature_c", "min_temperature_c", "max_temperature_c",
+            "temperature_p10_c", "temperature_p90_c",
+            "average_precipitation_mm",    # mean over years of the monthly total
+            "average_rainy_days",          # mean over years of days with >= 1 mm
+            "temperature_yoy_variance",    # variance of the yearly monthly-mean temperature
+        }}
+        Months without any temperature or precipitation value are omitted.
+    """
+    if not daily.get("time"):
+        return {}
+
+    if use_numpy is None:
+        use_numpy = np is not None
+
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return _aggregate_numpy(daily)
+
+    return _aggregate_python(daily)
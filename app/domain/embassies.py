@@ -1,15 +1,16 @@
 from __future__ import annotations
-import json
-import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 import re
 import html
-import requests
 from app.config.settings import settings
+from app.infrastructure.dataset_cache import DatasetCache, DatasetUnavailableError
+from app.infrastructure.dataset_format import ColumnarTable
+from app.infrastructure.http_client import http_get
 
 """
 Domain logic for travel warnings using Israeli government API.
 Fetches embassy contact details with weekly caching, which corresponds to the official update rate.
+A stale copy is served while the weekly refresh runs in the background (see dataset_cache).
 """
 
 # ------------------------------------------------------------
@@ -29,28 +30,6 @@ CACHE_PATH = settings.CACHE_DIR / "_israeli_embassies_cache.json"
 class EmbassyServiceError(RuntimeError):
     pass
 
-# ------------------------------------------------------------
-# Cache helpers
-# ------------------------------------------------------------
-
-def _cache_is_fresh() -> bool:
-    if not CACHE_PATH.exists():
-        return False
-
-    age = time.time() - CACHE_PATH.stat().st_mtime
-    return age < CACHE_TTL_SECONDS
-
-
-def _load_cache() -> List[Dict[str, Any]]:
-    return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
-
-
-def _save_cache(data: List[Dict[str, Any]]) -> None:
-    CACHE_PATH.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-
 # ------------------------------------------------------------
 # Fetch & normalize
 # ------------------------------------------------------------
@@ -80,33 +59,54 @@ def _extract_website(value: Optional[str]) -> Optional[str]:
     return match.group(0) if match else None
 
 
-def _fetch_and_cache() -> List[Dict[str, Any]]:
-    try:
-        response = requests.get(DATASET_URL, timeout=20)
-        response.raise_for_status()
-
-        records = response.json()["result"]["records"]
-
-        normalized = [
-            {
-                "country": r.get("shem_mdn_a"),
-                "city": r.get("shem_ntz_a"),
-                "type": r.get("maamad_a"),
-                "address": r.get("Addrs"),
-                "phone": r.get("tel"),
-                "email": _extract_email(r.get("email")),
-                "website": _extract_website(r.get("Atar")),
-            }
-            for r in records
-        ]
-
-        _save_cache(normalized)
-        return normalized
-
-    except Exception as exc:
-        raise EmbassyServiceError(
-            "Failed to fetch Israeli embassy contact details"
-        ) from exc
+def _normalize_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "country": r.get("shem_mdn_a"),
+            "city": r.get("shem_ntz_a"),
+            "type": r.get("maamad_a"),
+            "address": r.get("Addrs"),
+            "phone": r.get("tel"),
+            "email": _extract_email(r.get("email")),
+            "website": _extract_website(r.get("Atar")),
+        }
+        for r in records
+    ]
+
+
+def _fetch_records() -> List[Dict[str, Any]]:
+    response = http_get(DATASET_URL)
+    response.raise_for_status()
+
+    return _normalize_records(response.json()["result"]["records"])
+
+
+_DATASET: DatasetCache[Sequence[Dict[str, Any]]] = DatasetCache(
+    "embassies",
+    CACHE_PATH,
+    CACHE_TTL_SECONDS,
+    fetch=_fetch_records,
+    index_key="country",
+    binary=settings.DATASET_BINARY_CACHE,
+)
+
+
+def _filter_by_country(
+    embassies: Sequence[Dict[str, Any]],
+    country: Optional[str],
+) -> List[Dict[str, Any]]:
+    if isinstance(embassies, ColumnarTable):
+        # Rows are sorted by country, so only the matching range is decoded
+        return embassies.rows_for(country) if country else list(embassies)
+
+    if not country:
+        return embassies
+
+    country_lower = country.lower()
+    return [
+        e for e in embassies
+        if e.get("country") and e["country"].lower() == country_lower
+    ]
 
 
 # ------------------------------------------------------------
@@ -122,16 +122,28 @@ def get_israeli_embassies(
     If `country` is provided, results are filtered by country name.
     """
 
-    if _cache_is_fresh():
-        embassies = _load_cache()
-    else:
-        embassies = _fetch_and_cache()
+    try:
+        embassies = _DATASET.get()
+    except DatasetUnavailableError as exc:
+        raise EmbassyServiceError(
+            "Failed to fetch Israeli embassy contact details"
+        ) from exc
+
+    return _filter_by_country(embassies, country)
+
 
-    if country:
-        country_lower = country.lower()
-        embassies = [
-            e for e in embassies
-            if e.get("country") and e["country"].lower() == country_lower
-        ]
+async def aget_israeli_embassies(
+    country: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of get_israeli_embassies (same inputs and outputs).
+    """
+
+    try:
+        embassies = await _DATASET.aget()
+    except DatasetUnavailableError as exc:
+        raise EmbassyServiceError(
+            "Failed to fetch Israeli embassy contact details"
+        ) from exc
 
-    return embassies
\ No newline at end of file
+    return _filter_by_country(embassies, country)
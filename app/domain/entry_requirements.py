@@ -1,14 +1,26 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional
+import httpx
 import requests
 from app.config.settings import settings
+from app.domain.visa_matrix import get_visa_matrix, normalize_country_code
+from app.infrastructure.async_http import ahttp_post
+from app.infrastructure.http_client import http_post
+from app.infrastructure.resilience import UpstreamUnavailableError
 import json
 
 """
 Domain logic for entry requirements using Travel Buddy API.
 Fetches and normalizes visa and entry requirement data.
+Answers are kept in the visa matrix (see visa_matrix), so a passport / destination pair is fetched
+at most once per VISA_MATRIX_TTL_SECONDS; prewarm_visa_matrix fills it ahead of traffic.
 """
 
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------
 # Constants
@@ -17,6 +29,8 @@ Fetches and normalizes visa and entry requirement data.
 TRAVEL_BUDDY_URL = "https://visa-requirement.p.rapidapi.com/v2/visa/check"
 TRAVEL_BUDDY_HOST = "visa-requirement.p.rapidapi.com"
 
+COUNTRY_CODES_FILE = settings.DATA_DIR / "country_aliases.json"
+
 
 # ------------------------------------------------------------
 # Errors
@@ -30,7 +44,7 @@ class VisaServiceError(RuntimeError):
 # Internal helpers (private to this domain)
 # ============================================================
 
-def _fetch_raw(
+def _request_kwargs(
     passport: str,
     destination: str,
 ) -> Dict[str, Any]:
@@ -48,17 +62,46 @@ def _fetch_raw(
         "destination": destination.upper(),
     }
 
+    return {
+        "headers": headers,
+        "content": json.dumps(payload),
+    }
+
+
+def _fetch_raw(
+    passport: str,
+    destination: str,
+) -> Dict[str, Any]:
+
+    kwargs = _request_kwargs(passport, destination)
+
     try:
-        response = requests.post(
+        response = http_post(
             TRAVEL_BUDDY_URL,
-            headers=headers,
-            data=json.dumps(payload),
-            timeout=15,
+            headers=kwargs["headers"],
+            data=kwargs["content"],
         )
         response.raise_for_status()
         return response.json()
 
-    except requests.RequestException as exc:
+    except (requests.RequestException, UpstreamUnavailableError) as exc:
+        raise VisaServiceError("Failed to fetch visa requirements") from exc
+
+
+async def _afetch_raw(
+    passport: str,
+    destination: str,
+) -> Dict[str, Any]:
+
+    try:
+        response = await ahttp_post(
+            TRAVEL_BUDDY_URL,
+            **_request_kwargs(passport, destination),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    except (httpx.HTTPError, UpstreamUnavailableError) as exc:
         raise VisaServiceError("Failed to fetch visa requirements") from exc
 
 
@@ -115,6 +158,56 @@ def _build_visa_summary(
     return f"{rule_part} – {duration}" if duration else rule_part
 
 
+def _normalize_response(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a raw Travel Buddy response into the public output shape.
+    """
+    data = raw.get("data") or {}
+    visa_rules = data.get("visa_rules") or {}
+
+    primary = _normalize_rule(visa_rules.get("primary_rule"))
+    secondary = _normalize_rule(visa_rules.get("secondary_rule"))
+    exception = _normalize_rule(visa_rules.get("exception_rule"))
+    mandatory = _normalize_rule(data.get("mandatory_registration"))
+
+    return {
+        "passport": data.get("passport"),
+        "destination": data.get("destination"),
+
+        "visa": {
+            "summary": _build_visa_summary(primary, secondary),
+            "primary_rule": primary,
+            "secondary_rule": secondary,
+            "exception_rule": exception,
+        },
+
+        "mandatory_registration": mandatory,
+
+        "source": "Travel Buddy (RapidAPI)",
+        "disclaimer": "Visa rules may change. Always verify with official sources.",
+    }
+
+
+def _is_cacheable(result: Dict[str, Any]) -> bool:
+    # Unknown codes come back without passport / destination data; those answers are not worth keeping
+    return bool(result.get("passport")) and bool(result.get("destination"))
+
+
+def _remember(passport: str, destination: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    if _is_cacheable(result):
+        get_visa_matrix().put(passport, destination, result)
+    return result
+
+
+def _unique_codes(codes: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(normalize_country_code(code) for code in codes if code and code.strip()))
+
+
+def _all_country_codes() -> List[str]:
+    with open(COUNTRY_CODES_FILE, encoding="utf-8") as f:
+        return sorted(code for code in json.load(f) if len(code) == 2)
+
+
 # ============================================================
 # Public API (THIS is what the tool calls)
 # ============================================================
@@ -134,32 +227,142 @@ def get_visa_requirements(
         A dictionary containing normalized visa and entry requirement information.
     """
 
+    cached = get_visa_matrix().get(passport_country_code, destination_country_code)
+    if cached is not None:
+        return cached
+
     raw = _fetch_raw(
         passport_country_code,
         destination_country_code,
     )
 
-    data = raw.get("data") or {}
-    visa_rules = data.get("visa_rules") or {}
+    return _remember(passport_country_code, destination_country_code, _normalize_response(raw))
 
-    primary = _normalize_rule(visa_rules.get("primary_rule"))
-    secondary = _normalize_rule(visa_rules.get("secondary_rule"))
-    exception = _normalize_rule(visa_rules.get("exception_rule"))
-    mandatory = _normalize_rule(data.get("mandatory_registration"))
 
-    return {
-        "passport": data.get("passport"),
-        "destination": data.get("destination"),
+async def aget_visa_requirements(
+    passport_country_code: str,
+    destination_country_code: str,
+) -> Dict[str, Any]:
+    """
+    Async counterpart of get_visa_requirements (same inputs and outputs).
+    """
 
-        "visa": {
-            "summary": _build_visa_summary(primary, secondary),
-            "primary_rule": primary,
-            "secondary_rule": secondary,
-            "exception_rule": exception,
-        },
+    cached = get_visa_matrix().get(passport_country_code, destination_country_code)
+    if cached is not None:
+        return cached
 
-        "mandatory_registration": mandatory,
+    raw = await _afetch_raw(
+        passport_country_code,
+        destination_country_code,
+    )
 
-        "source": "Travel Buddy (RapidAPI)",
-        "disclaimer": "Visa rules may change. Always verify with official sources.",
-    }
\ No newline at end of file
+    return _remember(passport_country_code, destination_country_code, _normalize_response(raw))
+
+
+def get_visa_requirements_batch(
+    passport_country_code: str,
+    destination_country_codes: Iterable[str],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Visa & entry requirements for one passport across several destinations (multi-country itineraries).
+
+    inputs:
+        passport_country_code: ISO Alpha-2 code of the traveler's passport country
+        destination_country_codes: ISO Alpha-2 codes of the destinations, in itinerary order
+    outputs:
+        {destination code: same dictionary as get_visa_requirements} in input order (duplicates dropped);
+        a destination whose lookup failed maps to {"error": message}.
+        Pairs already in the matrix are answered locally; the rest are fetched concurrently.
+    """
+    destinations = _unique_codes(destination_country_codes)
+
+    def run(destination: str) -> Dict[str, Any]:
+        try:
+            return get_visa_requirements(passport_country_code, destination)
+        except VisaServiceError as exc:
+            return {"error": str(exc)}
+
+    with ThreadPoolExecutor(max_workers=settings.VISA_BATCH_CONCURRENCY, thread_name_prefix="visa-batch") as pool:
+        results = list(pool.map(run, destinations))
+
+    return dict(zip(destinations, results))
+
+
+async def aget_visa_requirements_batch(
+    passport_country_code: str,
+    destination_country_codes: Iterable[str],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Async counterpart of get_visa_requirements_batch (same inputs and outputs).
+    """
+    destinations = _unique_codes(destination_country_codes)
+    semaphore = asyncio.Semaphore(settings.VISA_BATCH_CONCURRENCY)
+
+    async def run(destination: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return await aget_visa_requirements(passport_country_code, destination)
+            except VisaServiceError as exc:
+                return {"error": str(exc)}
+
+    results = await asyncio.gather(*(run(d) for d in destinations))
+    return dict(zip(destinations, results))
+
+
+# ============================================================
+# Pre-warm job
+# ============================================================
+
+def prewarm_visa_matrix(
+    passports: Optional[Iterable[str]] = None,
+    destinations: Optional[Iterable[str]] = None,
+    *,
+    max_calls: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Fetch missing and stale matrix entries, never-fetched pairs first.
+
+    inputs:
+        passports: Passport codes to cover (defaults to settings.VISA_PREWARM_PASSPORTS)
+        destinations: Destination codes to cover (defaults to settings.VISA_PREWARM_DESTINATIONS,
+                      or every known country if that is empty)
+        max_calls: API calls allowed in this run (defaults to settings.VISA_PREWARM_MAX_CALLS)
+    outputs:
+        {"pending": pairs that needed a fetch, "fetched": pairs stored, "failed": pairs that failed}
+    Stops early when the provider's rate limit / quota or circuit breaker rejects a call, so a run never
+    spends the budget needed by live traffic.
+    """
+    passports = _unique_codes(passports or settings.VISA_PREWARM_PASSPORTS)
+    destinations = _unique_codes(destinations or settings.VISA_PREWARM_DESTINATIONS or _all_country_codes())
+    max_calls = settings.VISA_PREWARM_MAX_CALLS if max_calls is None else max_calls
+
+    pending = get_visa_matrix().stale_pairs(passports, destinations)
+    summary = {"pending": len(pending), "fetched": 0, "failed": 0}
+
+    for passport, destination in pending[:max_calls]:
+        try:
+            get_visa_requirements(passport, destination)
+            summary["fetched"] += 1
+        except VisaServiceError as exc:
+            summary["failed"] += 1
+            if isinstance(exc.__cause__, UpstreamUnavailableError):
+                logger.info("Visa matrix pre-warm stopped early: %s", exc.__cause__)
+                break
+
+    logger.info("Visa matrix pre-warm finished: %s", summary)
+    return summary
+
+
+def start_visa_prewarm() -> threading.Thread:
+    """
+    Run prewarm_visa_matrix on a daemon thread (e.g. at boot) and return the thread.
+    """
+    def run() -> None:
+        try:
+            prewarm_visa_matrix()
+        except Exception:
+            logger.warning("Visa matrix pre-warm failed", exc_info=True)
+
+    thread = threading.Thread(target=run, name="visa-matrix-prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -1,11 +1,19 @@
 from __future__ import annotations
-from datetime import date
-from typing import List, Dict, Any, Optional
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, time as dtime, timedelta
+from typing import List, Dict, Any, Optional, Sequence
+from app.config.settings import settings
 from app.infrastructure.amadeus_client import get_amadeus_client
 
 """
 Domain logic for flight search using Amadeus API.
-Fetches flight offers and normalizes the data for consumption."""
+Fetches flight offers and parses them into compact slotted records (FlightOffer) that can be
+ranked and filtered server-side, so only a few short summaries need to reach the LLM.
+The batch API (search_flight_matrix) fans one search out over origins x destinations x dates
+and merges the results into a compact price matrix."""
 
 # ------------------------------------------------------------
 # Constants
@@ -13,6 +21,10 @@ Fetches flight offers and normalizes the data for consumption."""
 
 FLIGHT_OFFERS_PATH = "/v2/shopping/flight-offers"
 
+SORT_KEYS = ("price", "duration", "stops", "departure")
+
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?")
+
 # ------------------------------------------------------------
 # Errors
 # ------------------------------------------------------------
@@ -24,6 +36,46 @@ class FlightSearchError(RuntimeError):
 # Internal helpers (private to this domain)
 # ------------------------------------------------------------
 
+def _offer_params(
+    origin: str,
+    destination: str,
+    departure_date: date,
+    *,
+    return_date: Optional[date],
+    adults: int,
+    max_results: int,
+) -> Dict[str, Any]:
+    params = {
+        "originLocationCode": origin,
+        "destinationLocationCode": destination,
+        "departureDate": departure_date.isoformat(),
+        "adults": adults,
+        "max": max_results,
+        # Otherwise Amadeus prices in a market-dependent currency, and offers could not be ranked by price
+        "currencyCode": settings.FLIGHT_CURRENCY_CODE,
+    }
+
+    if return_date:
+        params["returnDate"] = return_date.isoformat()
+
+    return params
+
+
+def _offers_from(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Raw offers of an Amadeus response. The client reports failures (API errors, rate limits, open circuits)
+    as {"error": ...} dicts; those raise FlightSearchError instead of reading as "no flights".
+    A 400 means the query itself was rejected (e.g. an unknown IATA code), which has no offers.
+    """
+    if "error" not in response:
+        return response.get("data", [])
+
+    if response.get("status_code") == 400:
+        return []
+
+    raise FlightSearchError(f"{response['error']}: {response.get('details')}")
+
+
 def _fetch_flight_offers(
     origin: str,
     destination: str,
@@ -36,60 +88,284 @@ def _fetch_flight_offers(
     try:
         client = get_amadeus_client()
 
-        params = {
-            "originLocationCode": origin,
-            "destinationLocationCode": destination,
-            "departureDate": departure_date.isoformat(),
-            "adults": adults,
-            "max": max_results,
-        }
-
-        if return_date:
-            params["returnDate"] = return_date.isoformat()
+        params = _offer_params(
+            origin,
+            destination,
+            departure_date,
+            return_date=return_date,
+            adults=adults,
+            max_results=max_results,
+        )
 
         response = client.get(FLIGHT_OFFERS_PATH, params=params)
 
-        return response.get("data", [])
-
     except Exception as exc:
         raise FlightSearchError(
             "Failed to fetch flight offers from Amadeus"
         ) from exc
 
+    return _offers_from(response)
 
-def _normalize_offers(
-    raw_offers: List[Dict[str, Any]],
+
+async def _afetch_flight_offers(
+    origin: str,
+    destination: str,
+    departure_date: date,
+    *,
+    return_date: Optional[date],
+    adults: int,
+    max_results: int,
 ) -> List[Dict[str, Any]]:
-    offers: List[Dict[str, Any]] = []
+    try:
+        client = get_amadeus_client()
 
-    for item in raw_offers:
-        itinerary = item["itineraries"][0]
-        segments = itinerary["segments"]
+        params = _offer_params(
+            origin,
+            destination,
+            departure_date,
+            return_date=return_date,
+            adults=adults,
+            max_results=max_results,
+        )
+
+        response = await client.aget(FLIGHT_OFFERS_PATH, params=params)
+
+    except Exception as exc:
+        raise FlightSearchError(
+            "Failed to fetch flight offers from Amadeus"
+        ) from exc
+
+    return _offers_from(response)
+
+
+def _duration_minutes(iso: str) -> int:
+    """
+    "PT2H35M" -> 155, "P1DT2H" -> 1560
+    """
+    match = _ISO_DURATION.fullmatch(iso or "")
+    if not match:
+        return 0
+    days, hours, minutes = (int(g or 0) for g in match.groups())
+    return days * 1440 + hours * 60 + minutes
 
-        offers.append({
-            "id": item.get("id"),
-            "total_price": item["price"]["total"],
-            "currency": item["price"]["currency"],
-            "duration": itinerary["duration"],
+
+def _format_minutes(minutes: int) -> str:
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+# ------------------------------------------------------------
+# Offer model
+# ------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class FlightSegment:
+    origin: str
+    destination: str
+    departure: str
+    arrival: str
+    carrier: Optional[str]
+    flight_number: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class FlightOffer:
+    """
+    One offer's outbound itinerary: flat scalar fields for ranking, segments kept as a tuple.
+    """
+    id: Optional[str]
+    price: float
+    currency: str
+    duration_minutes: int
+    duration: str
+    segments: tuple[FlightSegment, ...]
+
+    @property
+    def stops(self) -> int:
+        return len(self.segments) - 1
+
+    @property
+    def departure(self) -> str:
+        return self.segments[0].departure
+
+    @property
+    def departure_time(self) -> dtime:
+        return dtime.fromisoformat(self.departure[11:16])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Full normalized form (the search_flights output shape).
+        """
+        return {
+            "id": self.id,
+            "total_price": f"{self.price:.2f}",
+            "currency": self.currency,
+            "duration": self.duration,
             "segments": [
                 {
-                    "from": s["departure"]["iataCode"],
-                    "to": s["arrival"]["iataCode"],
-                    "departure": s["departure"]["at"],
-                    "arrival": s["arrival"]["at"],
-                    "carrier": s.get("carrierCode"),
-                    "flight_number": s.get("number"),
+                    "from": s.origin,
+                    "to": s.destination,
+                    "departure": s.departure,
+                    "arrival": s.arrival,
+                    "carrier": s.carrier,
+                    "flight_number": s.flight_number,
                 }
-                for s in segments
+                for s in self.segments
             ],
-        })
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Compact one-line-per-field form for the LLM context.
+        """
+        return {
+            "id": self.id,
+            "price": f"{self.price:.2f} {self.currency}",
+            "duration": _format_minutes(self.duration_minutes),
+            "stops": self.stops,
+            "route": "-".join([self.segments[0].origin, *(s.destination for s in self.segments)]),
+            "departure": self.departure,
+            "arrival": self.segments[-1].arrival,
+            "flights": ", ".join(f"{s.carrier or ''}{s.flight_number or ''}" for s in self.segments),
+        }
+
+
+def _parse_offers(raw_offers: List[Dict[str, Any]]) -> List[FlightOffer]:
+    offers: List[FlightOffer] = []
+
+    for item in raw_offers:
+        itinerary = item["itineraries"][0]
+
+        offers.append(FlightOffer(
+            id=item.get("id"),
+            price=float(item["price"]["total"]),
+            currency=item["price"]["currency"],
+            duration_minutes=_duration_minutes(itinerary["duration"]),
+            duration=itinerary["duration"],
+            segments=tuple(
+                FlightSegment(
+                    origin=s["departure"]["iataCode"],
+                    destination=s["arrival"]["iataCode"],
+                    departure=s["departure"]["at"],
+                    arrival=s["arrival"]["at"],
+                    carrier=s.get("carrierCode"),
+                    flight_number=s.get("number"),
+                )
+                for s in itinerary["segments"]
+            ),
+        ))
 
     return offers
 
+
+def _normalize_offers(
+    raw_offers: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    return [offer.to_dict() for offer in _parse_offers(raw_offers)]
+
+
+def rank_offers(
+    offers: Sequence[FlightOffer],
+    *,
+    sort_by: str = "price",
+    max_stops: Optional[int] = None,
+    depart_after: Optional[dtime] = None,
+    depart_before: Optional[dtime] = None,
+) -> List[FlightOffer]:
+    """
+    Filter offers by stops and departure time window, then order them.
+    Prices are compared as plain numbers: every search pins FLIGHT_CURRENCY_CODE, so offers share one currency.
+    inputs:
+        sort_by: "price" (cheapest), "duration" (fastest), "stops" (fewest stops) or "departure" (earliest);
+                 ties are broken by price
+        max_stops: Drop offers with more connections
+        depart_after / depart_before: Inclusive local departure time window of the first segment
+    """
+    if sort_by not in SORT_KEYS:
+        raise FlightSearchError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+
+    kept = [
+        o for o in offers
+        if (max_stops is None or o.stops <= max_stops)
+        and (depart_after is None or o.departure_time >= depart_after)
+        and (depart_before is None or o.departure_time <= depart_before)
+    ]
+
+    keys = {
+        "price": lambda o: (o.price, o.duration_minutes),
+        "duration": lambda o: (o.duration_minutes, o.price),
+        "stops": lambda o: (o.stops, o.price),
+        "departure": lambda o: (o.departure, o.price),
+    }
+    return sorted(kept, key=keys[sort_by])
+
 # ------------------------------------------------------------
 # Public domain API
 # ------------------------------------------------------------
 
+def _select(
+    offers: List[FlightOffer],
+    *,
+    sort_by: str,
+    max_stops: Optional[int],
+    depart_after: Optional[dtime],
+    depart_before: Optional[dtime],
+    top_n: Optional[int],
+    compact: bool,
+) -> List[Dict[str, Any]]:
+    ranked = rank_offers(
+        offers,
+        sort_by=sort_by,
+        max_stops=max_stops,
+        depart_after=depart_after,
+        depart_before=depart_before,
+    )[:top_n]
+
+    return [o.summary() if compact else o.to_dict() for o in ranked]
+
+
+def search_flight_offers(
+    origin: str,
+    destination: str,
+    departure_date: date,
+    *,
+    return_date: Optional[date] = None,
+    adults: int = 1,
+    max_results: int = 5,
+) -> List[FlightOffer]:
+    """
+    Fetch and parse flight offers (unranked FlightOffer records, in Amadeus order).
+    """
+    return _parse_offers(_fetch_flight_offers(
+        origin=origin,
+        destination=destination,
+        departure_date=departure_date,
+        return_date=return_date,
+        adults=adults,
+        max_results=max_results,
+    ))
+
+
+async def asearch_flight_offers(
+    origin: str,
+    destination: str,
+    departure_date: date,
+    *,
+    return_date: Optional[date] = None,
+    adults: int = 1,
+    max_results: int = 5,
+) -> List[FlightOffer]:
+    """
+    Async counterpart of search_flight_offers.
+    """
+    return _parse_offers(await _afetch_flight_offers(
+        origin=origin,
+        destination=destination,
+        departure_date=departure_date,
+        return_date=return_date,
+        adults=adults,
+        max_results=max_results,
+    ))
+
+
 def search_flights(
     origin: str,
     destination: str,
@@ -98,6 +374,12 @@ def search_flights(
     return_date: Optional[date] = None,
     adults: int = 1,
     max_results: int = 5,
+    sort_by: str = "price",
+    max_stops: Optional[int] = None,
+    depart_after: Optional[dtime] = None,
+    depart_before: Optional[dtime] = None,
+    top_n: Optional[int] = None,
+    compact: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Search for flight offers between two locations.
@@ -108,7 +390,10 @@ def search_flights(
         departure_date: Date of departure
         return_date: Optional date of return
         adults: Number of adult passengers
-        max_results: Maximum number of flight offers to return
+        max_results: Maximum number of flight offers to fetch from Amadeus
+        sort_by / max_stops / depart_after / depart_before: Ranking and filters (see rank_offers)
+        top_n: Keep only the best N offers after ranking (all by default)
+        compact: Return short summaries (FlightOffer.summary) instead of full offers
     
     outputs:
         List of normalized flight offers, each containing:
@@ -117,9 +402,49 @@ def search_flights(
         - currency: Currency of the price
         - duration: Duration of the flight itinerary
         - segments: List of flight segments with departure/arrival details
+        (or, with compact=True: id, price, duration, stops, route, departure, arrival, flights)
+    """
+
+    offers = search_flight_offers(
+        origin=origin,
+        destination=destination,
+        departure_date=departure_date,
+        return_date=return_date,
+        adults=adults,
+        max_results=max_results,
+    )
+
+    return _select(
+        offers,
+        sort_by=sort_by,
+        max_stops=max_stops,
+        depart_after=depart_after,
+        depart_before=depart_before,
+        top_n=top_n,
+        compact=compact,
+    )
+
+
+async def asearch_flights(
+    origin: str,
+    destination: str,
+    departure_date: date,
+    *,
+    return_date: Optional[date] = None,
+    adults: int = 1,
+    max_results: int = 5,
+    sort_by: str = "price",
+    max_stops: Optional[int] = None,
+    depart_after: Optional[dtime] = None,
+    depart_before: Optional[dtime] = None,
+    top_n: Optional[int] = None,
+    compact: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of search_flights (same inputs and outputs).
     """
 
-    raw_offers = _fetch_flight_offers(
+    offers = await asearch_flight_offers(
         origin=origin,
         destination=destination,
         departure_date=departure_date,
@@ -128,4 +453,178 @@ def search_flights(
         max_results=max_results,
     )
 
-    return _normalize_offers(raw_offers)
\ No newline at end of file
+    return _select(
+        offers,
+        sort_by=sort_by,
+        max_stops=max_stops,
+        depart_after=depart_after,
+        depart_before=depart_before,
+        top_n=top_n,
+        compact=compact,
+    )
+
+# ------------------------------------------------------------
+# Batch search (fan-out over origins x destinations x dates)
+# ------------------------------------------------------------
+
+def _codes(codes: Sequence[str]) -> List[str]:
+    # Upper-cased, de-duplicated, order preserved
+    return list(dict.fromkeys(c.strip().upper() for c in codes if c and c.strip()))
+
+
+def _plan_queries(
+    origins: Sequence[str],
+    destinations: Sequence[str],
+    departure_from: date,
+    departure_to: date,
+    trip_length_days: Optional[int],
+) -> List[Dict[str, Any]]:
+    if departure_to < departure_from:
+        raise FlightSearchError("departure_to must not be before departure_from")
+
+    dates = [departure_from + timedelta(days=i) for i in range((departure_to - departure_from).days + 1)]
+
+    queries = [
+        {
+            "origin": o,
+            "destination": d,
+            "departure_date": day,
+            "return_date": day + timedelta(days=trip_length_days) if trip_length_days else None,
+        }
+        for o in _codes(origins)
+        for d in _codes(destinations)
+        if o != d
+        for day in dates
+    ]
+
+    if not queries:
+        raise FlightSearchError("No origin/destination combinations to search")
+    if len(queries) > settings.FLIGHT_MATRIX_MAX_QUERIES:
+        raise FlightSearchError(
+            f"{len(queries)} searches requested; narrow the airports or dates to at most "
+            f"{settings.FLIGHT_MATRIX_MAX_QUERIES} combinations"
+        )
+
+    return queries
+
+
+def _offer_signature(offer: FlightOffer) -> tuple:
+    # The same physical itinerary at the same price, e.g. returned for both "LON" and "LHR"
+    return (
+        offer.price,
+        offer.currency,
+        tuple((s.carrier, s.flight_number, s.departure) for s in offer.segments),
+    )
+
+
+def _build_matrix(queries: List[Dict[str, Any]], results: List[Any]) -> Dict[str, Any]:
+    prices: Dict[str, Dict[str, Optional[float]]] = {}
+    failed: List[str] = []
+    best: Dict[tuple, tuple[Dict[str, Any], FlightOffer]] = {}
+    currencies = set()
+
+    for query, result in zip(queries, results):
+        route = f"{query['origin']}-{query['destination']}"
+        day = query["departure_date"].isoformat()
+
+        if isinstance(result, Exception):
+            failed.append(f"{route} {day}")
+            prices.setdefault(route, {})[day] = None
+            continue
+
+        prices.setdefault(route, {})[day] = min((o.price for o in result), default=None)
+
+        for offer in result:
+            currencies.add(offer.currency)
+            best.setdefault(_offer_signature(offer), (query, offer))
+
+    ranked = sorted(best.values(), key=lambda pair: (pair[1].price, pair[1].duration_minutes))
+    cheapest_offers = [
+        {
+            **offer.summary(),
+            "return_date": query["return_date"].isoformat() if query["return_date"] else None,
+        }
+        for query, offer in ranked[:settings.FLIGHT_MATRIX_TOP_OFFERS]
+    ]
+
+    return {
+        "currency": currencies.pop() if len(currencies) == 1 else sorted(currencies),
+        "searches": len(queries),
+        "prices": prices,
+        "cheapest": cheapest_offers,
+        "failed": failed,
+    }
+
+
+def search_flight_matrix(
+    origins: Sequence[str],
+    destinations: Sequence[str],
+    departure_from: date,
+    departure_to: Optional[date] = None,
+    *,
+    trip_length_days: Optional[int] = None,
+    adults: int = 1,
+    max_results_per_search: int = 3,
+) -> Dict[str, Any]:
+    """
+    Search every origin x destination x departure date combination concurrently and merge the results.
+
+    inputs:
+        origins: IATA codes of candidate origin airports / cities
+        destinations: IATA codes of candidate destination airports / cities
+        departure_from: First departure date to search
+        departure_to: Last departure date to search (inclusive); defaults to departure_from
+        trip_length_days: For round trips, days between departure and return
+        adults: Number of adult passengers
+        max_results_per_search: Offers requested per combination
+
+    outputs:
+        {
+            "currency": currency of all prices (a list if the searches disagree),
+            "searches": number of combinations searched,
+            "prices": {"TLV-ATH": {"YYYY-MM-DD": cheapest price or None}},
+            "cheapest": de-duplicated cheapest offers across all searches
+                        (FlightOffer.summary plus return_date),
+            "failed": combinations whose search failed ("TLV-ATH YYYY-MM-DD"),
+        }
+    """
+    queries = _plan_queries(origins, destinations, departure_from, departure_to or departure_from, trip_length_days)
+
+    # Concurrency is bounded here; the request rate is governed by the shared Amadeus limiter (see rate_limit)
+    def run(query: Dict[str, Any]) -> Any:
+        try:
+            return search_flight_offers(**query, adults=adults, max_results=max_results_per_search)
+        except FlightSearchError as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=settings.FLIGHT_MATRIX_CONCURRENCY, thread_name_prefix="flight-matrix") as pool:
+        results = list(pool.map(run, queries))
+
+    return _build_matrix(queries, results)
+
+
+async def asearch_flight_matrix(
+    origins: Sequence[str],
+    destinations: Sequence[str],
+    departure_from: date,
+    departure_to: Optional[date] = None,
+    *,
+    trip_length_days: Optional[int] = None,
+    adults: int = 1,
+    max_results_per_search: int = 3,
+) -> Dict[str, Any]:
+    """
+    Async counterpart of search_flight_matrix (same inputs and outputs).
+    """
+    queries = _plan_queries(origins, destinations, departure_from, departure_to or departure_from, trip_length_days)
+    semaphore = asyncio.Semaphore(settings.FLIGHT_MATRIX_CONCURRENCY)
+
+    async def run(query: Dict[str, Any]) -> Any:
+        async with semaphore:
+            try:
+                return await asearch_flight_offers(**query, adults=adults, max_results=max_results_per_search)
+            except FlightSearchError as exc:
+                return exc
+
+    results = await asyncio.gather(*(run(q) for q in queries))
+    return _build_matrix(queries, results)
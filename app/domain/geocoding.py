@@ -0,0 +1,294 @@
+from __future__ import annotations
+import difflib
+import json
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.config.settings import settings
+from app.infrastructure import metrics
+
+"""
+Local place-name index shared by the climate and travel-recommendation domains.
+Lookups go through three layers before any network call:
+an in-process LRU, a persistent SQLite index under the cache directory (filled from past API results),
+and a bundled offline gazetteer of major cities. Names are normalized (case, accents, punctuation)
+and near-misses are resolved by fuzzy matching against known names.
+Stored places are keyed by (name, country code). A place resolved without any country constraint is marked
+"preferred" and is the only one an unconstrained lookup may return, so a country-filtered result
+(e.g. Paris, US) never becomes the answer for a bare "Paris".
+"""
+
+# ------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------
+
+INDEX_PATH = settings.CACHE_DIR / settings.GEOCODE_INDEX_FILE_NAME
+GAZETTEER_PATH = settings.DATA_DIR / settings.GEOCODE_GAZETTEER_FILE_NAME
+
+FUZZY_MIN_LENGTH = 5  # shorter names are too ambiguous to fuzzy-match
+
+PLACE_FIELDS = ("name", "country", "country_code", "latitude", "longitude", "iata_code")
+
+LookupKey = Tuple[str, str, str]  # (normalized name, country code filter, country hint)
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def normalize_place_name(name: str) -> str:
+    """
+    Canonical lookup key: lowercase, accents stripped, punctuation collapsed to single spaces.
+    "  São-Paulo " -> "sao paulo"
+    """
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^\w\s]", " ", text.lower())
+    return " ".join(text.split())
+
+
+def _split_country_hint(name: str) -> tuple[str, Optional[str]]:
+    """
+    "Paris, France" -> ("paris", "france")
+    """
+    if "," not in name:
+        return normalize_place_name(name), None
+
+    place, hint = name.split(",", 1)
+    return normalize_place_name(place), normalize_place_name(hint) or None
+
+
+def _matches_country(place: Dict[str, Any], country_code: Optional[str], country_hint: Optional[str]) -> bool:
+    if country_code and (place.get("country_code") or "").upper() != country_code.upper():
+        return False
+
+    if country_hint and country_hint not in {
+        normalize_place_name(place.get("country") or ""),
+        (place.get("country_code") or "").lower(),
+    }:
+        return False
+
+    return True
+
+# ------------------------------------------------------------
+# Index
+# ------------------------------------------------------------
+
+class GeocodeIndex:
+    """
+    Thread-safe place index: LRU -> persistent SQLite -> offline gazetteer -> fuzzy match.
+    """
+
+    def __init__(
+        self,
+        *,
+        index_path=INDEX_PATH,
+        gazetteer_path=GAZETTEER_PATH,
+        lru_size: Optional[int] = None,
+        fuzzy_cutoff: Optional[float] = None,
+    ):
+        self.index_path = index_path
+        self.gazetteer_path = gazetteer_path
+        self.lru_size = lru_size or settings.GEOCODE_LRU_SIZE
+        self.fuzzy_cutoff = fuzzy_cutoff or settings.GEOCODE_FUZZY_CUTOFF
+
+        self._lock = threading.RLock()
+        self._lru: "OrderedDict[LookupKey, Dict[str, Any]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._gazetteer: Optional[Dict[str, Dict[str, Any]]] = None
+        self._known_keys: Optional[set[str]] = None
+
+    # ------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS place_names ("
+                " key TEXT NOT NULL, name TEXT, country TEXT, country_code TEXT NOT NULL,"
+                " latitude REAL, longitude REAL, iata_code TEXT, preferred INTEGER NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (key, country_code))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _load_gazetteer(self) -> Dict[str, Dict[str, Any]]:
+        if self._gazetteer is None:
+            entries: Dict[str, Dict[str, Any]] = {}
+
+            if self.gazetteer_path.exists():
+                with open(self.gazetteer_path, encoding="utf-8") as f:
+                    for row in json.load(f):
+                        place = {field: row.get(field) for field in PLACE_FIELDS}
+                        for alias in [row["name"], *row.get("aliases", [])]:
+                            entries.setdefault(normalize_place_name(alias), place)
+
+            self._gazetteer = entries
+        return self._gazetteer
+
+    def _index_get(self, key: str, country_code: Optional[str], country_hint: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Stored place for the name: the preferred one when unconstrained, else the first one in the requested country.
+        """
+        rows = self._connection().execute(
+            f"SELECT preferred, {', '.join(PLACE_FIELDS)} FROM place_names WHERE key = ? ORDER BY preferred DESC, rowid",
+            (key,),
+        ).fetchall()
+
+        for preferred, *values in rows:
+            place = dict(zip(PLACE_FIELDS, values))
+            if country_code or country_hint:
+                if _matches_country(place, country_code, country_hint):
+                    return place
+            elif preferred:
+                return place
+        return None
+
+    def _all_keys(self) -> set[str]:
+        if self._known_keys is None:
+            rows = self._connection().execute("SELECT DISTINCT key FROM place_names").fetchall()
+            self._known_keys = {r[0] for r in rows} | set(self._load_gazetteer())
+        return self._known_keys
+
+    def _lru_put(self, key: LookupKey, place: Dict[str, Any]) -> None:
+        self._lru[key] = place
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    # ------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------
+
+    def _resolve(self, key: str, country_code: Optional[str], country_hint: Optional[str]) -> Optional[Dict[str, Any]]:
+        place = self._index_get(key, country_code, country_hint)
+        if place:
+            metrics.increment("geocode.hit.index")
+            return place
+
+        place = self._load_gazetteer().get(key)
+        if place and _matches_country(place, country_code, country_hint):
+            metrics.increment("geocode.hit.gazetteer")
+            return place
+        return None
+
+    def _fuzzy(self, key: str, country_code: Optional[str], country_hint: Optional[str]) -> Optional[Dict[str, Any]]:
+        if len(key) < FUZZY_MIN_LENGTH:
+            return None
+
+        candidates = difflib.get_close_matches(key, self._all_keys(), n=1, cutoff=self.fuzzy_cutoff)
+        place = self._resolve(candidates[0], country_code, country_hint) if candidates else None
+        if place:
+            metrics.increment("geocode.hit.fuzzy")
+        return place
+
+    def lookup(self, place_name: str, *, country_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a place name locally.
+        inputs:
+            place_name: Free-text place name, optionally with a country ("Paris, France")
+            country_code: Optional ISO country code the match must belong to
+        outputs:
+            A place dict (name, country, country_code, latitude, longitude, iata_code) or None on a miss.
+        """
+        key, country_hint = _split_country_hint(place_name)
+        if not key:
+            return None
+
+        lru_key = (key, (country_code or "").upper(), country_hint or "")
+
+        with self._lock:
+            if lru_key in self._lru:
+                self._lru.move_to_end(lru_key)
+                metrics.increment("geocode.hit.lru")
+                return dict(self._lru[lru_key])
+
+            place = self._resolve(key, country_code, country_hint) or self._fuzzy(key, country_code, country_hint)
+            if place:
+                self._lru_put(lru_key, place)
+                return dict(place)
+
+        metrics.increment("geocode.miss")
+        return None
+
+    def remember(self, place_name: str, place: Dict[str, Any], *, country_code: Optional[str] = None) -> None:
+        """
+        Persist an API-resolved place under both the queried name and the canonical name, scoped to its country.
+        inputs:
+            country_code: The country filter the place was resolved with, if any. Only places resolved without
+                a filter or a country hint become the answer for the bare name.
+        """
+        key, country_hint = _split_country_hint(place_name)
+        record = {field: place.get(field) for field in PLACE_FIELDS}
+        row = {**record, "country_code": (record["country_code"] or "").upper()}
+        preferred = int(not country_code and not country_hint)
+
+        keys = {key, normalize_place_name(record["name"] or "")}
+        keys.discard("")
+
+        with self._lock:
+            conn = self._connection()
+            # Keep the first resolution for a (name, country); a later unconstrained one may only promote it
+            conn.executemany(
+                f"INSERT INTO place_names (key, {', '.join(PLACE_FIELDS)}, preferred) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (key, country_code) DO UPDATE SET preferred = MAX(preferred, excluded.preferred)",
+                [(k, *(row[f] for f in PLACE_FIELDS), preferred) for k in keys],
+            )
+            conn.commit()
+
+            if key:
+                self._lru_put((key, (country_code or "").upper(), country_hint or ""), record)
+            if self._known_keys is not None:
+                self._known_keys.update(keys)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._known_keys = None
+
+# ------------------------------------------------------------
+# Singleton
+# ------------------------------------------------------------
+
+_geocode_index: Optional[GeocodeIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_geocode_index() -> GeocodeIndex:
+    """
+    Returns the shared GeocodeIndex, creating it lazily on first use.
+    """
+    global _geocode_index
+
+    if _geocode_index is None:
+        with _INDEX_LOCK:
+            if _geocode_index is None:
+                _geocode_index = GeocodeIndex()
+
+    return _geocode_index
+
+
+def lookup_place(place_name: str, *, country_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Resolve a place through the shared index (None on a miss or when the cache is disabled).
+    """
+    if not settings.GEOCODE_CACHE_ENABLED:
+        return None
+    return get_geocode_index().lookup(place_name, country_code=country_code)
+
+
+def remember_place(place_name: str, place: Dict[str, Any], *, country_code: Optional[str] = None) -> None:
+    """
+    Store an API-resolved place in the shared index (no-op when the cache is disabled).
+    `country_code` is the country filter the place was resolved with, if any.
+    """
+    if settings.GEOCODE_CACHE_ENABLED:
+        get_geocode_index().remember(place_name, place, country_code=country_code)
+
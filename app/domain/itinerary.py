@@ -0,0 +1,242 @@
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from app.config.settings import settings
+from app.domain.climate import ClimateServiceError, fetch_climate_data, afetch_climate_data
+from app.domain.embassies import EmbassyServiceError, get_israeli_embassies, aget_israeli_embassies
+from app.domain.entry_requirements import VisaServiceError, get_visa_requirements, aget_visa_requirements
+from app.domain.travel_warnings import COUNTRY_ALIASES, TravelWarningsServiceError, fetch_travel_warnings
+from app.domain.visa_matrix import normalize_country_code
+
+"""
+Multi-destination trip briefing.
+For a list of stops, every per-country lookup (travel warnings, entry requirements, Israeli embassies) and
+every per-stop climate lookup runs concurrently, and the answers are merged into one compact briefing,
+so the agent needs a single tool call for a whole itinerary instead of four per country.
+A failed lookup leaves its section empty and is reported in "errors"; it never fails the whole briefing.
+"""
+
+# ------------------------------------------------------------
+# Errors
+# ------------------------------------------------------------
+
+class ItineraryError(RuntimeError):
+    pass
+
+
+_SECTION_ERRORS = (ClimateServiceError, EmbassyServiceError, VisaServiceError, TravelWarningsServiceError)
+
+# ------------------------------------------------------------
+# Model
+# ------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class ItineraryStop:
+    city: str
+    country_code: str  # ISO 3166-1 alpha-2
+    arrival: date
+    departure: Optional[date] = None
+
+    @property
+    def months(self) -> List[int]:
+        """
+        Calendar months the stay spans, in order (wrapping over new year).
+        """
+        end = self.departure or self.arrival
+        count = (end.year - self.arrival.year) * 12 + end.month - self.arrival.month + 1
+        return [(self.arrival.month - 1 + i) % 12 + 1 for i in range(max(1, min(count, 12)))]
+
+
+Task = Tuple[str, str, Callable[..., Any], Tuple[Any, ...]]  # (section, key, function, args)
+
+# ------------------------------------------------------------
+# Planning
+# ------------------------------------------------------------
+
+def _country_name(code: str) -> str:
+    # English name understood by the warnings and embassy datasets; unknown codes are passed through
+    name = COUNTRY_ALIASES.get(code)
+    if not name:
+        return code
+    return " ".join(word if word in {"and", "of", "the"} else word.capitalize() for word in name.split())
+
+
+def _validate(stops: Sequence[ItineraryStop]) -> None:
+    if not stops:
+        raise ItineraryError("An itinerary needs at least one stop.")
+
+    if len(stops) > settings.ITINERARY_MAX_STOPS:
+        raise ItineraryError(f"Too many stops ({len(stops)}); at most {settings.ITINERARY_MAX_STOPS} are supported.")
+
+    for stop in stops:
+        if stop.departure and stop.departure < stop.arrival:
+            raise ItineraryError(f"Departure from {stop.city} is before arrival.")
+
+
+def _countries(stops: Sequence[ItineraryStop]) -> List[str]:
+    return list(dict.fromkeys(normalize_country_code(stop.country_code) for stop in stops))
+
+
+def _plan(stops: Sequence[ItineraryStop], passport: str, sync: bool) -> List[Task]:
+    """
+    One task per country and section, plus one climate task per distinct (city, month).
+    """
+    tasks: List[Task] = []
+
+    for code in _countries(stops):
+        name = _country_name(code)
+        tasks.append(("travel_warnings", code, fetch_travel_warnings, (name,)))
+        tasks.append(("entry", code, get_visa_requirements if sync else aget_visa_requirements, (passport, code)))
+        tasks.append(("embassies", code, get_israeli_embassies if sync else aget_israeli_embassies, (name,)))
+
+    climate = fetch_climate_data if sync else afetch_climate_data
+    for stop in stops:
+        for month in stop.months:
+            tasks.append(("climate", f"{stop.city}|{month}", climate, (stop.city, month)))
+
+    # A city visited twice in the same month is looked up once
+    return list({(section, key): (section, key, fn, args) for section, key, fn, args in tasks}.values())
+
+# ------------------------------------------------------------
+# Compaction
+# ------------------------------------------------------------
+
+def _compact_entry(result: Dict[str, Any]) -> Dict[str, Any]:
+    visa = result.get("visa") or {}
+    registration = result.get("mandatory_registration") or {}
+    return {
+        "visa": visa.get("summary"),
+        "link": (visa.get("primary_rule") or {}).get("link"),
+        "mandatory_registration": registration.get("name"),
+    }
+
+
+def _compact_embassies(embassies: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    fields = ("city", "type", "phone", "email")
+    return [{field: e.get(field) for field in fields} for e in embassies]
+
+
+def _compact_climate(climate: Dict[str, Any]) -> Dict[str, Any]:
+    fields = ("month", "average_temperature_c", "min_temperature_c", "max_temperature_c", "average_rainy_days")
+    return {field: climate.get(field) for field in fields}
+
+
+_COMPACTORS: Dict[str, Callable[[Any], Any]] = {
+    "travel_warnings": sorted,
+    "entry": _compact_entry,
+    "embassies": _compact_embassies,
+    "climate": _compact_climate,
+}
+
+
+def _merge(
+    stops: Sequence[ItineraryStop],
+    passport: str,
+    tasks: Sequence[Task],
+    results: Sequence[Any],
+) -> Dict[str, Any]:
+    answers: Dict[Tuple[str, str], Any] = {}
+    errors: List[str] = []
+
+    for (section, key, _, _), result in zip(tasks, results):
+        if isinstance(result, Exception):
+            errors.append(f"{section} ({key.replace('|', ', month ')}): {result}")
+            answers[(section, key)] = None
+        else:
+            answers[(section, key)] = _COMPACTORS[section](result)
+
+    countries = {
+        code: {
+            "country": _country_name(code),
+            **{section: answers.get((section, code)) for section in ("travel_warnings", "entry", "embassies")},
+        }
+        for code in _countries(stops)
+    }
+
+    briefing_stops = [
+        {
+            "city": stop.city,
+            "country_code": normalize_country_code(stop.country_code),
+            "arrival_date": stop.arrival.isoformat(),
+            "departure_date": stop.departure.isoformat() if stop.departure else None,
+            "climate": [
+                climate for month in stop.months
+                if (climate := answers.get(("climate", f"{stop.city}|{month}"))) is not None
+            ],
+        }
+        for stop in stops
+    ]
+
+    return {"passport": passport, "stops": briefing_stops, "countries": countries, "errors": errors}
+
+# ------------------------------------------------------------
+# Public domain API
+# ------------------------------------------------------------
+
+def build_itinerary_briefing(
+    stops: Sequence[ItineraryStop],
+    passport_country_code: str = "IL",
+) -> Dict[str, Any]:
+    """
+    Travel warnings, entry requirements, embassies and climate for every stop of a trip, in one call.
+
+    inputs:
+        stops: Stops in travel order (city, ISO alpha-2 country code, arrival and optional departure date)
+        passport_country_code: ISO alpha-2 code of the traveler's passport
+    outputs:
+        {
+            "passport": str,
+            "stops": [{"city", "country_code", "arrival_date", "departure_date",
+                       "climate": [{"month", "average_temperature_c", "min_temperature_c",
+                                    "max_temperature_c", "average_rainy_days"}, ...]}],
+            "countries": {code: {"country", "travel_warnings": [str],
+                                 "entry": {"visa", "link", "mandatory_registration"},
+                                 "embassies": [{"city", "type", "phone", "email"}]}},
+            "errors": [str],  # lookups that failed; their sections are None / missing
+        }
+    """
+    _validate(stops)
+    passport = normalize_country_code(passport_country_code)
+    tasks = _plan(stops, passport, sync=True)
+
+    def run(task: Task) -> Any:
+        _, _, fn, args = task
+        try:
+            return fn(*args)
+        except _SECTION_ERRORS as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=settings.ITINERARY_CONCURRENCY, thread_name_prefix="itinerary") as pool:
+        results = list(pool.map(run, tasks))
+
+    return _merge(stops, passport, tasks, results)
+
+
+async def abuild_itinerary_briefing(
+    stops: Sequence[ItineraryStop],
+    passport_country_code: str = "IL",
+) -> Dict[str, Any]:
+    """
+    Async counterpart of build_itinerary_briefing (same inputs and outputs).
+    """
+    _validate(stops)
+    passport = normalize_country_code(passport_country_code)
+    tasks = _plan(stops, passport, sync=False)
+    semaphore = asyncio.Semaphore(settings.ITINERARY_CONCURRENCY)
+
+    async def run(task: Task) -> Any:
+        _, _, fn, args = task
+        async with semaphore:
+            try:
+                if asyncio.iscoroutinefunction(fn):
+                    return await fn(*args)
+                # In-memory lookups without an async variant (travel warnings)
+                return await asyncio.to_thread(fn, *args)
+            except _SECTION_ERRORS as exc:
+                return exc
+
+    results = await asyncio.gather(*(run(task) for task in tasks))
+    return _merge(stops, passport, tasks, results)
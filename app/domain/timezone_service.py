@@ -1,18 +1,35 @@
 from __future__ import annotations
-from typing import Dict, Any
+import logging
+from bisect import bisect_right
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import httpx
 import requests
+from app.config.settings import settings
+from app.infrastructure import metrics
+from app.infrastructure.async_http import ahttp_get
+from app.infrastructure.http_client import http_get
+from app.infrastructure.resilience import UpstreamUnavailableError
 
 """
-Domain logic for timezone service using WorldTimeAPI.
-Fetches current local time and timezone metadata for a given timezone.
+Domain logic for the timezone service.
+Current local time and timezone metadata are computed from the IANA database (zoneinfo / tzdata) in the
+WorldTimeAPI response schema, so answering "what time is it in X" needs no network call.
+Per zone, the UTC offset periods (DST transitions) around the current year are precomputed once and looked
+up by bisection. WorldTimeAPI is only called as an optional cross-check (settings.TIMEZONE_REMOTE_CROSSCHECK).
 """
 
+logger = logging.getLogger(__name__)
+
 # ------------------------------------------------------------
 # Constants
 # ------------------------------------------------------------
 
 WORLD_TIME_API_BASE = "http://worldtimeapi.org/api"
-REQUEST_TIMEOUT_SECONDS = 10
+
+_DAY = 86400
 
 # ------------------------------------------------------------
 # Errors
@@ -31,44 +48,198 @@ def _validate_timezone(timezone: str) -> None:
             "Invalid timezone format. Expected 'Area/Location'."
         )
 
+
+def _load_zone(timezone: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise WorldTimeServiceError(f"Unknown timezone '{timezone}'.") from exc
+
+
+def _format_offset(seconds: int) -> str:
+    sign = "-" if seconds < 0 else "+"
+    hours, minutes = divmod(abs(seconds) // 60, 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+
+def _utc_iso(unixtime: int) -> str:
+    return datetime.fromtimestamp(unixtime, dt_timezone.utc).isoformat()
+
 # ------------------------------------------------------------
-# Fetch & normalize
+# Transition tables
 # ------------------------------------------------------------
 
+class _Period(NamedTuple):
+    start: int  # unix seconds, inclusive
+    utc_offset: int  # seconds
+    dst_offset: int  # seconds
+    abbreviation: str
+
+
+def _state(zone: ZoneInfo, unixtime: int) -> Tuple[int, int, str]:
+    local = datetime.fromtimestamp(unixtime, zone)
+    return int(local.utcoffset().total_seconds()), int(local.dst().total_seconds()), local.tzname()
+
+
+def _find_transition(zone: ZoneInfo, low: int, high: int) -> int:
+    # First second in (low, high] whose state differs from `low`
+    before = _state(zone, low)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if _state(zone, middle) == before:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+@lru_cache(maxsize=512)
+def _transition_table(timezone: str, year: int) -> Tuple[_Period, ...]:
+    """
+    Offset periods of `timezone` from 1 January of `year` to the end of year + TIMEZONE_TRANSITION_YEARS.
+    The zone is sampled daily (transitions are at least weeks apart) and each change is bisected to the second.
+    """
+    zone = _load_zone(timezone)
+    window_start = int(datetime(year, 1, 1, tzinfo=dt_timezone.utc).timestamp())
+    window_end = int(datetime(year + 1 + settings.TIMEZONE_TRANSITION_YEARS, 1, 1, tzinfo=dt_timezone.utc).timestamp())
+
+    periods = [_Period(window_start, *_state(zone, window_start))]
+    previous = window_start
+    for sample in range(window_start + _DAY, window_end + 1, _DAY):
+        if _state(zone, sample) != periods[-1][1:]:
+            start = _find_transition(zone, previous, sample)
+            periods.append(_Period(start, *_state(zone, start)))
+        previous = sample
+
+    metrics.increment("timezone.table.build")
+    return tuple(periods)
+
+
+def _period_at(timezone: str, unixtime: int) -> Tuple[Tuple[_Period, ...], int]:
+    # Tables start at 1 January, so the period in force at `unixtime` always has a known predecessor in the window
+    year = datetime.fromtimestamp(unixtime, dt_timezone.utc).year - 1
+    table = _transition_table(timezone, year)
+    index = bisect_right([period.start for period in table], unixtime) - 1
+    return table, index
+
+# ------------------------------------------------------------
+# Local computation
+# ------------------------------------------------------------
+
+def _local_time_data(timezone: str, now: datetime) -> Dict[str, Any]:
+    """
+    WorldTimeAPI-shaped time data for `timezone` at the UTC instant `now`.
+    """
+    _validate_timezone(timezone)
+    zone = _load_zone(timezone)
+
+    unixtime = int(now.timestamp())
+    table, index = _period_at(timezone, unixtime)
+    period = table[index]
+
+    local = now.astimezone(zone)
+    is_dst = period.dst_offset != 0
+    next_start = table[index + 1].start if index + 1 < len(table) else None
+
+    return {
+        "abbreviation": local.tzname(),
+        "datetime": local.isoformat(),
+        "day_of_week": int(local.strftime("%w")),  # 0 = Sunday, as WorldTimeAPI
+        "day_of_year": local.timetuple().tm_yday,
+        "dst": is_dst,
+        "dst_from": _utc_iso(period.start) if is_dst and index > 0 else None,
+        "dst_offset": period.dst_offset,
+        "dst_until": _utc_iso(next_start) if is_dst and next_start is not None else None,
+        "raw_offset": period.utc_offset - period.dst_offset,
+        "timezone": timezone,
+        "unixtime": unixtime,
+        "utc_datetime": now.astimezone(dt_timezone.utc).isoformat(),
+        "utc_offset": _format_offset(period.utc_offset),
+        "week_number": local.isocalendar().week,
+    }
+
+
+def _now() -> datetime:
+    return datetime.now(dt_timezone.utc)
+
+# ------------------------------------------------------------
+# Remote cross-check (WorldTimeAPI)
+# ------------------------------------------------------------
+
+def _parse_time_response(status_code: int, payload_fn, timezone: str) -> Dict[str, Any]:
+    if status_code == 404:
+        raise WorldTimeServiceError(f"Unknown timezone '{timezone}'.")
+
+    if status_code >= 400:
+        raise WorldTimeServiceError(
+            f"WorldTimeAPI unavailable after retries (HTTP {status_code})."
+        )
+
+    try:
+        return payload_fn()
+    except ValueError as exc:
+        raise WorldTimeServiceError(
+            "Invalid JSON response from WorldTimeAPI."
+        ) from exc
+
+
 def _fetch_time_data(timezone: str) -> Dict[str, Any]:
+    # Retries, circuit breaking and hedging are handled by the shared HTTP layer
     url = f"{WORLD_TIME_API_BASE}/timezone/{timezone}"
-    last_exc: Exception | None = None
 
-    for attempt in range(3):
-        try:
-            response = requests.get(url, timeout=REQUEST_TIMEOUT_SECONDS)
-            response.raise_for_status()
+    try:
+        response = http_get(url)
+    except (requests.exceptions.RequestException, UpstreamUnavailableError) as exc:
+        raise WorldTimeServiceError(
+            "WorldTimeAPI unavailable after retries."
+        ) from exc
+
+    return _parse_time_response(response.status_code, response.json, timezone)
+
+
+async def _afetch_time_data(timezone: str) -> Dict[str, Any]:
+    url = f"{WORLD_TIME_API_BASE}/timezone/{timezone}"
+
+    try:
+        response = await ahttp_get(url)
+    except (httpx.HTTPError, UpstreamUnavailableError) as exc:
+        raise WorldTimeServiceError(
+            "WorldTimeAPI unavailable after retries."
+        ) from exc
+
+    return _parse_time_response(response.status_code, response.json, timezone)
 
-            try:
-                return response.json()
-            except ValueError as exc:
-                raise WorldTimeServiceError(
-                    "Invalid JSON response from WorldTimeAPI."
-                ) from exc
 
-        except requests.exceptions.Timeout as exc:
-            last_exc = exc
+def _compare(local: Dict[str, Any], remote: Optional[Dict[str, Any]]) -> None:
+    if remote is None:
+        return
 
-        except requests.exceptions.HTTPError as exc:
-            if response.status_code == 404:
-                raise WorldTimeServiceError(
-                    f"Unknown timezone '{timezone}'."
-                ) from exc
+    fields = ("utc_offset", "dst", "abbreviation")
+    mismatched = [name for name in fields if remote.get(name) != local[name]]
+    if mismatched:
+        # Usually an outdated tzdata on this host
+        metrics.increment("timezone.crosscheck.mismatch")
+        logger.warning(
+            "Local timezone data for %s disagrees with WorldTimeAPI on %s: local=%s remote=%s",
+            local["timezone"], ", ".join(mismatched),
+            {name: local[name] for name in mismatched}, {name: remote.get(name) for name in mismatched},
+        )
+    else:
+        metrics.increment("timezone.crosscheck.match")
 
-            last_exc = exc
 
-        except requests.exceptions.RequestException as exc:
-            last_exc = exc
+def _cross_check(local: Dict[str, Any]) -> None:
+    try:
+        _compare(local, _fetch_time_data(local["timezone"]))
+    except WorldTimeServiceError as exc:
+        logger.debug("WorldTimeAPI cross-check skipped: %s", exc)
 
-    raise WorldTimeServiceError(
-        "WorldTimeAPI unavailable after retries."
-    ) from last_exc
 
+async def _across_check(local: Dict[str, Any]) -> None:
+    try:
+        _compare(local, await _afetch_time_data(local["timezone"]))
+    except WorldTimeServiceError as exc:
+        logger.debug("WorldTimeAPI cross-check skipped: %s", exc)
 
 # ------------------------------------------------------------
 # Public domain API
@@ -80,8 +251,43 @@ def get_current_time_by_timezone(timezone: str) -> Dict[str, Any]:
     inputs:
         timezone: Timezone string in 'Area/Location' format, e.g., 'Europe/London'
     outputs:
-        A dictionary containing current time and timezone information.
+        A dictionary containing current time and timezone information (WorldTimeAPI schema).
     """
 
-    _validate_timezone(timezone)
-    return _fetch_time_data(timezone)
\ No newline at end of file
+    data = _local_time_data(timezone, _now())
+    if settings.TIMEZONE_REMOTE_CROSSCHECK:
+        _cross_check(data)
+    return data
+
+
+async def aget_current_time_by_timezone(timezone: str) -> Dict[str, Any]:
+    """
+    Async counterpart of get_current_time_by_timezone (same inputs and outputs).
+    """
+
+    data = _local_time_data(timezone, _now())
+    if settings.TIMEZONE_REMOTE_CROSSCHECK:
+        await _across_check(data)
+    return data
+
+
+def get_current_times(timezones: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Current local time in several timezones at the same instant.
+    inputs:
+        timezones: Timezone strings in 'Area/Location' format
+    outputs:
+        {timezone: time data} in input order; an invalid timezone maps to {"error": message}
+        instead of failing the whole batch.
+    """
+
+    now = _now()
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for timezone in timezones:
+        try:
+            results[timezone] = _local_time_data(timezone, now)
+        except WorldTimeServiceError as exc:
+            results[timezone] = {"error": str(exc)}
+
+    return results
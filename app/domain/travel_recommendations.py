@@ -1,10 +1,12 @@
 from __future__ import annotations
 from typing import Optional, Dict, Any, List
+from app.domain.geocoding import lookup_place, remember_place
 from app.infrastructure.amadeus_client import get_amadeus_client
 
 """
 Domain logic for travel recommendations using Amadeus API.
 Resolves a city to coordinates and returns nearby destination experiences.
+Cities known to the local geocoding index are resolved without calling the Amadeus city search.
 """
 
 # ------------------------------------------------------------
@@ -25,40 +27,154 @@ class TravelRecommendationError(RuntimeError):
 # Fetch & normalize
 # ------------------------------------------------------------
 
+def _city_params(
+    keyword: str,
+    *,
+    country_code: Optional[str],
+    max_results: int,
+) -> Dict[str, Any]:
+    params = {
+        "keyword": keyword,
+        "max": max_results,
+    }
+    if country_code:
+        params["countryCode"] = country_code
+
+    return params
+
+
+def _parse_city(response: Dict[str, Any], keyword: str) -> Dict[str, Any]:
+    data = response.get("data", [])
+
+    if not data:
+        raise TravelRecommendationError(
+            f"City not found: '{keyword}'"
+        )
+
+    city = data[0]
+    geo = city.get("geoCode", {})
+
+    return {
+        "name": city.get("name"),
+        "iata_code": city.get("iataCode"),
+        "country_code": city.get("address", {}).get("countryCode"),
+        "latitude": geo.get("latitude"),
+        "longitude": geo.get("longitude"),
+    }
+
+
+def _city_from_index(keyword: str, country_code: Optional[str]) -> Optional[Dict[str, Any]]:
+    place = lookup_place(keyword, country_code=country_code)
+    if not place:
+        return None
+
+    return {
+        "name": place["name"],
+        "iata_code": place.get("iata_code"),
+        "country_code": place.get("country_code"),
+        "latitude": place["latitude"],
+        "longitude": place["longitude"],
+    }
+
+
+def _remember_city(keyword: str, city: Dict[str, Any], country_code: Optional[str]) -> None:
+    if city["latitude"] is None or city["longitude"] is None:
+        return
+
+    # Amadeus returns upper-case names ("PARIS"); store them in display form
+    remember_place(keyword, {**city, "name": (city["name"] or keyword).title()}, country_code=country_code)
+
+
+def _parse_activities(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    activities: List[Dict[str, Any]] = []
+
+    for item in response.get("data", []):
+        activities.append(
+            {
+                "id": item.get("id"),
+                "name": item.get("name"),
+                "description": item.get("shortDescription"),
+                "rating": float(item["rating"])
+                if item.get("rating")
+                else 0.0,
+                "price": float(item["price"]["amount"])
+                if item.get("price")
+                else None,
+                "currency": item["price"]["currencyCode"]
+                if item.get("price")
+                else None,
+                "latitude": float(item["geoCode"]["latitude"]),
+                "longitude": float(item["geoCode"]["longitude"]),
+                "booking_link": item.get("bookingLink"),
+            }
+        )
+
+    # Sort by rating DESC, then price ASC
+    activities.sort(
+        key=lambda x: (
+            x["rating"],
+            -x["price"] if x["price"] is not None else float("-inf"),
+        ),
+        reverse=True,
+    )
+
+    return activities
+
+
 def _fetch_city(
     keyword: str,
     *,
     country_code: Optional[str],
     max_results: int,
 ) -> Dict[str, Any]:
+    cached = _city_from_index(keyword, country_code)
+    if cached:
+        return cached
+
     try:
         client = get_amadeus_client()
 
-        params = {
-            "keyword": keyword,
-            "max": max_results,
-        }
-        if country_code:
-            params["countryCode"] = country_code
+        params = _city_params(
+            keyword,
+            country_code=country_code,
+            max_results=max_results,
+        )
 
         response = client.get(CITY_SEARCH_PATH, params=params)
-        data = response.get("data", [])
+        city = _parse_city(response, keyword)
+
+    except Exception as exc:
+        if isinstance(exc, TravelRecommendationError):
+            raise
+        raise TravelRecommendationError(
+            "Failed to resolve city coordinates"
+        ) from exc
+
+    _remember_city(keyword, city, country_code)
+    return city
 
-        if not data:
-            raise TravelRecommendationError(
-                f"City not found: '{keyword}'"
-            )
 
-        city = data[0]
-        geo = city.get("geoCode", {})
+async def _afetch_city(
+    keyword: str,
+    *,
+    country_code: Optional[str],
+    max_results: int,
+) -> Dict[str, Any]:
+    cached = _city_from_index(keyword, country_code)
+    if cached:
+        return cached
+
+    try:
+        client = get_amadeus_client()
 
-        return {
-            "name": city.get("name"),
-            "iata_code": city.get("iataCode"),
-            "country_code": city.get("address", {}).get("countryCode"),
-            "latitude": geo.get("latitude"),
-            "longitude": geo.get("longitude"),
-        }
+        params = _city_params(
+            keyword,
+            country_code=country_code,
+            max_results=max_results,
+        )
+
+        response = await client.aget(CITY_SEARCH_PATH, params=params)
+        city = _parse_city(response, keyword)
 
     except Exception as exc:
         if isinstance(exc, TravelRecommendationError):
@@ -67,6 +183,9 @@ def _fetch_city(
             "Failed to resolve city coordinates"
         ) from exc
 
+    _remember_city(keyword, city, country_code)
+    return city
+
 
 def _fetch_activities(
     latitude: float,
@@ -86,39 +205,33 @@ def _fetch_activities(
             },
         )
 
-        activities: List[Dict[str, Any]] = []
-
-        for item in response.get("data", []):
-            activities.append(
-                {
-                    "id": item.get("id"),
-                    "name": item.get("name"),
-                    "description": item.get("shortDescription"),
-                    "rating": float(item["rating"])
-                    if item.get("rating")
-                    else 0.0,
-                    "price": float(item["price"]["amount"])
-                    if item.get("price")
-                    else None,
-                    "currency": item["price"]["currencyCode"]
-                    if item.get("price")
-                    else None,
-                    "latitude": float(item["geoCode"]["latitude"]),
-                    "longitude": float(item["geoCode"]["longitude"]),
-                    "booking_link": item.get("bookingLink"),
-                }
-            )
-
-        # Sort by rating DESC, then price ASC
-        activities.sort(
-            key=lambda x: (
-                x["rating"],
-                -x["price"] if x["price"] is not None else float("-inf"),
-            ),
-            reverse=True,
+        return _parse_activities(response)
+
+    except Exception as exc:
+        raise TravelRecommendationError(
+            "Failed to fetch destination activities"
+        ) from exc
+
+
+async def _afetch_activities(
+    latitude: float,
+    longitude: float,
+    *,
+    radius_km: int,
+) -> List[Dict[str, Any]]:
+    try:
+        client = get_amadeus_client()
+
+        response = await client.aget(
+            ACTIVITIES_PATH,
+            params={
+                "latitude": latitude,
+                "longitude": longitude,
+                "radius": radius_km,
+            },
         )
 
-        return activities
+        return _parse_activities(response)
 
     except Exception as exc:
         raise TravelRecommendationError(
@@ -163,4 +276,34 @@ def get_travel_recommendations(
         "city": city_data["name"],
         "country_code": city_data["country_code"],
         "recommendations": activities[:k],
-    }
\ No newline at end of file
+    }
+
+
+async def aget_travel_recommendations(
+    city: str,
+    *,
+    country_code: Optional[str] = None,
+    k: int = 5,
+    radius_km: int = 10,
+) -> Dict[str, Any]:
+    """
+    Async counterpart of get_travel_recommendations (same inputs and outputs).
+    """
+
+    city_data = await _afetch_city(
+        keyword=city,
+        country_code=country_code,
+        max_results=1,
+    )
+
+    activities = await _afetch_activities(
+        latitude=city_data["latitude"],
+        longitude=city_data["longitude"],
+        radius_km=radius_km,
+    )
+
+    return {
+        "city": city_data["name"],
+        "country_code": city_data["country_code"],
+        "recommendations": activities[:k],
+    }
@@ -1,14 +1,20 @@
 import json
-import requests
-from pathlib import Path
-from datetime import datetime, timedelta
+import threading
+from datetime import timedelta
+from typing import NamedTuple, Sequence
 import sys
 from app.config.settings import settings
+from app.domain.geocoding import normalize_place_name
+from app.infrastructure.dataset_cache import DatasetCache, DatasetUnavailableError
+from app.infrastructure.dataset_format import ColumnarTable
+from app.infrastructure.http_client import http_get
 sys.stdout.reconfigure(encoding="utf-8")
 
 """
 Domain logic for travel warnings using Israeli government API.
 Fetches travel warnings with daily caching and provides recommendations per country.
+Nothing is fetched at import time: the dataset loads on first use (or via start_warmup at boot),
+and a stale cache is served while a background refresh swaps in the new index (see dataset_cache).
 """
 
 # ---------------------------------------------------------------------
@@ -19,65 +25,142 @@ DATASET_LIMIT = 32000
 settings.CACHE_DIR.mkdir(parents=True, exist_ok=True)
 CACHE_FILE = settings.CACHE_DIR / "travel_warnings_cache.json"
 BASE_FILE = settings.DATA_DIR / "country_en_to_he.json"
+ALIASES_FILE = settings.DATA_DIR / "country_aliases.json"
 CACHE_TTL = timedelta(days=1)
 
+# ---------------------------------------------------------------------
+# Errors
+# ---------------------------------------------------------------------
+class TravelWarningsServiceError(RuntimeError):
+    pass
+
 # ---------------------------------------------------------------------
 # Load English -> Hebrew country mapping
 # ---------------------------------------------------------------------
 with open(BASE_FILE, encoding="utf-8") as f:
     COUNTRY_EN_TO_HE = json.load(f)
 
+# ISO alpha-2 / alpha-3 codes and alternate spellings -> English key of COUNTRY_EN_TO_HE
+with open(ALIASES_FILE, encoding="utf-8") as f:
+    COUNTRY_ALIASES = json.load(f)
+
 # ---------------------------------------------------------------------
-# Cache helpers
+# Country index
 # ---------------------------------------------------------------------
-def is_cache_fresh(path: Path, ttl: timedelta) -> bool:
-    if not path.exists():
-        return False
-    modified_time = datetime.fromtimestamp(path.stat().st_mtime)
-    return datetime.now() - modified_time < ttl
+def _alias_key(name: str) -> str:
+    key = normalize_place_name(name)
+    return key[4:] if key.startswith("the ") else key
+
+
+def _build_alias_map() -> dict[str, str]:
+    """
+    Every accepted form of a country name (normalized) -> Hebrew country name used by the dataset.
+    """
+    aliases = {}
+    for en, he in COUNTRY_EN_TO_HE.items():
+        aliases[_alias_key(en)] = he
+        aliases[_alias_key(he)] = he
+
+    for alias, en in COUNTRY_ALIASES.items():
+        aliases.setdefault(_alias_key(alias), COUNTRY_EN_TO_HE[en])
+
+    return aliases
+
+
+COUNTRY_ALIAS_TO_HE = _build_alias_map()
+
+
+def build_country_index(records: list[dict]) -> dict[str, frozenset[str]]:
+    """
+    Group recommendations by (Hebrew) country once, so lookups are a dict access instead of a scan.
+    """
+    index: dict[str, set[str]] = {}
+    for r in records:
+        if r.get("country") and r.get("recommendations"):
+            index.setdefault(r["country"], set()).add(r["recommendations"])
+
+    return {country: frozenset(recs) for country, recs in index.items()}
+
+
+def resolve_country(country: str) -> str | None:
+    """
+    Hebrew dataset name for any accepted form of a country (English name, ISO code, alias, Hebrew), or None.
+    """
+    return COUNTRY_ALIAS_TO_HE.get(_alias_key(country or ""))
 
 # ---------------------------------------------------------------------
 # Fetch from API
 # ---------------------------------------------------------------------
 def fetch_travel_warnings_from_api() -> list[dict]:
-    response = requests.get(
+    response = http_get(
         settings.GOV_IL_API_URL,
         params={
             "resource_id": RESOURCE_ID,
             "limit": DATASET_LIMIT,
         },
-        timeout=15,
     )
     response.raise_for_status()
     return response.json()["result"]["records"]
 
 # ---------------------------------------------------------------------
-# Load records with daily cache + fallback
+# Lazy load + stale-while-revalidate
 # ---------------------------------------------------------------------
-def load_travel_warnings() -> list[dict]:
-    # Fresh cache → use it
-    if is_cache_fresh(CACHE_FILE, CACHE_TTL):
-        with CACHE_FILE.open(encoding="utf-8") as f:
-            return json.load(f)
+class _TableIndex:
+    """
+    Country -> recommendations over the binary table: decodes only the requested country's rows, once.
+    """
+
+    def __init__(self, table: ColumnarTable):
+        self._table = table
+        self._cache: dict[str, frozenset[str]] = {}
+
+    def get(self, country: str, default=frozenset()) -> frozenset[str]:
+        if country not in self._cache:
+            self._cache[country] = build_country_index(self._table.rows_for(country)).get(country, frozenset())
+        return self._cache[country] or default
+
+
+class _Warnings(NamedTuple):
+    records: Sequence[dict]
+    index: dict[str, frozenset[str]] | _TableIndex
+
+
+def _prepare(records: Sequence[dict]) -> _Warnings:
+    if isinstance(records, ColumnarTable):
+        return _Warnings(records, _TableIndex(records))
+    return _Warnings(records, build_country_index(records))
+
+
+_DATASET: DatasetCache[_Warnings] = DatasetCache(
+    "travel_warnings",
+    CACHE_FILE,
+    CACHE_TTL.total_seconds(),
+    fetch=lambda: fetch_travel_warnings_from_api(),
+    prepare=_prepare,
+    index_key="country",
+    binary=settings.DATASET_BINARY_CACHE,
+)
 
-    # Cache missing or stale → try API
+
+def _get_warnings() -> _Warnings:
     try:
-        records = fetch_travel_warnings_from_api()
-        with CACHE_FILE.open("w", encoding="utf-8") as f:
-            json.dump(records, f, ensure_ascii=False)
-        return records
-
-    # API failed → fallback to any existing cache
-    except Exception:
-        if CACHE_FILE.exists():
-            with CACHE_FILE.open(encoding="utf-8") as f:
-                return json.load(f)
-        raise  # no cache and no API → hard fail
+        return _DATASET.get()
+    except DatasetUnavailableError as exc:
+        raise TravelWarningsServiceError("Travel warnings are currently unavailable") from exc
 
-# ---------------------------------------------------------------------
-# Load records once (cached)
-# ---------------------------------------------------------------------
-RECORDS = load_travel_warnings()
+
+def load_travel_warnings() -> Sequence[dict]:
+    """
+    Current travel warning records (loaded on first use, refreshed in the background once stale).
+    """
+    return _get_warnings().records
+
+
+def start_warmup() -> threading.Thread:
+    """
+    Load the dataset on a background thread so the first query does not pay for it (call at application boot).
+    """
+    return _DATASET.start_warmup()
 
 # ---------------------------------------------------------------------
 # Public API: recommendations only
@@ -86,20 +169,16 @@ def fetch_travel_warnings(country_en: str) -> set[str]:
     """
     Fetch travel warnings for a given country (in English).
     inputs:
-        country_en: Country name in English
+        country_en: Country name in English (ISO codes and common alternate spellings are accepted)
     outputs:
         A set of travel warning recommendations.
     """
 
     # 1. Fast deterministic path
-    hebrew = COUNTRY_EN_TO_HE.get(country_en.strip().lower())
+    hebrew = resolve_country(country_en)
 
     # 2. Fail safe
     if not hebrew:
         return set()
 
-    return {
-        r["recommendations"]
-        for r in RECORDS
-        if r.get("country") == hebrew and r.get("recommendations")
-    }
\ No newline at end of file
+    return set(_get_warnings().index.get(hebrew, ()))
\ No newline at end of file
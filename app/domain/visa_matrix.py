@@ -0,0 +1,185 @@
+from __future__ import annotations
+import copy
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.config.settings import settings
+from app.infrastructure import metrics
+
+"""
+Persistent passport x destination visa-rule matrix used by the entry requirements domain.
+Normalized Travel Buddy answers are stored in a SQLite table under the cache directory (shared by every
+worker on the host) and mirrored in an in-process dict, so a repeat lookup never leaves the process.
+Each entry carries the time it was fetched and a version stamp: entries older than VISA_MATRIX_TTL_SECONDS,
+or written under another VISA_MATRIX_VERSION (bumped when the provider or the normalized shape changes), are stale.
+"""
+
+# ------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------
+
+MATRIX_PATH = settings.CACHE_DIR / settings.VISA_MATRIX_FILE_NAME
+
+Pair = Tuple[str, str]
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def normalize_country_code(code: str) -> str:
+    """
+    " us " -> "US"
+    """
+    return (code or "").strip().upper()
+
+# ------------------------------------------------------------
+# Matrix
+# ------------------------------------------------------------
+
+class VisaMatrix:
+    """
+    Thread-safe visa-rule store: in-process dict -> persistent SQLite.
+    inputs:
+        ttl_seconds: Age after which an entry is stale (defaults to settings.VISA_MATRIX_TTL_SECONDS)
+        version: Version stamp entries must carry to be served (defaults to settings.VISA_MATRIX_VERSION)
+    """
+
+    def __init__(
+        self,
+        *,
+        path=MATRIX_PATH,
+        ttl_seconds: Optional[float] = None,
+        version: Optional[str] = None,
+    ):
+        self.path = path
+        self.ttl_seconds = settings.VISA_MATRIX_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.version = settings.VISA_MATRIX_VERSION if version is None else version
+
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._memory: Optional[Dict[Pair, Tuple[float, Dict[str, Any]]]] = None
+
+    # ------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS visa_rules ("
+                " passport TEXT NOT NULL, destination TEXT NOT NULL, rules TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL, version TEXT NOT NULL,"
+                " PRIMARY KEY (passport, destination))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _load(self) -> Dict[Pair, Tuple[float, Dict[str, Any]]]:
+        # The whole matrix is a few thousand rows at most: read it once, then serve from memory
+        if self._memory is None:
+            rows = self._connection().execute(
+                "SELECT passport, destination, rules, fetched_at FROM visa_rules WHERE version = ?", (self.version,)
+            ).fetchall()
+            self._memory = {(p, d): (fetched_at, json.loads(rules)) for p, d, rules, fetched_at in rows}
+        return self._memory
+
+    def _row(self, pair: Pair) -> Optional[Tuple[float, Dict[str, Any]]]:
+        # Another worker may have filled the pair since this process loaded the matrix
+        row = self._connection().execute(
+            "SELECT rules, fetched_at FROM visa_rules WHERE passport = ? AND destination = ? AND version = ?",
+            (*pair, self.version),
+        ).fetchone()
+        return (row[1], json.loads(row[0])) if row else None
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl_seconds
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+
+    def get(self, passport: str, destination: str) -> Optional[Dict[str, Any]]:
+        """
+        Fresh stored rules for the pair, or None if they must be fetched.
+        """
+        pair = (normalize_country_code(passport), normalize_country_code(destination))
+
+        with self._lock:
+            memory = self._load()
+            entry = memory.get(pair)
+
+            if entry is None or not self._is_fresh(entry[0]):
+                entry = self._row(pair)
+                if entry is not None:
+                    memory[pair] = entry
+
+        if entry is None or not self._is_fresh(entry[0]):
+            metrics.increment("visa_matrix.miss")
+            return None
+
+        metrics.increment("visa_matrix.hit")
+        return copy.deepcopy(entry[1])
+
+    def put(self, passport: str, destination: str, rules: Dict[str, Any]) -> None:
+        pair = (normalize_country_code(passport), normalize_country_code(destination))
+        fetched_at = time.time()
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO visa_rules (passport, destination, rules, fetched_at, version)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (*pair, json.dumps(rules, ensure_ascii=False), fetched_at, self.version),
+            )
+            conn.commit()
+            self._load()[pair] = (fetched_at, copy.deepcopy(rules))
+
+    def stale_pairs(self, passports: Iterable[str], destinations: Iterable[str]) -> List[Pair]:
+        """
+        Pairs from passports x destinations that are missing or stale, never-fetched ones first, then oldest first.
+        """
+        destinations = [normalize_country_code(d) for d in destinations]
+
+        with self._lock:
+            memory = self._load()
+            candidates = [
+                (memory.get((p, d), (0.0, None))[0], (p, d))
+                for p in map(normalize_country_code, passports)
+                for d in destinations
+                if p != d
+            ]
+
+        return [pair for fetched_at, pair in sorted(candidates) if not self._is_fresh(fetched_at)]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._memory = None
+
+# ------------------------------------------------------------
+# Singleton
+# ------------------------------------------------------------
+
+_visa_matrix: Optional[VisaMatrix] = None
+_MATRIX_LOCK = threading.Lock()
+
+
+def get_visa_matrix() -> VisaMatrix:
+    """
+    Returns the shared VisaMatrix, creating it lazily on first use.
+    """
+    global _visa_matrix
+
+    if _visa_matrix is None:
+        with _MATRIX_LOCK:
+            if _visa_matrix is None:
+                _visa_matrix = VisaMatrix()
+
+    return _visa_matrix
@@ -1,29 +1,48 @@
 from __future__ import annotations
+from typing import Optional, Callable, Awaitable, Any
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 from app.graph.state import State
-from app.nodes.router import router_node
-from app.nodes.direct import direct_node
-from app.nodes.executor import executor_node
-from app.nodes.verifier import verifier_node
-from app.nodes.finalizer import finalizer_node
+from app.nodes.router import router_node, arouter_node
+from app.nodes.direct import direct_node, adirect_node
+from app.nodes.executor import executor_node, aexecutor_node
+from app.nodes.verifier import verifier_node, averifier_node
+from app.nodes.finalizer import (
+    finalizer_node,
+    speculative_finalizer_node,
+    verification_annotation_node,
+)
 from app.nodes.off_topic import off_topic_node
 from app.nodes.summarize import build_summarization_node
+from app.config.settings import settings
 
 
-def build_graph(checkpointer) -> StateGraph[State]:
+def _dual_node(func: Callable[..., Any], afunc: Callable[..., Awaitable[Any]]) -> RunnableLambda:
+    """
+    Wrap a node so graph.invoke/stream run `func` and graph.ainvoke/astream await `afunc`.
+    """
+    return RunnableLambda(func, afunc=afunc, name=getattr(func, "__name__", None))
+
+
+def build_graph(checkpointer, *, speculative: Optional[bool] = None) -> StateGraph[State]:
     """
     Builds the main graph for the travel assistant application.
-    inputs: A checkpointer object for state persistence.
+    inputs:
+        checkpointer: A checkpointer object for state persistence.
+        speculative: Run the verifier in parallel with finalization on PLAN turns
+                     (defaults to settings.SPECULATIVE_FINALIZATION).
     outputs: A compiled StateGraph instance.
     """
+    if speculative is None:
+        speculative = settings.SPECULATIVE_FINALIZATION
 
     builder = StateGraph(State)
     builder.add_node("summarize", build_summarization_node())
-    builder.add_node("router", router_node)
-    builder.add_node("direct", direct_node)
+    builder.add_node("router", _dual_node(router_node, arouter_node))
+    builder.add_node("direct", _dual_node(direct_node, adirect_node))
     builder.add_node("off_topic", off_topic_node)
-    builder.add_node("executor", executor_node)
-    builder.add_node("verifier", verifier_node)
+    builder.add_node("executor", _dual_node(executor_node, aexecutor_node))
+    builder.add_node("verifier", _dual_node(verifier_node, averifier_node))
     builder.add_node("finalizer", finalizer_node)
     
     builder.add_edge(START, "summarize")
@@ -44,8 +63,20 @@ def build_graph(checkpointer) -> StateGraph[State]:
 
     builder.add_edge("off_topic", "finalizer")
     builder.add_edge("direct", "finalizer")
-    builder.add_edge("executor", "verifier")
-    builder.add_edge("verifier", "finalizer")
     builder.add_edge("finalizer", END)
 
+    if speculative:
+        # executor fans out: the answer is published while the verifier runs,
+        # and the verdict arrives as a trailing annotation.
+        builder.add_node("speculative_finalizer", speculative_finalizer_node)
+        builder.add_node("annotate", verification_annotation_node)
+
+        builder.add_edge("executor", "speculative_finalizer")
+        builder.add_edge("executor", "verifier")
+        builder.add_edge(["speculative_finalizer", "verifier"], "annotate")
+        builder.add_edge("annotate", END)
+    else:
+        builder.add_edge("executor", "verifier")
+        builder.add_edge("verifier", "finalizer")
+
     return builder.compile(checkpointer=checkpointer)
\ No newline at end of file
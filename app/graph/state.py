@@ -24,4 +24,9 @@ class State(TypedDict, total=False):
     verified: bool
 
     # Final output
-    final_answer: str
\ No newline at end of file
+    final_answer: str
+    warnings: list[str]
+
+    # Speculative finalization (answer published before the verdict)
+    answer_message_id: str
+    annotation: str
\ No newline at end of file
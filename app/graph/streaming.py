@@ -0,0 +1,177 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Optional, Tuple
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+"""
+Streaming entry points for the compiled graph.
+Translates raw LangGraph stream output (node updates, subgraph updates and LLM token chunks)
+into a small set of typed events that the CLI or a server can render as they arrive.
+The executor agent may narrate before calling tools ("Let me check the warnings..."); that text is not part
+of the answer. Its tokens still stream as they arrive; when the step turns out to request tools, a
+"retract" event tells the consumer that the text streamed during that step was narration, not answer.
+"""
+
+# ------------------------------------------------------------
+# Event model
+# ------------------------------------------------------------
+
+EventType = Literal[
+    "route",          # router decided: {"route": str}
+    "tool_started",   # executor agent requested a tool: {"name", "args", "id"}
+    "tool_finished",  # tool returned: {"name", "id", "status"}
+    "token",          # answer text chunk: {"text": str, "node": str}
+    "retract",        # text streamed by the last agent step was narration before tool calls: {"text": str, "node": str}
+    "verdict",        # verifier result / trailing annotation: {"verified": bool, "annotation"?: str}
+    "final",          # finalized answer: {"final_answer": str, "warnings": list[str]}
+]
+
+STREAM_MODES = ["updates", "messages"]
+
+# Nodes whose LLM tokens are part of the user-facing answer
+ANSWER_NODES = {"direct", "executor"}
+
+# Answer nodes running a tool-calling agent: a step's streamed text is retracted if the step calls tools
+AGENT_NODES = {"executor"}
+
+FINAL_NODES = {"finalizer", "speculative_finalizer"}
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    type: EventType
+    data: Dict[str, Any] = field(default_factory=dict)
+
+# ------------------------------------------------------------
+# Translation helpers
+# ------------------------------------------------------------
+
+def _top_level_node(namespace: Tuple[str, ...], metadata: Dict[str, Any]) -> str:
+    """
+    Name of the outer graph node that produced an event.
+    Subgraph events (e.g. the executor agent) carry the outer node in the namespace.
+    """
+    if namespace:
+        return namespace[0].split(":", 1)[0]
+    return metadata.get("langgraph_node", "")
+
+
+def _token_events(namespace, payload, step_text: List[str]) -> List[StreamEvent]:
+    chunk, metadata = payload
+    node = _top_level_node(namespace, metadata)
+
+    # Only assistant text from answer-producing nodes (skips router/verifier/summary tokens)
+    if node not in ANSWER_NODES or not isinstance(chunk, AIMessageChunk):
+        return []
+
+    text = chunk.text
+    if not text:
+        return []
+
+    if node in AGENT_NODES:
+        step_text.append(text)
+
+    return [StreamEvent("token", {"text": text, "node": node})]
+
+
+def _subgraph_update_events(namespace, update: Dict[str, Any], step_text: List[str]) -> List[StreamEvent]:
+    events: List[StreamEvent] = []
+
+    for values in update.values():
+        for message in (values or {}).get("messages", []):
+            if isinstance(message, AIMessage):
+                # The agent step is complete: its streamed text was narration if it requested tools
+                text = "".join(step_text)
+                step_text.clear()
+                if text and message.tool_calls:
+                    events.append(StreamEvent("retract", {"text": text, "node": _top_level_node(namespace, {})}))
+
+                for call in message.tool_calls:
+                    events.append(StreamEvent(
+                        "tool_started",
+                        {"name": call["name"], "args": call["args"], "id": call.get("id")},
+                    ))
+            elif isinstance(message, ToolMessage):
+                events.append(StreamEvent(
+                    "tool_finished",
+                    {"name": message.name, "id": message.tool_call_id, "status": message.status},
+                ))
+
+    return events
+
+
+def _update_events(update: Dict[str, Any]) -> List[StreamEvent]:
+    events: List[StreamEvent] = []
+
+    for node, values in update.items():
+        values = values or {}
+
+        if node == "router" and values.get("route"):
+            events.append(StreamEvent("route", {"route": values["route"]}))
+
+        elif node == "verifier" and "verified" in values:
+            events.append(StreamEvent("verdict", {"verified": bool(values["verified"])}))
+
+        elif node == "annotate":
+            events.append(StreamEvent(
+                "verdict",
+                {"verified": not values.get("annotation"), "annotation": values.get("annotation", "")},
+            ))
+
+        elif node in FINAL_NODES and "final_answer" in values:
+            events.append(StreamEvent(
+                "final",
+                {"final_answer": values["final_answer"], "warnings": values.get("warnings", [])},
+            ))
+
+    return events
+
+
+def _to_events(
+    namespace: Tuple[str, ...],
+    mode: str,
+    payload: Any,
+    step_text: Optional[List[str]] = None,
+) -> List[StreamEvent]:
+    """
+    `step_text` carries the text streamed by the current agent step between calls (one list per stream).
+    """
+    step_text = [] if step_text is None else step_text
+
+    if mode == "messages":
+        return _token_events(namespace, payload, step_text)
+    if namespace:
+        return _subgraph_update_events(namespace, payload, step_text)
+    return _update_events(payload)
+
+# ------------------------------------------------------------
+# Public API
+# ------------------------------------------------------------
+
+def stream_graph(graph, inputs: Dict[str, Any], config: Dict[str, Any] | None = None) -> Iterator[StreamEvent]:
+    """
+    Run the graph and yield typed events as they are produced.
+    inputs:
+        graph: A compiled graph (see build_graph)
+        inputs: Graph input, e.g. {"messages": [...]}
+        config: Run config (thread_id etc.)
+    outputs:
+        Iterator of StreamEvent
+    """
+    step_text: List[str] = []
+    for namespace, mode, payload in graph.stream(
+        inputs, config=config, stream_mode=STREAM_MODES, subgraphs=True,
+    ):
+        yield from _to_events(namespace, mode, payload, step_text)
+
+
+async def astream_graph(graph, inputs: Dict[str, Any], config: Dict[str, Any] | None = None) -> AsyncIterator[StreamEvent]:
+    """
+    Async counterpart of stream_graph.
+    """
+    step_text: List[str] = []
+    async for namespace, mode, payload in graph.astream(
+        inputs, config=config, stream_mode=STREAM_MODES, subgraphs=True,
+    ):
+        for event in _to_events(namespace, mode, payload, step_text):
+            yield event
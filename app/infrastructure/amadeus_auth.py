@@ -1,9 +1,21 @@
+import asyncio
+import logging
+import threading
 import time
-import requests
-from typing import Optional
+from typing import Any, Dict, Optional
 from app.config.settings import settings
+from app.infrastructure import metrics
+from app.infrastructure.http_client import http_post
+
+"""
+Handles authentication with the Amadeus API.
+The token is shared by all threads and coroutines: a fetch is single-flight across the sync, async and
+background paths (one OAuth call under one lock, everyone else waits for its result), and once the token enters its refresh window it keeps being served while a background
+thread replaces it, so requests only block on a token fetch at startup or after the token was rejected.
+"""
+
+logger = logging.getLogger(__name__)
 
-"""Handles authentication with the Amadeus API."""
 
 class AmadeusAuth:
 
@@ -13,32 +25,108 @@ class AmadeusAuth:
 
         self._access_token: Optional[str] = None
         self._expires_at: float = 0.0
+        self._refresh_at: float = 0.0
 
-    def get_access_token(self) -> str:
-        """
-        Returns a valid access token.
-        Fetches a new one if missing or expired.
-        """
-        if self._access_token and time.time() < self._expires_at:
-            return self._access_token
+        self._fetch_lock = threading.Lock()
+        self._background_lock = threading.Lock()
+        self._async_lock: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = None
 
-        response = requests.post(
-            settings.AMADEUS_TOKEN_URL,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-            data={
+    def _token_is_valid(self) -> bool:
+        return bool(self._access_token) and time.time() < self._expires_at
+
+    def _token_request(self) -> Dict[str, Any]:
+        return {
+            "headers": {"Content-Type": "application/x-www-form-urlencoded"},
+            "data": {
                 "grant_type": "client_credentials",
                 "client_id": self.api_key,
                 "client_secret": self.api_secret,
             },
-            timeout=10,
-        )
+        }
 
-        response.raise_for_status()
-        payload = response.json()
+    def _store_token(self, payload: Dict[str, Any]) -> str:
+        now = time.time()
 
+        # subtract 60s as a safety buffer
+        self._expires_at = now + payload["expires_in"] - 60
+        self._refresh_at = min(now + payload["expires_in"] - settings.AMADEUS_TOKEN_REFRESH_MARGIN_SECONDS, self._expires_at)
         self._access_token = payload["access_token"]
 
-        # subtract 60s as a safety buffer
-        self._expires_at = time.time() + payload["expires_in"] - 60
+        metrics.increment("amadeus.token.fetch")
+        return self._access_token
+
+    def _fetch_token(self) -> str:
+        response = http_post(settings.AMADEUS_TOKEN_URL, **self._token_request())
+
+        response.raise_for_status()
+        return self._store_token(response.json())
+
+    # ------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------
+
+    def _refresh(self) -> None:
+        try:
+            with self._fetch_lock:
+                if time.time() >= self._refresh_at:
+                    self._fetch_token()
+        except Exception:
+            logger.warning("Background Amadeus token refresh failed; keeping the current token", exc_info=True)
+        finally:
+            self._background_lock.release()
+
+    def _serve(self) -> str:
+        # Valid token: start a pre-emptive refresh once it enters the refresh window (at most one at a time)
+        if time.time() >= self._refresh_at and self._background_lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh, name="amadeus-token-refresh", daemon=True).start()
+        return self._access_token
 
-        return self._access_token
\ No newline at end of file
+    def _get_async_lock(self) -> asyncio.Lock:
+        # asyncio locks belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._async_lock is None or self._async_lock[0] is not loop:
+            self._async_lock = (loop, asyncio.Lock())
+        return self._async_lock[1]
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+
+    def get_access_token(self) -> str:
+        """
+        Returns a valid access token.
+        Fetches a new one if missing or expired (one fetch at a time; concurrent callers reuse its result).
+        """
+        if self._token_is_valid():
+            return self._serve()
+
+        return self._fetch_single_flight()
+
+    def _fetch_single_flight(self) -> str:
+        with self._fetch_lock:
+            if self._token_is_valid():
+                return self._access_token
+            return self._fetch_token()
+
+    async def aget_access_token(self) -> str:
+        """
+        Async counterpart of get_access_token.
+        The fetch runs off the event loop under the same lock as sync callers and the background refresh;
+        the per-loop async lock keeps waiting coroutines from each occupying a worker thread.
+        """
+        if self._token_is_valid():
+            return self._serve()
+
+        async with self._get_async_lock():
+            if self._token_is_valid():
+                return self._access_token
+            return await asyncio.to_thread(self._fetch_single_flight)
+
+    def invalidate(self, token: str) -> None:
+        """
+        Drop `token` after the API rejected it (401); a no-op if it was already replaced.
+        """
+        with self._fetch_lock:
+            if self._access_token == token:
+                self._access_token = None
+                self._expires_at = self._refresh_at = 0.0
@@ -1,17 +1,18 @@
 from typing import Optional
 from app.infrastructure.amadeus_auth import AmadeusAuth
 from app.infrastructure.amadeus_client_impl import AmadeusClient
+from app.infrastructure.response_cache import build_response_cache
 
 _amadeus_client: Optional[AmadeusClient] = None
 
 def get_amadeus_client() -> AmadeusClient:
     """
-    Returns a singleton AmadeusClient instance.
+    Returns a singleton AmadeusClient instance (with the configured response cache).
     """
     global _amadeus_client
 
     if _amadeus_client is None:
         auth = AmadeusAuth()
-        _amadeus_client = AmadeusClient(auth)
+        _amadeus_client = AmadeusClient(auth, cache=build_response_cache())
 
     return _amadeus_client
@@ -1,42 +1,131 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import httpx
 import requests
 from app.config.settings import settings
+from app.infrastructure import metrics
 from app.infrastructure.amadeus_auth import AmadeusAuth
+from app.infrastructure.async_http import ahttp_get
+from app.infrastructure.http_client import http_get
+from app.infrastructure.resilience import UpstreamUnavailableError
+from app.infrastructure.response_cache import ResponseCache, canonical_key, ttl_for
 
 """Client for interacting with the Amadeus API."""
 
 class AmadeusClient:
-    def __init__(self, auth: AmadeusAuth):
+    def __init__(self, auth: AmadeusAuth, cache: Optional[ResponseCache] = None):
         self.auth = auth
+        self.cache = cache
+
+    @staticmethod
+    def _headers(token: str) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+        }
+
+    @staticmethod
+    def _network_error(path: str, params: Dict[str, Any], exc: Exception) -> Dict[str, Any]:
+        return {
+            "error": "Network error while calling Amadeus API",
+            "details": str(exc),
+            "path": path,
+            "params": params,
+        }
+
+    @staticmethod
+    def _unavailable(path: str, params: Dict[str, Any], exc: Exception) -> Dict[str, Any]:
+        # Rejected locally (rate limit, quota or open circuit); callers should not retry immediately
+        return {
+            "error": "Amadeus temporarily unavailable",
+            "details": str(exc),
+            "path": path,
+            "params": params,
+        }
+
+    @staticmethod
+    def _api_error(path: str, params: Dict[str, Any], status_code: int, text: str) -> Dict[str, Any]:
+        return {
+            "error": "Amadeus API error",
+            "status_code": status_code,
+            "details": text,
+            "path": path,
+            "params": params,
+        }
+
+    def _cached(self, path: str, params: Dict[str, Any]) -> tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        (cache key, cached response) for a GET; the key is None when the path has no TTL policy.
+        """
+        if self.cache is None or ttl_for(path) is None:
+            return None, None
+
+        key = canonical_key(path, params)
+        value = self.cache.get(key)
+        metrics.increment("amadeus.cache.hit" if value is not None else "amadeus.cache.miss")
+        return key, value
+
+    def _store(self, key: Optional[str], path: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        # Error dicts are never cached
+        if key is not None and "error" not in result:
+            self.cache.set(key, result, ttl_for(path))
+        return result
 
     def get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        token = self.auth.get_access_token()
-
-        try:
-            response = requests.get(
-                f"{settings.AMADEUS_BASE_URL}{path}",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/json",
-                },
-                params=params,
-                timeout=settings.HTTP_TIMEOUT,
-            )
-        except requests.RequestException as e:
-            return {
-                "error": "Network error while calling Amadeus API",
-                "details": str(e),
-                "path": path,
-                "params": params,
-            }
+        key, cached = self._cached(path, params)
+        if cached is not None:
+            return cached
+
+        # A 401 means the token was revoked or expired early: drop it and retry once with a fresh one.
+        # Token failures (transport errors, open circuit, quota) follow the same error-dict contract as the call
+        for attempt in range(2):
+            try:
+                token = self.auth.get_access_token()
+                response = http_get(
+                    f"{settings.AMADEUS_BASE_URL}{path}",
+                    headers=self._headers(token),
+                    params=params,
+                )
+            except requests.RequestException as e:
+                return self._network_error(path, params, e)
+            except UpstreamUnavailableError as e:
+                return self._unavailable(path, params, e)
+
+            if response.status_code != 401 or attempt:
+                break
+            self.auth.invalidate(token)
 
         if not response.ok:
-            return {
-                "error": "Amadeus API error",
-                "status_code": response.status_code,
-                "details": response.text,
-                "path": path,
-                "params": params,
-            }
-
-        return response.json()
\ No newline at end of file
+            return self._api_error(path, params, response.status_code, response.text)
+
+        return self._store(key, path, response.json())
+
+    async def aget(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async counterpart of get, with the same error-dict contract and response cache.
+        """
+        key, cached = self._cached(path, params)
+        if cached is not None:
+            return cached
+
+        for attempt in range(2):
+            try:
+                token = await self.auth.aget_access_token()
+                response = await ahttp_get(
+                    f"{settings.AMADEUS_BASE_URL}{path}",
+                    headers=self._headers(token),
+                    params=params,
+                )
+            except (httpx.HTTPError, requests.RequestException) as e:
+                # The token itself is fetched through the shared sync session
+                return self._network_error(path, params, e)
+            except UpstreamUnavailableError as e:
+                return self._unavailable(path, params, e)
+
+            if response.status_code != 401 or attempt:
+                break
+            self.auth.invalidate(token)
+
+        if not response.is_success:
+            return self._api_error(path, params, response.status_code, response.text)
+
+        return self._store(key, path, response.json())
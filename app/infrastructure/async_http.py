@@ -0,0 +1,165 @@
+from __future__ import annotations
+import asyncio
+import importlib.util
+import time
+from typing import Any, Dict, Optional
+import httpx
+from app.config.settings import settings
+from app.infrastructure import metrics
+from app.infrastructure.http_client import IDEMPOTENT_METHODS, backoff_seconds, host_timeout
+from app.infrastructure.rate_limit import limiter_for_url
+from app.infrastructure.resilience import (
+    endpoint_of, get_breaker, get_latency_tracker, hedge_delay, host_of, is_failure_status,
+)
+
+"""
+Shared async HTTP client used by the async domain path.
+A single httpx.AsyncClient keeps connections alive and lets one event loop multiplex many sessions.
+Pool sizes, per-host timeouts and the retry/backoff policy follow the same settings as the sync session;
+HTTP/2 is negotiated when enabled and the optional `h2` package is installed.
+Circuit breakers and hedging are shared with the sync session (see resilience).
+"""
+
+# ------------------------------------------------------------------
+# Client singleton
+# ------------------------------------------------------------------
+
+_ASYNC_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    return settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared AsyncClient, creating it lazily on first use.
+    """
+    global _ASYNC_CLIENT
+
+    if _ASYNC_CLIENT is None or _ASYNC_CLIENT.is_closed:
+        _ASYNC_CLIENT = httpx.AsyncClient(
+            timeout=settings.HTTP_TIMEOUT,
+            follow_redirects=True,
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_CONNECTIONS * settings.HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=settings.HTTP_POOL_MAXSIZE,
+            ),
+            headers={"User-Agent": f"{settings.APP_NAME}/1.0"},
+        )
+
+    return _ASYNC_CLIENT
+
+
+async def aclose_async_http_client() -> None:
+    """
+    Closes the shared AsyncClient (call on application shutdown).
+    """
+    global _ASYNC_CLIENT
+
+    if _ASYNC_CLIENT is not None and not _ASYNC_CLIENT.is_closed:
+        await _ASYNC_CLIENT.aclose()
+
+    _ASYNC_CLIENT = None
+
+# ------------------------------------------------------------------
+# Request helpers
+# ------------------------------------------------------------------
+
+async def _send(client: httpx.AsyncClient, method: str, url: str, kwargs: Dict[str, Any]) -> httpx.Response:
+    started = time.monotonic()
+    response = await client.request(method, url, **kwargs)
+
+    if not is_failure_status(response.status_code):
+        get_latency_tracker(endpoint_of(url, kwargs.get("params"))).record(time.monotonic() - started)
+    return response
+
+
+async def _send_hedged(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    kwargs: Dict[str, Any],
+    delay: float,
+    limiter,
+) -> httpx.Response:
+    """
+    Async counterpart of http_client._send_hedged; the losing request is cancelled.
+    """
+    primary = asyncio.create_task(_send(client, method, url, kwargs))
+
+    done, _ = await asyncio.wait({primary}, timeout=delay)
+    if done or (limiter is not None and not limiter.try_acquire()):
+        return await primary
+
+    metrics.increment(f"http.hedge.{host_of(url)}.sent")
+    hedge = asyncio.create_task(_send(client, method, url, kwargs))
+    pending = {primary, hedge}
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((t for t in done if t.exception() is None), None)
+            if winner is not None:
+                if winner is hedge:
+                    metrics.increment(f"http.hedge.{host_of(url)}.won")
+                return winner.result()
+
+        # Both attempts failed: surface the primary's error
+        return primary.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def ahttp_request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """
+    Send a request through the shared client with the per-host timeout and the shared
+    retry/backoff policy (idempotent methods only). The final response is returned, not raised.
+    Every attempt waits for the provider's rate-limit slot (RateLimitExceededError when exhausted);
+    the host's circuit breaker rejects the call up front (CircuitOpenError) and slow GETs are hedged.
+    """
+    breaker = get_breaker(host_of(url))
+    breaker.before_call()
+
+    kwargs.setdefault("timeout", host_timeout(url))
+    limiter = limiter_for_url(url)
+    retries = settings.HTTP_MAX_RETRIES if method.upper() in IDEMPOTENT_METHODS else 0
+    delay = hedge_delay(method, url, kwargs.get("params"))
+    client = get_async_http_client()
+
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            await limiter.aacquire()
+
+        try:
+            if delay is None:
+                response = await _send(client, method, url, kwargs)
+            else:
+                response = await _send_hedged(client, method, url, kwargs, delay, limiter)
+        except httpx.TransportError:
+            if attempt == retries:
+                breaker.record_failure()
+                raise
+            await asyncio.sleep(backoff_seconds(attempt))
+            continue
+
+        if response.status_code not in settings.HTTP_RETRY_STATUSES or attempt == retries:
+            break
+
+        await asyncio.sleep(backoff_seconds(attempt, response))
+
+    if is_failure_status(response.status_code):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+async def ahttp_get(url: str, **kwargs: Any) -> httpx.Response:
+    return await ahttp_request("GET", url, **kwargs)
+
+
+async def ahttp_post(url: str, **kwargs: Any) -> httpx.Response:
+    return await ahttp_request("POST", url, **kwargs)
@@ -0,0 +1,277 @@
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, NamedTuple, Optional, TypeVar
+from app.config.settings import settings
+from app.infrastructure import metrics
+from app.infrastructure.dataset_format import ColumnarTable, write_table
+
+"""
+Stale-while-revalidate cache for file-backed datasets (e.g. the gov.il travel warnings and embassies lists).
+Each dataset is fetched once, written atomically to disk and kept in memory in its prepared form.
+Once the TTL expires the stale copy keeps being served while a single background worker refreshes it;
+a failed refresh is not retried before DATASET_REFRESH_RETRY_SECONDS, so a failing source is not hit at the
+request rate. Only a process with no copy at all waits for the fetch. Records are loaded from a memory-mapped
+binary copy (see dataset_format) rather than re-parsing the JSON in every process.
+Per-dataset hit/stale/miss counters and age are reported through `dataset_stats()`.
+"""
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ------------------------------------------------------------------
+# Errors
+# ------------------------------------------------------------------
+
+class DatasetUnavailableError(RuntimeError):
+    pass
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """
+    Write `text` to `path` via a temp file in the same directory and an atomic rename,
+    so readers never observe a partially written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+# A truncated, corrupt or foreign-version copy on disk fails with one of these while being read
+_UNREADABLE_ERRORS = (OSError, ValueError, KeyError, IndexError, TypeError, struct.error)
+
+
+class _Snapshot(NamedTuple):
+    value: Any
+    fetched_at: float
+
+# ------------------------------------------------------------------
+# Dataset cache
+# ------------------------------------------------------------------
+
+class DatasetCache(Generic[T]):
+    """
+    inputs:
+        name: Dataset name used for metrics (e.g. "travel_warnings")
+        path: JSON cache file
+        ttl_seconds: Age after which the copy is refreshed in the background
+        fetch: Returns the raw, JSON-serializable records from the source
+        prepare: Builds the in-memory form (e.g. an index) from raw records; identity by default
+        index_key: Column the binary copy is sorted and indexed by (see dataset_format)
+        binary: Keep a memory-mapped columnar copy next to the JSON and load from it
+                (records must be a list of flat dicts); `prepare` then receives a ColumnarTable
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        ttl_seconds: float,
+        fetch: Callable[[], Any],
+        *,
+        prepare: Optional[Callable[[Any], T]] = None,
+        index_key: Optional[str] = None,
+        binary: bool = False,
+    ):
+        self.name = name
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.fetch = fetch
+        self.prepare = prepare or (lambda records: records)
+        self.index_key = index_key
+        self.binary = binary
+        self.binary_path = path.with_suffix(".orbd")
+
+        # Replaced as a whole, never mutated, so readers always see a consistent value
+        self._snapshot: Optional[_Snapshot] = None
+        self._load_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_failed_at = 0.0
+
+        _REGISTRY[name] = self
+
+    # ------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------
+
+    def _binary_is_current(self) -> bool:
+        return (
+            self.binary_path.exists()
+            and self.binary_path.stat().st_mtime >= self.path.stat().st_mtime
+        )
+
+    def _read_file(self) -> Any:
+        if self.binary:
+            if not self._binary_is_current():
+                # First run after enabling the binary copy (or a hand-edited JSON): convert once
+                write_table(self.binary_path, self._read_json(), key=self.index_key)
+            return ColumnarTable(self.binary_path)
+
+        return self._read_json()
+
+    def _read_json(self) -> Any:
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def _write_file(self, records: Any) -> None:
+        # The JSON copy stays human-readable for debugging; the binary copy is what gets loaded
+        atomic_write_text(self.path, json.dumps(records, ensure_ascii=False))
+        if self.binary:
+            write_table(self.binary_path, records, key=self.index_key)
+
+    def _install(self, records: Any, fetched_at: float) -> _Snapshot:
+        self._snapshot = _Snapshot(self.prepare(records), fetched_at)
+        return self._snapshot
+
+    # ------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------
+
+    def _fetch_and_install(self) -> _Snapshot:
+        records = self.fetch()
+        self._write_file(records)
+
+        loaded = ColumnarTable(self.binary_path) if self.binary else records
+        return self._install(loaded, time.time())
+
+    def _refresh(self) -> None:
+        try:
+            self._fetch_and_install()
+            metrics.increment(f"dataset.{self.name}.refresh")
+        except Exception:
+            self._refresh_failed_at = time.time()
+            metrics.increment(f"dataset.{self.name}.refresh_error")
+            logger.warning(f"Refreshing dataset '{self.name}' failed; keeping the stale copy", exc_info=True)
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_in_background(self) -> None:
+        # Back off after a failure: the stale copy keeps being served until the retry interval has passed
+        if time.time() - self._refresh_failed_at < settings.DATASET_REFRESH_RETRY_SECONDS:
+            return
+
+        # Single-flight: at most one refresh per dataset, callers keep the current copy meanwhile
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        threading.Thread(target=self._refresh, name=f"{self.name}-refresh", daemon=True).start()
+
+    def _load_from_disk(self) -> Optional[_Snapshot]:
+        """
+        Install the copy on disk, or None when it is missing or unreadable.
+        An unreadable binary copy is deleted and rebuilt once from the JSON copy.
+        """
+        for _ in range(2 if self.binary else 1):
+            if not self.path.exists():
+                return None
+            try:
+                return self._install(self._read_file(), self.path.stat().st_mtime)
+            except _UNREADABLE_ERRORS:
+                metrics.increment(f"dataset.{self.name}.corrupt")
+                logger.warning(f"Cached copy of dataset '{self.name}' is unreadable; discarding it", exc_info=True)
+                self.binary_path.unlink(missing_ok=True)
+
+        return None
+
+    def _load_initial(self) -> _Snapshot:
+        # Any readable copy on disk (even stale) is served immediately; otherwise block on the source
+        snapshot = self._load_from_disk()
+        if snapshot is not None:
+            return snapshot
+
+        try:
+            return self._fetch_and_install()
+        except Exception as exc:
+            raise DatasetUnavailableError(f"Dataset '{self.name}' is unavailable") from exc
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+
+    def get(self) -> T:
+        """
+        The current prepared value; triggers a background refresh when stale.
+        Raises DatasetUnavailableError only when no copy exists and the fetch fails.
+        """
+        snapshot = self._snapshot
+        outcome = "hit"
+
+        if snapshot is None:
+            with self._load_lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    outcome = "miss"
+                    snapshot = self._load_initial()
+
+        if time.time() - snapshot.fetched_at >= self.ttl_seconds:
+            # A copy loaded from disk can already be stale: serve it and refresh behind it
+            outcome = "stale" if outcome == "hit" else outcome
+            self._refresh_in_background()
+
+        metrics.increment(f"dataset.{self.name}.{outcome}")
+        return snapshot.value
+
+    async def aget(self) -> T:
+        """
+        Async counterpart of get; a cold load runs off the event loop.
+        """
+        if self._snapshot is not None:
+            return self.get()
+        return await asyncio.to_thread(self.get)
+
+    def age_seconds(self) -> Optional[float]:
+        snapshot = self._snapshot
+        return None if snapshot is None else time.time() - snapshot.fetched_at
+
+    def start_warmup(self) -> threading.Thread:
+        """
+        Load the dataset on a background thread so the first request does not pay for it.
+        """
+        def warm() -> None:
+            try:
+                self.get()
+            except Exception:
+                logger.warning(f"Warm-up of dataset '{self.name}' failed; will retry on first use", exc_info=True)
+
+        thread = threading.Thread(target=warm, name=f"{self.name}-warmup", daemon=True)
+        thread.start()
+        return thread
+
+# ------------------------------------------------------------------
+# Registry & stats
+# ------------------------------------------------------------------
+
+_REGISTRY: Dict[str, DatasetCache] = {}
+
+
+def dataset_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Per-dataset age (seconds, None if not loaded) and hit / stale / miss / refresh counters.
+    """
+    return {
+        name: {
+            "age_seconds": cache.age_seconds(),
+            **{
+                counter: metrics.get_count(f"dataset.{name}.{counter}")
+                for counter in ("hit", "stale", "miss", "refresh", "refresh_error")
+            },
+        }
+        for name, cache in _REGISTRY.items()
+    }
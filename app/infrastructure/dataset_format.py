@@ -0,0 +1,199 @@
+from __future__ import annotations
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+"""
+Compact, memory-mappable columnar format for cached dataset records (lists of flat dicts).
+
+Layout (".orbd"):
+    b"ORBD" | u32 header length | JSON header | per column: null flags (u8 x rows),
+    value offsets (u32 x rows+1) and one UTF-8 blob
+Rows are sorted by an optional key column and the header carries a key -> row-range index,
+so a lookup decodes only the matching rows. Files are opened read-only with mmap, which lets
+every worker process share the same page-cache pages instead of holding its own parsed copy.
+"""
+
+MAGIC = b"ORBD"
+VERSION = 1
+
+# Column kinds: plain strings, or any other JSON value stored as encoded JSON
+_STR, _JSON = "s", "j"
+
+# ------------------------------------------------------------------
+# Writing
+# ------------------------------------------------------------------
+
+def index_key(value: Any) -> str:
+    """
+    Key-index normalization (case-insensitive).
+    """
+    return str(value).strip().lower()
+
+
+def _encode_column(values: Sequence[Any]) -> tuple[str, bytes, array, bytes]:
+    kind = _STR if all(v is None or isinstance(v, str) for v in values) else _JSON
+
+    nulls = bytes(v is None for v in values)
+    offsets = array("I", [0])
+    blob = bytearray()
+
+    for v in values:
+        if v is not None:
+            blob += (v if kind == _STR else json.dumps(v, ensure_ascii=False)).encode("utf-8")
+        offsets.append(len(blob))
+
+    return kind, nulls, offsets, bytes(blob)
+
+
+def encode_table(records: List[Dict[str, Any]], *, key: Optional[str] = None) -> bytes:
+    """
+    Serialize records to the columnar layout, sorted and indexed by `key` when given.
+    """
+    if key:
+        records = sorted(records, key=lambda r: index_key(r.get(key) or ""))
+
+    columns: List[str] = []
+    for r in records:
+        columns.extend(c for c in r if c not in columns)
+
+    key_index: Dict[str, List[int]] = {}
+    if key:
+        for i, r in enumerate(records):
+            k = index_key(r.get(key) or "")
+            key_index.setdefault(k, [i, i])[1] = i + 1
+
+    sections: List[bytes] = []
+    column_meta: List[Dict[str, Any]] = []
+    position = 0
+
+    for name in columns:
+        kind, nulls, offsets, blob = _encode_column([r.get(name) for r in records])
+        column_meta.append({
+            "name": name,
+            "kind": kind,
+            "nulls": position,
+            "offsets": position + len(nulls),
+            "blob": position + len(nulls) + len(offsets) * offsets.itemsize,
+        })
+        sections += [nulls, offsets.tobytes(), blob]
+        position += len(nulls) + len(offsets) * offsets.itemsize + len(blob)
+
+    header = json.dumps({
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "rows": len(records),
+        "columns": column_meta,
+        "key": key,
+        "key_index": key_index,
+    }, ensure_ascii=False).encode("utf-8")
+
+    return b"".join([MAGIC, struct.pack("<I", len(header)), header, *sections])
+
+
+def write_table(path: Path, records: List[Dict[str, Any]], *, key: Optional[str] = None) -> None:
+    """
+    Atomically write records to `path` in the columnar layout.
+    """
+    data = encode_table(records, key=key)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+# ------------------------------------------------------------------
+# Reading
+# ------------------------------------------------------------------
+
+class ColumnarTable(Sequence[Dict[str, Any]]):
+    """
+    Read-only view over a columnar file; rows are decoded on access.
+    """
+
+    def __init__(self, path: Path, *, use_mmap: Optional[bool] = None):
+        # Windows cannot replace a file that is still mapped, so read it into memory there
+        if use_mmap is None:
+            use_mmap = sys.platform != "win32"
+
+        with open(path, "rb") as f:
+            if use_mmap:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._buffer = f.read()
+
+        view = memoryview(self._buffer)
+        if bytes(view[:4]) != MAGIC:
+            raise ValueError(f"{path} is not a dataset table")
+
+        (header_len,) = struct.unpack_from("<I", view, 4)
+        header = json.loads(bytes(view[8:8 + header_len]).decode("utf-8"))
+        if header["version"] != VERSION or header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written by an incompatible version")
+
+        base = 8 + header_len
+        self._rows: int = header["rows"]
+        self.key: Optional[str] = header["key"]
+        self._key_index: Dict[str, List[int]] = header["key_index"]
+
+        self._columns = []
+        for c in header["columns"]:
+            offsets = view[base + c["offsets"]: base + c["blob"]].cast("I")
+            self._columns.append((
+                c["name"],
+                c["kind"],
+                view[base + c["nulls"]: base + c["offsets"]],
+                offsets,
+                base + c["blob"],
+            ))
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        row = {}
+        for name, kind, nulls, offsets, blob_at in self._columns:
+            if nulls[i]:
+                row[name] = None
+                continue
+
+            raw = self._buffer[blob_at + offsets[i]: blob_at + offsets[i + 1]].decode("utf-8")
+            row[name] = raw if kind == _STR else json.loads(raw)
+        return row
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._row(j) for j in range(*i.indices(self._rows))]
+        if i < 0:
+            i += self._rows
+        if not 0 <= i < self._rows:
+            raise IndexError(i)
+        return self._row(i)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._rows):
+            yield self._row(i)
+
+    def keys(self) -> List[str]:
+        """
+        Distinct (normalized) values of the key column.
+        """
+        return list(self._key_index)
+
+    def rows_for(self, value: Any) -> List[Dict[str, Any]]:
+        """
+        Rows whose key column matches `value` (case-insensitive); decodes only those rows.
+        """
+        span = self._key_index.get(index_key(value))
+        return [self._row(i) for i in range(*span)] if span else []
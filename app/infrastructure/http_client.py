@@ -0,0 +1,212 @@
+from __future__ import annotations
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from app.config.settings import settings
+from app.infrastructure import metrics
+from app.infrastructure.rate_limit import limiter_for_url
+from app.infrastructure.resilience import (
+    endpoint_of, get_breaker, get_latency_tracker, hedge_delay, host_of, is_failure_status,
+)
+
+"""
+Shared, pooled HTTP session used by all sync domain modules.
+One requests.Session keeps per-host connection pools alive (no TCP+TLS handshake per call),
+applies per-host timeouts from settings and a common retry/backoff policy.
+Retries are driven here rather than by a urllib3 Retry adapter, so every attempt waits for the provider's
+rate-limit slot and counts against its daily quota, exactly as on the async path (see rate_limit);
+per-host circuit breakers and hedging of slow GETs come from resilience.
+"""
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+# ------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------
+
+def host_timeout(url: str) -> float:
+    """
+    Timeout for `url`, from settings.HTTP_HOST_TIMEOUTS (falls back to settings.HTTP_TIMEOUT).
+    """
+    host = urlsplit(url).hostname or ""
+    return settings.HTTP_HOST_TIMEOUTS.get(host, settings.HTTP_TIMEOUT)
+
+
+def backoff_seconds(attempt: int, response: Any = None) -> float:
+    """
+    Delay before retry number `attempt` + 1: the server's numeric Retry-After if given, else exponential backoff.
+    Shared by the sync and async paths (requests and httpx responses both expose `headers`).
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return settings.HTTP_BACKOFF_FACTOR * (2 ** attempt)
+
+# ------------------------------------------------------------------
+# Session singleton
+# ------------------------------------------------------------------
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,  # number of hosts kept pooled
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,          # keep-alive connections per host
+        max_retries=0,  # retried in http_request, one rate-limit slot per attempt
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": f"{settings.APP_NAME}/1.0"})
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the shared Session, creating it lazily on first use.
+    """
+    global _SESSION
+
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _build_session()
+
+    return _SESSION
+
+
+def close_http_session() -> None:
+    """
+    Closes the shared Session and its pools (call on application shutdown).
+    """
+    global _SESSION
+
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+        _SESSION = None
+
+# ------------------------------------------------------------------
+# Request helpers
+# ------------------------------------------------------------------
+
+_HEDGE_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _HEDGE_POOL
+
+    if _HEDGE_POOL is None:
+        with _SESSION_LOCK:
+            if _HEDGE_POOL is None:
+                _HEDGE_POOL = ThreadPoolExecutor(
+                    max_workers=settings.HTTP_HEDGE_WORKERS,
+                    thread_name_prefix="http-hedge",
+                )
+    return _HEDGE_POOL
+
+
+def _send(method: str, url: str, kwargs: Dict[str, Any]) -> requests.Response:
+    started = time.monotonic()
+    response = get_http_session().request(method, url, **kwargs)
+
+    if not is_failure_status(response.status_code):
+        get_latency_tracker(endpoint_of(url, kwargs.get("params"))).record(time.monotonic() - started)
+    return response
+
+
+def _close_loser(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _send_hedged(method: str, url: str, kwargs: Dict[str, Any], delay: float, limiter) -> requests.Response:
+    """
+    Send the request; if it has not completed after `delay`, send an identical one and return whichever
+    succeeds first. The hedge only goes out if the provider has a free rate-limit slot right now.
+    """
+    pool = _get_hedge_pool()
+    primary = pool.submit(_send, method, url, kwargs)
+
+    done, _ = wait([primary], timeout=delay)
+    if done or (limiter is not None and not limiter.try_acquire()):
+        return primary.result()
+
+    metrics.increment(f"http.hedge.{host_of(url)}.sent")
+    hedge = pool.submit(_send, method, url, kwargs)
+    pending = {primary, hedge}
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        winner = next((f for f in done if f.exception() is None), None)
+        if winner is not None:
+            if winner is hedge:
+                metrics.increment(f"http.hedge.{host_of(url)}.won")
+            for other in pending:
+                other.add_done_callback(_close_loser)
+            return winner.result()
+
+    # Both attempts failed: surface the primary's error
+    return primary.result()
+
+
+def http_request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """
+    Send a request through the shared session, applying the per-host timeout unless one is given.
+    Idempotent methods are retried with backoff on connection errors, timeouts and HTTP_RETRY_STATUSES;
+    the final response is returned (not raised) so callers keep handling non-2xx statuses themselves.
+    Every attempt waits for the provider's rate-limit slot (RateLimitExceededError when its rate or daily
+    budget is exhausted); CircuitOpenError is raised while the host's circuit breaker is open (see resilience).
+    Slow idempotent GETs are hedged after the endpoint's p95 latency.
+    """
+    breaker = get_breaker(host_of(url))
+    breaker.before_call()
+
+    kwargs.setdefault("timeout", host_timeout(url))
+    limiter = limiter_for_url(url)
+    retries = settings.HTTP_MAX_RETRIES if method.upper() in IDEMPOTENT_METHODS else 0
+    delay = hedge_delay(method, url, kwargs.get("params"))
+
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+
+        try:
+            if delay is None:
+                response = _send(method, url, kwargs)
+            else:
+                response = _send_hedged(method, url, kwargs, delay, limiter)
+        except requests.RequestException as exc:
+            if attempt == retries or not isinstance(exc, _RETRYABLE_ERRORS):
+                breaker.record_failure()
+                raise
+            time.sleep(backoff_seconds(attempt))
+            continue
+
+        if response.status_code not in settings.HTTP_RETRY_STATUSES or attempt == retries:
+            break
+
+        response.close()  # give the connection back to the pool before retrying
+        time.sleep(backoff_seconds(attempt, response))
+
+    if is_failure_status(response.status_code):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+def http_get(url: str, **kwargs: Any) -> requests.Response:
+    return http_request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs: Any) -> requests.Response:
+    return http_request("POST", url, **kwargs)
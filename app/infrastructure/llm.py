@@ -1,10 +1,18 @@
-from typing import Dict, Tuple, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from langchain.chat_models import init_chat_model
+from langchain_core.messages import AIMessage, BaseMessage
 from app.config.settings import settings
+from app.infrastructure import metrics
 
 """
 LLM cache and initialization functions.
 Provides functions to get cached instances of chat models used in various parts of the application.
+Also provides Anthropic prompt caching helpers: the static system prompt (and with it the tool definitions,
+which precede it in the prompt) and the older part of the conversation are marked as cache breakpoints,
+and per-node cache read / write token counts are recorded in metrics ("llm.<node>.*").
+Anthropic ignores breakpoints on prefixes shorter than PROMPT_CACHE_MIN_TOKENS. The router and direct system
+prompts are far below it, so they get no breakpoint of their own: those nodes only read from the cache once
+the conversation history before the latest turn is long enough, and report zero cache reads until then.
 """
 
 # ------------------------------------------------------------------
@@ -75,3 +83,122 @@ def get_verifier_model():
         )
 
     return _VERIFIER_MODEL
+
+
+# ------------------------------------------------------------------
+# Prompt caching (Anthropic)
+# ------------------------------------------------------------------
+
+def cache_control() -> Dict[str, str]:
+    return {"type": "ephemeral", "ttl": settings.PROMPT_CACHE_TTL}
+
+
+def supports_prompt_caching(model: Any) -> bool:
+    """
+    True if prompt caching is enabled and `model` is an Anthropic chat model.
+    """
+    if not settings.PROMPT_CACHING_ENABLED:
+        return False
+
+    try:
+        from langchain_anthropic import ChatAnthropic
+    except ImportError:  # pragma: no cover - anthropic extra not installed
+        return False
+
+    return isinstance(model, ChatAnthropic)
+
+
+def _estimated_tokens(text: str) -> int:
+    # ~4 characters per token for English prose; only used to skip breakpoints that cannot pay off
+    return len(text) // 4
+
+
+def _content_of(message: Any) -> Any:
+    return message.get("content") if isinstance(message, dict) else getattr(message, "content", None)
+
+
+def _tag_content(content: Any) -> Optional[List[Any]]:
+    """
+    Content blocks with a breakpoint on the last text block, or None if there is nothing to tag.
+    """
+    if isinstance(content, str):
+        return [{"type": "text", "text": content, "cache_control": cache_control()}] if content else None
+
+    if isinstance(content, list) and content:
+        last = content[-1]
+        if isinstance(last, str) and last:
+            last = {"type": "text", "text": last}
+        if isinstance(last, dict) and last.get("type") == "text" and last.get("text"):
+            return [*content[:-1], {**last, "cache_control": cache_control()}]
+
+    return None
+
+
+def _tag_message(message: Any) -> Optional[Any]:
+    content = _tag_content(_content_of(message))
+    if content is None:
+        return None
+
+    if isinstance(message, dict):
+        return {**message, "content": content}
+    if isinstance(message, BaseMessage):
+        return message.model_copy(update={"content": content})
+    return None
+
+
+def cached_prompt(system: str, messages: Sequence[Any], model: Any) -> List[Any]:
+    """
+    [system] + messages, with cache breakpoints when `model` supports prompt caching:
+    one after the static system prompt (only if it reaches PROMPT_CACHE_MIN_TOKENS on its own) and one at
+    the end of the stable history (everything before the latest turn), so each turn re-reads the previous
+    turns' prefix from the cache instead of re-processing it.
+    """
+    if not supports_prompt_caching(model):
+        return [{"role": "system", "content": system}, *messages]
+
+    system_content: Any = system
+    if _estimated_tokens(system) >= settings.PROMPT_CACHE_MIN_TOKENS:
+        system_content = _tag_content(system) or system
+
+    history = list(messages)
+    # Walk back from the message before the latest turn to the first one that has text to tag
+    for index in range(len(history) - 2, -1, -1):
+        tagged = _tag_message(history[index])
+        if tagged is not None:
+            history[index] = tagged
+            break
+
+    return [{"role": "system", "content": system_content}, *history]
+
+
+def record_usage(node: str, messages: Iterable[Any]) -> None:
+    """
+    Add the token usage (input, output, cache read, cache write) of the model responses in `messages` to metrics.
+    """
+    for message in messages:
+        usage = getattr(message, "usage_metadata", None) if isinstance(message, AIMessage) else None
+        if not usage:
+            continue
+
+        details = usage.get("input_token_details") or {}
+        metrics.increment(f"llm.{node}.calls")
+        metrics.increment(f"llm.{node}.input_tokens", usage.get("input_tokens") or 0)
+        metrics.increment(f"llm.{node}.output_tokens", usage.get("output_tokens") or 0)
+        metrics.increment(f"llm.{node}.cache_read_tokens", details.get("cache_read") or 0)
+        metrics.increment(f"llm.{node}.cache_write_tokens", details.get("cache_creation") or 0)
+
+
+def prompt_cache_report() -> Dict[str, Dict[str, float]]:
+    """
+    Per-node token usage recorded so far, with the share of input tokens served from the prompt cache.
+    """
+    report: Dict[str, Dict[str, float]] = {}
+    for name, value in metrics.snapshot("llm.").items():
+        _, node, field = name.split(".", 2)
+        report.setdefault(node, {})[field] = value
+
+    for usage in report.values():
+        total = usage.get("input_tokens", 0)
+        usage["cache_hit_ratio"] = round(usage.get("cache_read_tokens", 0) / total, 3) if total else 0.0
+
+    return report
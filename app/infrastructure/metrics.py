@@ -0,0 +1,48 @@
+from __future__ import annotations
+import threading
+from collections import Counter
+from typing import Dict
+
+"""
+In-process counters for runtime metrics.
+Counters are keyed by dotted names (e.g. "router.fast_path") and are safe to update from multiple threads.
+"""
+
+# ------------------------------------------------------------------
+# Counter store
+# ------------------------------------------------------------------
+
+_COUNTERS: Counter = Counter()
+_LOCK = threading.Lock()
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """
+    Increment the counter `name` by `amount`.
+    """
+    with _LOCK:
+        _COUNTERS[name] += amount
+
+
+def get_count(name: str) -> int:
+    """
+    Return the current value of the counter `name` (0 if never incremented).
+    """
+    with _LOCK:
+        return _COUNTERS[name]
+
+
+def snapshot(prefix: str = "") -> Dict[str, int]:
+    """
+    Return a copy of all counters, optionally restricted to names starting with `prefix`.
+    """
+    with _LOCK:
+        return {k: v for k, v in _COUNTERS.items() if k.startswith(prefix)}
+
+
+def reset() -> None:
+    """
+    Clear all counters (used by tests).
+    """
+    with _LOCK:
+        _COUNTERS.clear()
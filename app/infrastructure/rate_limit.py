@@ -0,0 +1,225 @@
+from __future__ import annotations
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from app.config.settings import settings
+from app.infrastructure import metrics
+from app.infrastructure.resilience import UpstreamUnavailableError
+
+"""
+Per-provider rate limiting and daily quotas for outbound API calls (Amadeus, RapidAPI, Open-Meteo, WorldTimeAPI).
+Every request to a known host reserves a slot from its provider's token bucket before it is sent:
+slots are handed out strictly in arrival order, so concurrent sessions queue fairly instead of bursting.
+A call that would have to wait longer than the provider's max_wait, or that exceeds the daily quota
+(counted in a SQLite table shared by all workers on the host), is rejected with RateLimitExceededError.
+Limits come from settings.RATE_LIMITS; hosts are mapped to providers by settings.RATE_LIMIT_HOSTS.
+"""
+
+# ------------------------------------------------------------------
+# Errors
+# ------------------------------------------------------------------
+
+class RateLimitExceededError(UpstreamUnavailableError):
+    pass
+
+# ------------------------------------------------------------------
+# Token bucket
+# ------------------------------------------------------------------
+
+class TokenBucket:
+    """
+    Thread-safe token bucket in virtual-scheduling form: each call reserves the next free slot
+    under a lock and is told how long to wait for it, which makes the queue FIFO.
+    inputs:
+        rate: Sustained requests per second
+        burst: Requests allowed back-to-back after an idle period
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.interval = 1.0 / rate
+        self.burst = max(1, int(burst))
+
+        self._lock = threading.Lock()
+        self._next_slot = 0.0  # when the bucket would be empty again if no one else arrives
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """
+        Reserve a slot; returns the seconds to wait before using it.
+        Raises RateLimitExceededError (reserving nothing) if the wait would exceed `max_wait`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            next_slot = max(self._next_slot, now)
+            wait = max(0.0, next_slot - (self.burst - 1) * self.interval - now)
+
+            if max_wait is not None and wait > max_wait:
+                raise RateLimitExceededError(f"rate limit queue is full ({wait:.1f}s wait)")
+
+            self._next_slot = next_slot + self.interval
+            return wait
+
+# ------------------------------------------------------------------
+# Daily quota
+# ------------------------------------------------------------------
+
+class DailyQuota:
+    """
+    Calls per UTC day for one provider, counted atomically in SQLite so every worker shares the budget.
+    """
+
+    def __init__(self, provider: str, limit: int, path: Path):
+        self.provider = provider
+        self.limit = limit
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS quota ("
+                " provider TEXT NOT NULL, day TEXT NOT NULL, used INTEGER NOT NULL,"
+                " PRIMARY KEY (provider, day))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+
+    def consume(self) -> None:
+        """
+        Count one call; raises RateLimitExceededError once today's budget is used up.
+        """
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                "INSERT INTO quota (provider, day, used) VALUES (?, ?, 1)"
+                " ON CONFLICT (provider, day) DO UPDATE SET used = used + 1 WHERE used < ?",
+                (self.provider, self._today(), self.limit),
+            )
+            conn.commit()
+
+        if cursor.rowcount == 0:
+            raise RateLimitExceededError(f"daily quota of {self.limit} calls is exhausted")
+
+    def used(self) -> int:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT used FROM quota WHERE provider = ? AND day = ?", (self.provider, self._today())
+            ).fetchone()
+        return row[0] if row else 0
+
+# ------------------------------------------------------------------
+# Provider limiter
+# ------------------------------------------------------------------
+
+class ProviderLimiter:
+    """
+    inputs:
+        name: Provider name (used in errors and metrics)
+        rate / burst: Token bucket parameters
+        daily: Calls per UTC day (0 = unlimited)
+        max_wait: Longest a call may queue before it is shed (seconds)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        rate: float,
+        burst: int = 1,
+        daily: int = 0,
+        max_wait: float = 5.0,
+        quota_path: Optional[Path] = None,
+    ):
+        self.name = name
+        self.max_wait = max_wait
+        self.bucket = TokenBucket(rate, burst)
+        self.quota = (
+            DailyQuota(name, int(daily), quota_path or settings.CACHE_DIR / settings.RATE_LIMIT_QUOTA_FILE_NAME)
+            if daily else None
+        )
+
+    def _reserve(self) -> float:
+        try:
+            wait = self.bucket.reserve(self.max_wait)
+            if self.quota is not None:
+                self.quota.consume()
+        except RateLimitExceededError as exc:
+            metrics.increment(f"ratelimit.{self.name}.shed")
+            raise RateLimitExceededError(f"{self.name}: {exc}; try again later") from None
+
+        if wait:
+            metrics.increment(f"ratelimit.{self.name}.queued")
+        return wait
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot only if one is free right now (used for optional extra calls such as hedges).
+        """
+        try:
+            self.bucket.reserve(0.0)
+            if self.quota is not None:
+                self.quota.consume()
+        except RateLimitExceededError:
+            return False
+        return True
+
+    def acquire(self) -> None:
+        """
+        Block until this call may be sent (or raise RateLimitExceededError).
+        """
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        """
+        Async counterpart of acquire; waits without blocking the event loop.
+        """
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+# ------------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------------
+
+_LIMITERS: Dict[str, ProviderLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_limiter(provider: str) -> Optional[ProviderLimiter]:
+    """
+    Shared limiter for `provider`, or None if settings.RATE_LIMITS has no entry for it.
+    """
+    limiter = _LIMITERS.get(provider)
+    if limiter is None and provider in settings.RATE_LIMITS:
+        with _LIMITERS_LOCK:
+            limiter = _LIMITERS.get(provider)
+            if limiter is None:
+                limiter = _LIMITERS[provider] = ProviderLimiter(provider, **settings.RATE_LIMITS[provider])
+    return limiter
+
+
+def limiter_for_url(url: str) -> Optional[ProviderLimiter]:
+    provider = settings.RATE_LIMIT_HOSTS.get(urlsplit(url).hostname or "")
+    return get_limiter(provider) if provider else None
+
+
+def reset_limiters() -> None:
+    """
+    Forget all provider limiters, so the next call starts with full buckets (tests, or after a configuration change).
+    """
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
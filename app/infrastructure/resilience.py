@@ -0,0 +1,200 @@
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlsplit
+from app.config.settings import settings
+from app.infrastructure import metrics
+
+"""
+Per-host resilience state shared by the sync and async HTTP helpers.
+- Circuit breaker: after HTTP_BREAKER_FAILURE_THRESHOLD consecutive failures (connection errors, timeouts,
+  5xx) a host is considered down and calls fail fast with CircuitOpenError for HTTP_BREAKER_RESET_SECONDS;
+  then one probe call is let through, and its outcome closes or re-opens the circuit.
+- Latency tracking: recent successful call durations per endpoint (host + path, plus the query parameters in
+  HTTP_HEDGE_KEY_PARAMS that select a different resource), whose p95 is the delay after which an idempotent GET
+  is hedged (a second identical request is sent and the first response wins). Endpoints on one host can differ
+  by orders of magnitude (reference data vs flight search), so a shared p95 would hedge most slow calls.
+Breaker transitions and hedges are counted in metrics; `breaker_states()` reports the current state per host.
+"""
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# ------------------------------------------------------------------
+# Errors
+# ------------------------------------------------------------------
+
+class UpstreamUnavailableError(RuntimeError):
+    """
+    A call was rejected locally (circuit open, rate limit or quota) without reaching the upstream.
+    """
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    pass
+
+# ------------------------------------------------------------------
+# Circuit breaker
+# ------------------------------------------------------------------
+
+class CircuitBreaker:
+    """
+    Thread-safe consecutive-failure breaker for one host.
+    """
+
+    def __init__(self, host: str, *, failure_threshold: int, reset_seconds: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        metrics.increment(f"breaker.{self.host}.{state}")
+
+    def before_call(self) -> None:
+        """
+        Raises CircuitOpenError while the host is considered down (and while a probe is in flight).
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return
+
+            # After the cool-down this caller becomes the probe (also if an earlier probe never reported back)
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_seconds:
+                self._opened_at = now
+                self._transition(HALF_OPEN)
+                return
+
+            metrics.increment(f"breaker.{self.host}.rejected")
+            raise CircuitOpenError(f"{self.host} is unavailable (circuit open); try again later")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self._state, "consecutive_failures": self._failures}
+
+# ------------------------------------------------------------------
+# Latency tracking (hedging)
+# ------------------------------------------------------------------
+
+class LatencyTracker:
+    """
+    Rolling window of successful call durations for one endpoint.
+    """
+
+    def __init__(self, window: int):
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        p95 latency (floored at HTTP_HEDGE_MIN_DELAY), or None until HTTP_HEDGE_MIN_SAMPLES calls were seen.
+        """
+        with self._lock:
+            if len(self._samples) < settings.HTTP_HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(p95, settings.HTTP_HEDGE_MIN_DELAY)
+
+# ------------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------------
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_TRACKERS: Dict[str, LatencyTracker] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).hostname or ""
+
+
+def endpoint_of(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Latency-tracking key: "host/path", plus the resource-selecting query parameters.
+    "https://data.gov.il/api/3/action/datastore_search?resource_id=abc&limit=5" -> "data.gov.il/api/3/action/datastore_search?resource_id=abc"
+    """
+    parts = urlsplit(url)
+    query = {**dict(parse_qsl(parts.query)), **dict(params or {})}
+    selectors = "&".join(f"{name}={query[name]}" for name in settings.HTTP_HEDGE_KEY_PARAMS if name in query)
+    return f"{parts.hostname or ''}{parts.path}" + (f"?{selectors}" if selectors else "")
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    breaker = _BREAKERS.get(host)
+    if breaker is None:
+        with _REGISTRY_LOCK:
+            breaker = _BREAKERS.setdefault(host, CircuitBreaker(
+                host,
+                failure_threshold=settings.HTTP_BREAKER_FAILURE_THRESHOLD,
+                reset_seconds=settings.HTTP_BREAKER_RESET_SECONDS,
+            ))
+    return breaker
+
+
+def get_latency_tracker(endpoint: str) -> LatencyTracker:
+    tracker = _TRACKERS.get(endpoint)
+    if tracker is None:
+        with _REGISTRY_LOCK:
+            tracker = _TRACKERS.setdefault(endpoint, LatencyTracker(settings.HTTP_HEDGE_WINDOW))
+    return tracker
+
+
+def hedge_delay(method: str, url: str, params: Optional[Mapping[str, Any]] = None) -> Optional[float]:
+    """
+    Seconds after which a request should be hedged, or None if it must not be (non-GET, disabled, no data yet).
+    """
+    if not settings.HTTP_HEDGE_ENABLED or method.upper() != "GET":
+        return None
+    return get_latency_tracker(endpoint_of(url, params)).hedge_delay()
+
+
+def is_failure_status(status_code: int) -> bool:
+    # 4xx (including 429, which the rate limiter handles) means the host is up
+    return status_code >= 500
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """
+    Current breaker state and consecutive failure count per host seen so far.
+    """
+    return {host: breaker.snapshot() for host, breaker in list(_BREAKERS.items())}
+
+
+def reset_resilience_state() -> None:
+    """
+    Forget all breakers and latency samples (tests, or after a configuration change).
+    """
+    with _REGISTRY_LOCK:
+        _BREAKERS.clear()
+        _TRACKERS.clear()
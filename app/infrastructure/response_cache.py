@@ -0,0 +1,199 @@
+from __future__ import annotations
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol
+from app.config.settings import settings
+
+"""
+TTL cache for idempotent API responses (used by the Amadeus client).
+Keys are canonicalized from the request path and its sorted parameters, so the same query
+written with a different parameter order or spacing hits the same entry.
+TTLs come from a per-path policy (settings.AMADEUS_CACHE_TTLS); paths without a policy are never cached.
+Backends: an in-process LRU, and a SQLite table under the cache directory shared by all workers on a host.
+"""
+
+# ------------------------------------------------------------------
+# Keys & policies
+# ------------------------------------------------------------------
+
+def _canonical_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(_canonical_value(v)) for v in value)
+    return str(value)
+
+
+def canonical_key(path: str, params: Optional[Dict[str, Any]]) -> str:
+    """
+    Stable cache key for a GET request: path plus parameters sorted by name, None values dropped.
+    ("/v1/x", {"b": 2, "a": " PAR "}) -> '/v1/x?{"a": "PAR", "b": "2"}'
+    """
+    canonical = {
+        name: _canonical_value(value)
+        for name, value in sorted((params or {}).items())
+        if value is not None
+    }
+    return f"{path}?{json.dumps(canonical, sort_keys=True, ensure_ascii=False)}"
+
+
+def ttl_for(path: str, policies: Optional[Dict[str, float]] = None) -> Optional[float]:
+    """
+    TTL in seconds for `path` from the longest matching path prefix, or None if it should not be cached.
+    """
+    policies = settings.AMADEUS_CACHE_TTLS if policies is None else policies
+    matches = [prefix for prefix in policies if path.startswith(prefix)]
+    if not matches:
+        return None
+
+    ttl = policies[max(matches, key=len)]
+    return ttl if ttl > 0 else None
+
+# ------------------------------------------------------------------
+# Backends
+# ------------------------------------------------------------------
+
+class ResponseCache(Protocol):
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None: ...
+
+
+class MemoryResponseCache:
+    """
+    Thread-safe in-process LRU with per-entry expiry.
+    Values are copied in and out, so callers may mutate what they get without touching the cached entry.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteResponseCache:
+    """
+    Persistent cache shared by every process on the host; expired rows are ignored and pruned on write.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        now = time.time()
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now + ttl_seconds),
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+
+class TieredResponseCache:
+    """
+    In-process LRU in front of a shared backend; shared hits are promoted to memory for the remaining TTL.
+    """
+
+    def __init__(self, memory: MemoryResponseCache, shared: SQLiteResponseCache):
+        self.memory = memory
+        self.shared = shared
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        value = self.shared.get(key)
+        if value is not None:
+            # Short promotion so memory never outlives the shared entry by much
+            self.memory.set(key, value, settings.AMADEUS_CACHE_MEMORY_TTL_SECONDS)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self.memory.set(key, value, min(ttl_seconds, settings.AMADEUS_CACHE_MEMORY_TTL_SECONDS))
+        self.shared.set(key, value, ttl_seconds)
+
+# ------------------------------------------------------------------
+# Factory
+# ------------------------------------------------------------------
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """
+    Response cache configured by settings.AMADEUS_CACHE_BACKEND ("memory", "sqlite" or "none").
+    """
+    backend = settings.AMADEUS_CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+
+    memory = MemoryResponseCache(settings.AMADEUS_CACHE_MAX_ENTRIES)
+    if backend == "memory":
+        return memory
+    if backend == "sqlite":
+        return TieredResponseCache(memory, SQLiteResponseCache(settings.CACHE_DIR / settings.AMADEUS_CACHE_FILE_NAME))
+
+    raise ValueError(f"Unknown AMADEUS_CACHE_BACKEND: {settings.AMADEUS_CACHE_BACKEND}")
@@ -0,0 +1,233 @@
+from __future__ import annotations
+import math
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from app.config.settings import settings
+from app.infrastructure import metrics
+
+try:  # a project dependency; the sparse pure-Python search remains for minimal environments
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+"""
+Semantic answer cache for evergreen questions.
+Queries are embedded locally (no model, no network): normalized word unigrams and bigrams, stop words
+dropped, feature-hashed into a fixed-size L2-normalized vector. Two phrasings of the same question share
+most of their content words and so have a high cosine similarity.
+Similarity alone is not enough to share an answer: a long question about Paris and the same question about
+Rome, or "is it safe" and "is it not safe", differ in a single word and still score high. A hit therefore
+also requires both queries to have exactly the same content words (their "signature"), so paraphrases only
+match when they differ in stop words, inflection, punctuation or word order.
+The index is a brute-force cosine search (one matrix-vector product with NumPy, sparse dot products
+otherwise) over at most SEMANTIC_CACHE_MAX_ENTRIES entries, evicted least-recently-used and after
+SEMANTIC_CACHE_TTL_SECONDS. Hits and misses are counted in metrics ("semantic_cache.*").
+"""
+
+# ------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------
+
+STOP_WORDS = frozenset({
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "for", "with", "about", "from", "by",
+    "is", "are", "was", "were", "be", "do", "does", "did", "can", "could", "should", "would", "will",
+    "i", "me", "my", "we", "our", "you", "your", "what", "which", "how", "why", "when", "where", "who",
+    "some", "any", "please", "tell", "give", "know", "there", "it", "its", "s",
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+Vector = Dict[int, float]  # sparse: hashed feature -> weight
+Signature = FrozenSet[str]  # content words of a query
+
+# ------------------------------------------------------------
+# Embedding
+# ------------------------------------------------------------
+
+def normalize_query(text: str) -> str:
+    """
+    Lowercase, accents stripped, punctuation collapsed: "  Tips for LONG-HAUL flights?" -> "tips for long haul flights"
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+def _stem(token: str) -> str:
+    # Plural / possessive folding is enough to match "flights" with "flight"
+    return token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+
+
+def _content_words(text: str) -> List[str]:
+    # Negations ("not", "no", "isn t") are not stop words: they flip the meaning of the question
+    return [_stem(t) for t in normalize_query(text).split() if t not in STOP_WORDS]
+
+
+def _features(text: str) -> List[str]:
+    words = _content_words(text)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def signature(text: str) -> Signature:
+    """
+    Content words of `text`; two queries may share an answer only if their signatures are equal.
+    """
+    return frozenset(_content_words(text))
+
+
+def embed(text: str, dim: Optional[int] = None) -> Vector:
+    """
+    Sparse L2-normalized embedding of `text` (signed feature hashing, stable across processes).
+    """
+    dim = dim or settings.SEMANTIC_CACHE_DIM
+    vector: Vector = {}
+
+    for feature in _features(text):
+        digest = zlib.crc32(feature.encode("utf-8"))
+        index, sign = digest % dim, 1.0 if digest & 0x80000000 else -1.0
+        vector[index] = vector.get(index, 0.0) + sign
+
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {i: w / norm for i, w in vector.items() if w} if norm else {}
+
+
+def _dot(a: Vector, b: Vector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(i, 0.0) for i, w in a.items())
+
+# ------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------
+
+class SemanticCache:
+    """
+    Thread-safe query -> answer cache searched by cosine similarity among queries with the same signature.
+    inputs:
+        threshold: Minimum cosine similarity for a hit
+        max_entries: LRU capacity
+        ttl_seconds: Lifetime of an entry
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        dim: Optional[int] = None,
+    ):
+        self.threshold = settings.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.max_entries = max_entries or settings.SEMANTIC_CACHE_MAX_ENTRIES
+        self.ttl_seconds = settings.SEMANTIC_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.dim = dim or settings.SEMANTIC_CACHE_DIM
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Vector, Signature, str, float]]" = OrderedDict()  # key -> (vector, signature, answer, expires_at)
+        self._matrix = None  # dense copy of the vectors (NumPy), rebuilt after changes
+        self._keys: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _dense(self, vector: Vector):
+        row = np.zeros(self.dim, dtype=np.float32)
+        for i, w in vector.items():
+            row[i] = w
+        return row
+
+    def _best_match(self, vector: Vector, words: Signature) -> Tuple[Optional[str], float]:
+        """
+        Most similar entry with the same signature as the query, and its score.
+        """
+        if np is None:
+            scored = [(_dot(vector, v), k) for k, (v, sig, _, _) in self._entries.items() if sig == words]
+            score, key = max(scored, default=(0.0, None))
+            return key, score
+
+        if not self._entries:
+            return None, 0.0
+
+        if self._matrix is None:
+            self._keys = list(self._entries)
+            self._matrix = np.stack([self._dense(self._entries[k][0]) for k in self._keys])
+
+        scores = self._matrix @ self._dense(vector)
+        candidates = np.flatnonzero(scores >= self.threshold)
+        for index in candidates[np.argsort(-scores[candidates])]:
+            key = self._keys[int(index)]
+            if self._entries[key][1] == words:
+                return key, float(scores[index])
+        return None, 0.0
+
+    def _evict(self, key: str) -> None:
+        del self._entries[key]
+        self._matrix = None
+
+    def lookup(self, query: str) -> Optional[str]:
+        """
+        Stored answer of the most similar cached query, or None if nothing is similar enough.
+        """
+        vector = embed(query, self.dim)
+        if not vector:
+            return None
+
+        with self._lock:
+            key, score = self._best_match(vector, signature(query))
+
+            if key is not None and score >= self.threshold:
+                _, _, answer, expires_at = self._entries[key]
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    metrics.increment("semantic_cache.hit")
+                    return answer
+
+                self._evict(key)
+                metrics.increment("semantic_cache.expired")
+
+        metrics.increment("semantic_cache.miss")
+        return None
+
+    def store(self, query: str, answer: str) -> None:
+        vector = embed(query, self.dim)
+        if not vector or not answer:
+            return
+
+        with self._lock:
+            self._entries[normalize_query(query)] = (vector, signature(query), answer, time.time() + self.ttl_seconds)
+            self._matrix = None
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.increment("semantic_cache.evicted")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+# ------------------------------------------------------------
+# Singleton
+# ------------------------------------------------------------
+
+_semantic_cache: Optional[SemanticCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """
+    Returns the shared SemanticCache, creating it lazily on first use.
+    """
+    global _semantic_cache
+
+    if _semantic_cache is None:
+        with _CACHE_LOCK:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticCache()
+
+    return _semantic_cache
@@ -1,40 +1,103 @@
 from __future__ import annotations
+import asyncio
+import sys
 import uuid
-from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from app.config.settings import settings
 from app.graph.graph import build_graph
+from app.graph.streaming import StreamEvent, astream_graph
+from app.domain.travel_warnings import start_warmup as start_travel_warnings_warmup
+from app.domain.entry_requirements import start_visa_prewarm
+from app.infrastructure.async_http import aclose_async_http_client
+from app.infrastructure.http_client import close_http_session
 from app.config.logger import setup_logging
 
 
-def main():
+def render_event(event: StreamEvent, streamed: str) -> str:
+    """
+    Print a single stream event to the terminal.
+    inputs: the event, and the answer text already printed this turn
+    outputs: updated streamed text
+    """
+    if event.type == "token":
+        print(event.data["text"], end="", flush=True)
+        return streamed + event.data["text"]
+
+    if event.type == "retract":
+        # Already on screen, but it was the agent narrating before a tool call: drop it from the answer
+        text = event.data["text"]
+        if streamed.endswith(text):
+            streamed = streamed[:-len(text)]
+
+    elif event.type == "tool_started":
+        print(f"\n[using {event.data['name']}...]", flush=True)
+
+    elif event.type == "final":
+        final_answer = event.data["final_answer"]
+        if not streamed:
+            print(final_answer, flush=True)
+        elif final_answer.startswith(streamed):
+            print(final_answer[len(streamed):], flush=True)  # the warnings block, if any
+        else:
+            # The streamed text is not what was finalized: show the answer that counts
+            print(f"\n\n[final answer]\n{final_answer}", flush=True)
+
+    elif event.type == "verdict" and event.data.get("annotation"):
+        print(f"\n---\n{event.data['annotation']}", flush=True)
+
+    return streamed
+
+
+async def amain():
 
     # SETUP
     setup_logging()
     thread_id = settings.THREAD_ID or str(uuid.uuid4()) # if not set, generate a uuid
+    if settings.TRAVEL_WARNINGS_WARMUP:
+        start_travel_warnings_warmup() # loads in the background while the checkpointer connects
+    if settings.VISA_PREWARM_ON_STARTUP:
+        start_visa_prewarm() # fills missing / stale visa matrix entries in the background
     #
 
-    with PostgresSaver.from_conn_string(settings.postgres_dsn) as checkpointer:
+    async with AsyncPostgresSaver.from_conn_string(settings.postgres_dsn) as checkpointer:
 
-        checkpointer.setup() # create the tables if they dont exist
+        await checkpointer.setup() # create the tables if they dont exist
         graph = build_graph(checkpointer)
 
         print("Welcome to Orbi! Type 'exit' or 'quit' to leave.")
         print(f"[thread_id={thread_id}]")
 
-        while True:
-            text = input("\nYou: ").strip()
-            if not text:
-                continue
-            if text.lower() in {"exit", "quit"}:
-                break
+        try:
+            while True:
+                # input() blocks, so read it off the event loop
+                text = (await asyncio.to_thread(input, "\nYou: ")).strip()
+                if not text:
+                    continue
+                if text.lower() in {"exit", "quit"}:
+                    break
+
+                print("\nAgent: ", end="", flush=True)
+                streamed = ""
 
-            result = graph.invoke(
-                {"messages": [{"role": "user", "content": text}]},
-                config={"configurable": {"thread_id": thread_id}},
-            )
+                # Render events as they arrive (tokens, tool activity, final warnings, trailing verdict)
+                async for event in astream_graph(
+                    graph,
+                    {"messages": [{"role": "user", "content": text}]},
+                    config={"configurable": {"thread_id": thread_id}},
+                ):
+                    streamed = render_event(event, streamed)
+        finally:
+            await aclose_async_http_client()
+            close_http_session()
+
+
+def main():
+    if sys.platform == "win32":
+        # psycopg's async mode does not support the default Proactor loop on Windows
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-            print("\nAgent:", result["final_answer"])
+    asyncio.run(amain())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,10 +1,14 @@
 from __future__ import annotations
-from typing import Dict, Any
-from app.infrastructure.llm import get_lightweight_chat_model
+from typing import Dict, Any, Optional
+from app.infrastructure.llm import cached_prompt, get_lightweight_chat_model, record_usage
+from app.infrastructure.semantic_cache import get_semantic_cache, normalize_query
 import logging
 from app.config.settings import settings
 logger = logging.getLogger(__name__)
 
+# Turns with fewer words are too vague to share an answer
+MIN_CACHEABLE_TOKENS = 3
+
 DIRECT_SYSTEM = """
 You are a professional travel assistant.
 Answer conversationally and helpfully.
@@ -14,28 +18,104 @@ Special rule:
 
 """.strip()
 
+def _content(message: Any) -> Any:
+    return message.get("content", "") if isinstance(message, dict) else getattr(message, "content", "")
+
+
+def _cacheable_query(state: Dict[str, Any]) -> Optional[str]:
+    """
+    The turn's query if its answer does not depend on the conversation (so it may be shared), else None.
+    Only the opening turn qualifies: any later answer is built from the user's earlier turns, and the
+    cache is shared by every conversation.
+    """
+    if not settings.SEMANTIC_CACHE_ENABLED or len(state.get("messages") or []) != 1:
+        return None
+
+    query = state.get("query") or _content(state["messages"][-1])
+    if not isinstance(query, str):
+        return None
+
+    tokens = normalize_query(query).split()
+    if len(tokens) < MIN_CACHEABLE_TOKENS:
+        return None
+
+    return query
+
+
+def _cached_answer(query: Optional[str]) -> Optional[Dict[str, Any]]:
+    answer = get_semantic_cache().lookup(query) if query else None
+    if answer is None:
+        return None
+
+    logger.debug("DIRECT answer served from the semantic cache")
+    return {"execution": answer, "verified": False}
+
+
 def direct_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Direct answer node for simple travel-related queries,
     such as general travel advice, information that doesn't require tool usage,
     or questions that can be answered from conversation context alone.
+    Context-free questions are answered from the semantic cache when a similar one was answered before.
 
     inputs: 'messages'
     outputs: 'execution', 'verified' (always False)
     """
 
+    query = _cacheable_query(state)
+    cached = _cached_answer(query)
+    if cached is not None:
+        return cached
+
     model = get_lightweight_chat_model()
-    messages = [{"role": "system", "content": DIRECT_SYSTEM}] + state["messages"]
+    messages = cached_prompt(DIRECT_SYSTEM, state["messages"], model)
     
     try:
-        response = model.invoke(messages).content
+        message = model.invoke(messages)
+        record_usage("direct", [message])
+        response = message.content
+        logger.debug(settings.SUCCESS_GENERIC)
+
+    except Exception as exc:
+        logger.exception(settings.FAILED_GENERIC)
+        raise exc
+
+    if query and isinstance(response, str):
+        get_semantic_cache().store(query, response)
+
+    return {
+        "execution": response,
+        "verified": False,
+    }
+
+
+async def adirect_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async counterpart of direct_node (same inputs and outputs).
+    """
+
+    query = _cacheable_query(state)
+    cached = _cached_answer(query)
+    if cached is not None:
+        return cached
+
+    model = get_lightweight_chat_model()
+    messages = cached_prompt(DIRECT_SYSTEM, state["messages"], model)
+
+    try:
+        message = await model.ainvoke(messages)
+        record_usage("direct", [message])
+        response = message.content
         logger.debug(settings.SUCCESS_GENERIC)
 
     except Exception as exc:
         logger.exception(settings.FAILED_GENERIC)
         raise exc
 
+    if query and isinstance(response, str):
+        get_semantic_cache().store(query, response)
+
     return {
         "execution": response,
         "verified": False,
-    }
\ No newline at end of file
+    }
@@ -2,9 +2,12 @@ from __future__ import annotations
 from typing import Dict, Any
 import logging
 from langchain.agents import create_agent
+from langchain_anthropic.middleware import AnthropicPromptCachingMiddleware
 from langchain_core.messages import ToolMessage
-from app.infrastructure.llm import get_lightweight_chat_model
+from app.infrastructure.llm import get_lightweight_chat_model, record_usage
 from app.tools.tools import TRAVEL_TOOLS
+from app.tools.parallel_runner import ParallelToolRunner
+from app.tools.tool_memo import ToolMemoizer
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -38,15 +41,52 @@ def _get_agent():
     global _AGENT
 
     if _AGENT is None:
+        middleware = [
+            ToolMemoizer(),  # repeated calls within a conversation are answered from the memo
+            ParallelToolRunner(),  # independent tool calls run concurrently, with timeouts
+        ]
+        if settings.PROMPT_CACHING_ENABLED:
+            # Caches the tool definitions + system prompt and the conversation prefix between agent steps
+            middleware.append(AnthropicPromptCachingMiddleware(ttl=settings.PROMPT_CACHE_TTL, unsupported_model_behavior="ignore"))
+
         _AGENT = create_agent(
             model=get_lightweight_chat_model(),
             tools=TRAVEL_TOOLS,
             system_prompt=EXECUTOR_SYSTEM,
+            middleware=middleware,
         )
 
     return _AGENT
 
 
+def _summarize_result(result: Dict[str, Any], input_count: int = 0) -> Dict[str, Any]:
+    messages = result.get("messages", [])
+    record_usage("executor", messages[input_count:])
+
+    # Detect whether tools were used during this invocation
+    tools_used = any(
+        (
+            (isinstance(m, dict) and m.get("role") == "tool")
+            or isinstance(m, ToolMessage)
+        )
+        for m in messages
+    )
+
+    # Extract final assistant message
+    final_text = ""
+    if messages:
+        last = messages[-1]
+        if isinstance(last, dict):
+            final_text = last.get("content", "")
+        else:
+            final_text = getattr(last, "content", "")
+
+    return {
+        "execution": final_text,
+        "tools_used": tools_used,
+    }
+
+
 def executor_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     ReAct-style unified executor, that plans, reasons,
@@ -67,29 +107,26 @@ def executor_node(state: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as exc:
         logger.exception(settings.FAILED_GENERIC)
         raise exc
-    
 
-    messages = result.get("messages", [])
+    return _summarize_result(result, len(state["messages"]))
 
-    # Detect whether tools were used during this invocation
-    tools_used = any(
-        (
-            (isinstance(m, dict) and m.get("role") == "tool")
-            or isinstance(m, ToolMessage)
+
+async def aexecutor_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async counterpart of executor_node (same inputs and outputs).
+    Tools are awaited through their native coroutines.
+    """
+
+    try:
+        result = await _get_agent().ainvoke(
+        {
+            "messages": state["messages"]
+        }
         )
-        for m in messages
-    )
+        logger.debug(settings.SUCCESS_GENERIC)
 
-    # Extract final assistant message
-    final_text = ""
-    if messages:
-        last = messages[-1]
-        if isinstance(last, dict):
-            final_text = last.get("content", "")
-        else:
-            final_text = getattr(last, "content", "")
+    except Exception as exc:
+        logger.exception(settings.FAILED_GENERIC)
+        raise exc
 
-    return {
-        "execution": final_text,
-        "tools_used": tools_used,
-    }
\ No newline at end of file
+    return _summarize_result(result, len(state["messages"]))
@@ -1,5 +1,29 @@
 from __future__ import annotations
-from typing import Dict, Any
+import uuid
+from typing import Dict, Any, List
+
+VERIFICATION_WARNING = "***This answer could not be fully verified for correctness.***"
+GROUNDING_WARNING = "***This answer is based on the LLM Knowledge and was not grounded in tool invocation.***"
+
+
+def _build_warnings(*, verified: bool, tools_used: bool, route: Any) -> List[str]:
+    warnings: list[str] = []
+
+    if not verified:
+        warnings.append(VERIFICATION_WARNING)
+
+    if not tools_used or route == "DIRECT":
+        warnings.append(GROUNDING_WARNING)
+
+    return warnings
+
+
+def _compose_answer(execution: str, warnings: List[str]) -> str:
+    if warnings:
+        warning_block = "\n".join(warnings)
+        return f"{execution}\n\n---\n{warning_block}"
+    return execution
+
 
 def finalizer_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -7,32 +31,79 @@ def finalizer_node(state: Dict[str, Any]) -> Dict[str, Any]:
     based on verification status and tool usage.
 
     inputs: 'execution', 'verified' (bool), 'tools_used' (bool), 'route'
-    outputs: 'final_answer', 'messages'
+    outputs: 'final_answer', 'warnings', 'messages'
     """
     execution = state.get("execution") or ""
-    verified = bool(state.get("verified"))
-    tools_used = bool(state.get("tools_used"))
-    route = state.get("route")
 
-    warnings: list[str] = []
+    warnings = _build_warnings(
+        verified=bool(state.get("verified")),
+        tools_used=bool(state.get("tools_used")),
+        route=state.get("route"),
+    )
+    final_answer = _compose_answer(execution, warnings)
 
-    if not verified:
-        warnings.append(
-            "***This answer could not be fully verified for correctness.***"
-        )
+    return {
+        "final_answer": final_answer,
+        "warnings": warnings,
+        "messages": [{"role": "assistant", "content": final_answer}], # Append to conversation memory
+    }
 
-    if not tools_used or route == "DIRECT":
-        warnings.append(
-            "***This answer is based on the LLM Knowledge and was not grounded in tool invocation.***"
-        )
 
-    if warnings:
-        warning_block = "\n".join(warnings)
-        final_answer = f"{execution}\n\n---\n{warning_block}"
-    else:
-        final_answer = execution
+def speculative_finalizer_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Speculative finalizer that runs in parallel with the verifier.
+    Publishes the answer immediately, treating verification as pending,
+    and tags the stored message with an id so the verdict can later replace it.
+
+    inputs: 'execution', 'tools_used' (bool), 'route'
+    outputs: 'final_answer', 'warnings', 'messages', 'answer_message_id'
+    """
+    execution = state.get("execution") or ""
+
+    warnings = _build_warnings(
+        verified=True,  # verdict pending; see verification_annotation_node
+        tools_used=bool(state.get("tools_used")),
+        route=state.get("route"),
+    )
+    final_answer = _compose_answer(execution, warnings)
+    message_id = str(uuid.uuid4())
 
     return {
         "final_answer": final_answer,
-        "messages": [{"role": "assistant", "content": final_answer}], # Append to conversation memory
+        "warnings": warnings,
+        "answer_message_id": message_id,
+        "messages": [{"role": "assistant", "content": final_answer, "id": message_id}],
+    }
+
+
+def verification_annotation_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Trailing annotation emitted once the verifier's verdict is known.
+    Recomposes the final answer with the real verdict and replaces the
+    speculatively stored assistant message (same id) when it changed.
+
+    inputs: 'execution', 'verified' (bool), 'tools_used' (bool), 'route', 'answer_message_id'
+    outputs: 'annotation', and when the answer changed: 'final_answer', 'warnings', 'messages'
+    """
+    verified = bool(state.get("verified"))
+
+    if verified:
+        return {"annotation": ""}
+
+    warnings = _build_warnings(
+        verified=False,
+        tools_used=bool(state.get("tools_used")),
+        route=state.get("route"),
+    )
+    final_answer = _compose_answer(state.get("execution") or "", warnings)
+
+    message: Dict[str, Any] = {"role": "assistant", "content": final_answer}
+    if state.get("answer_message_id"):
+        message["id"] = state["answer_message_id"]
+
+    return {
+        "annotation": VERIFICATION_WARNING,
+        "final_answer": final_answer,
+        "warnings": warnings,
+        "messages": [message], # Replaces the speculative message by id
     }
@@ -0,0 +1,290 @@
+from __future__ import annotations
+import json
+import math
+import re
+import threading
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from app.config.settings import settings
+
+"""
+Deterministic pre-routing stage in front of the router LLM.
+Combines keyword/entity rules with an n-gram naive Bayes classifier trained on past routing decisions,
+so obvious turns are routed locally and only ambiguous turns reach the router model.
+The classifier only ever confirms a rule decision: it sees the latest message alone, and its naive Bayes
+posterior is not calibrated, so it never settles a route (e.g. a context-dependent follow-up) on its own.
+The decision log holds user queries verbatim: it can be disabled (ROUTER_DECISIONS_LOG_ENABLED), and it is
+rotated at ROUTER_DECISIONS_MAX_BYTES keeping a single previous generation, so it never grows without bound.
+"""
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------
+
+ROUTES = ("OFF_TOPIC", "DIRECT", "PLAN")
+
+settings.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+DECISIONS_PATH = settings.CACHE_DIR / settings.ROUTER_DECISIONS_FILE_NAME
+COUNTRIES_FILE = settings.DATA_DIR / "country_en_to_he.json"
+
+# Turns shorter than this usually depend on conversation context ("yes please", "and Rome?")
+MIN_TOKENS = 3
+
+# Fresh / time-sensitive / tool-backed data -> PLAN
+PLAN_KEYWORDS = {
+    "flight", "flights", "fly", "airfare", "ticket", "tickets",
+    "visa", "visas", "passport", "entry", "requirements",
+    "weather", "climate", "temperature", "rain", "forecast",
+    "warning", "warnings", "advisory", "advisories", "safe", "safety",
+    "embassy", "embassies", "consulate", "consulates",
+    "itinerary", "itineraries", "plan", "schedule",
+    "price", "prices", "cheapest", "cost", "booking",
+    "timezone", "time", "date",
+}
+
+# Evergreen, conceptual travel questions -> DIRECT
+DIRECT_CUES = (
+    "famous for", "known for", "tips for", "tips on", "etiquette",
+    "what should i pack", "how do i pack", "how to pack", "packing list",
+    "jet lag", "jetlag", "long-haul", "long haul",
+    "what language", "what currency", "traditional food", "local food",
+)
+
+# Generic travel vocabulary (country names are added as entities at load time)
+TRAVEL_KEYWORDS = {
+    "travel", "travelling", "traveling", "trip", "trips", "vacation", "holiday",
+    "tour", "tourist", "tourism", "visit", "visiting", "destination",
+    "hotel", "hostel", "airport", "airline", "city", "cities", "country",
+    "abroad", "sightseeing", "attractions", "beach", "museum", "luggage",
+}
+
+OFF_TOPIC_KEYWORDS = {
+    "python", "javascript", "java", "code", "coding", "programming", "bug", "compile",
+    "sql", "algorithm", "recipe", "bake", "baking", "cook", "cooking",
+    "equation", "integral", "derivative", "algebra", "homework", "math",
+    "poem", "lyrics", "girlfriend", "boyfriend", "relationship", "dating",
+    "birthday", "gift", "stocks", "crypto", "bitcoin",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_IATA_RE = re.compile(r"\b[A-Z]{3}\b")
+# "may" only counts as a month next to a day number or after a preposition, never as the modal verb
+_DATE_RE = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}\b|\b(?:january|february|march|april|june|july|august|"
+    r"september|october|november|december|tomorrow|tonight|next week|next month|this weekend)\b|"
+    r"\bmay \d{1,2}\b|\b\d{1,2}(?:st|nd|rd|th)? may\b|\b(?:in|during|early|late|mid|until|since) may\b"
+)
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _ngrams(tokens: List[str]) -> List[str]:
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+_COUNTRY_NAMES: Optional[frozenset] = None
+
+def _country_names() -> frozenset:
+    """
+    Lazily load English country names used as travel entities.
+    """
+    global _COUNTRY_NAMES
+
+    if _COUNTRY_NAMES is None:
+        try:
+            with open(COUNTRIES_FILE, encoding="utf-8") as f:
+                _COUNTRY_NAMES = frozenset(json.load(f).keys())
+        except (OSError, ValueError):
+            logger.exception("Failed to load country names for pre-router")
+            _COUNTRY_NAMES = frozenset()
+
+    return _COUNTRY_NAMES
+
+
+def _mentions_country(text: str) -> bool:
+    padded = f" {' '.join(_tokenize(text))} "
+    return any(f" {name} " in padded for name in _country_names())
+
+# ------------------------------------------------------------
+# N-gram classifier (trained on past routing decisions)
+# ------------------------------------------------------------
+
+class NgramRouteClassifier:
+    """
+    Multinomial naive Bayes over word unigrams and bigrams.
+    Updated incrementally; cheap enough to run on every turn.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._route_counts: Counter = Counter()
+        self._ngram_counts: Dict[str, Counter] = {r: Counter() for r in ROUTES}
+        self._ngram_totals: Counter = Counter()
+        self._vocab: set = set()
+
+    @property
+    def samples(self) -> int:
+        return sum(self._route_counts.values())
+
+    def learn(self, query: str, route: str) -> None:
+        if route not in ROUTES:
+            return
+
+        grams = _ngrams(_tokenize(query))
+        with self._lock:
+            self._route_counts[route] += 1
+            self._ngram_counts[route].update(grams)
+            self._ngram_totals[route] += len(grams)
+            self._vocab.update(grams)
+
+    def predict(self, query: str) -> Tuple[Optional[str], float]:
+        """
+        Return (route, posterior probability) or (None, 0.0) if untrained.
+        """
+        grams = _ngrams(_tokenize(query))
+
+        with self._lock:
+            total = self.samples
+            if not total or not grams:
+                return None, 0.0
+
+            vocab_size = len(self._vocab) + 1
+            scores: Dict[str, float] = {}
+            for route in ROUTES:
+                if not self._route_counts[route]:
+                    continue
+                denom = self._ngram_totals[route] + vocab_size
+                score = math.log(self._route_counts[route] / total)
+                for g in grams:
+                    score += math.log((self._ngram_counts[route][g] + 1) / denom)
+                scores[route] = score
+
+        best = max(scores, key=scores.get)
+        top = scores[best]
+        norm = sum(math.exp(s - top) for s in scores.values())
+        return best, 1.0 / norm
+
+
+_CLASSIFIER: Optional[NgramRouteClassifier] = None
+_CLASSIFIER_LOCK = threading.Lock()
+_LOG_LOCK = threading.Lock()
+
+
+def _previous_log_path():
+    return DECISIONS_PATH.with_name(DECISIONS_PATH.name + ".1")
+
+
+def _get_classifier() -> NgramRouteClassifier:
+    """
+    Lazily build the classifier from the persisted decision log.
+    """
+    global _CLASSIFIER
+
+    with _CLASSIFIER_LOCK:
+        if _CLASSIFIER is None:
+            classifier = NgramRouteClassifier()
+            for path in (_previous_log_path(), DECISIONS_PATH):
+                if not path.exists():
+                    continue
+                with path.open(encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            row = json.loads(line)
+                            classifier.learn(row["query"], row["route"])
+                        except (ValueError, KeyError, TypeError):
+                            continue
+            _CLASSIFIER = classifier
+
+    return _CLASSIFIER
+
+# ------------------------------------------------------------
+# Rules
+# ------------------------------------------------------------
+
+def _classify_by_rules(query: str) -> Tuple[Optional[str], float]:
+    text = query.lower()
+    tokens = set(_tokenize(text))
+
+    plan_hits = tokens & PLAN_KEYWORDS
+    off_hits = tokens & OFF_TOPIC_KEYWORDS
+    direct_cue = any(cue in text for cue in DIRECT_CUES)
+    has_date = bool(_DATE_RE.search(text))
+    has_iata = bool(_IATA_RE.search(query))
+    travel = bool(tokens & TRAVEL_KEYWORDS) or _mentions_country(text)
+
+    if off_hits and not plan_hits and not travel:
+        return "OFF_TOPIC", min(0.99, 0.85 + 0.05 * len(off_hits))
+
+    if plan_hits and not off_hits:
+        confidence = 0.8 + 0.07 * len(plan_hits)
+        if has_date or has_iata:
+            confidence += 0.1
+        return "PLAN", min(0.99, confidence)
+
+    if direct_cue and travel and not plan_hits and not off_hits and not has_date:
+        return "DIRECT", 0.9
+
+    return None, 0.0
+
+# ------------------------------------------------------------
+# Public API
+# ------------------------------------------------------------
+
+def classify_query(query: str) -> Tuple[Optional[str], float]:
+    """
+    Classify a user turn locally, without any network call.
+
+    inputs:
+        query: The latest user message
+    outputs:
+        (route, confidence) where route is OFF_TOPIC / DIRECT / PLAN,
+        or (None, 0.0) when the turn is ambiguous and should go to the router LLM.
+        Once trained, the classifier must agree with the rules; it never routes a turn by itself.
+    """
+    if not isinstance(query, str) or len(_tokenize(query)) < MIN_TOKENS:
+        return None, 0.0
+
+    rule_route, rule_conf = _classify_by_rules(query)
+
+    classifier = _get_classifier()
+    if classifier.samples < settings.ROUTER_CLASSIFIER_MIN_SAMPLES:
+        return rule_route, rule_conf
+
+    model_route, _ = classifier.predict(query)
+
+    if rule_route is not None and model_route == rule_route:
+        return rule_route, rule_conf
+
+    # No rule fired, or rules and classifier disagree -> ambiguous
+    return None, 0.0
+
+
+def record_decision(query: str, route: str) -> None:
+    """
+    Persist a routing decision made by the router LLM and feed it to the classifier.
+    """
+    if not isinstance(query, str) or not query or route not in ROUTES:
+        return
+
+    _get_classifier().learn(query, route)
+
+    if not settings.ROUTER_DECISIONS_LOG_ENABLED:
+        return
+
+    try:
+        with _LOG_LOCK:
+            if DECISIONS_PATH.exists() and DECISIONS_PATH.stat().st_size >= settings.ROUTER_DECISIONS_MAX_BYTES:
+                DECISIONS_PATH.replace(_previous_log_path())
+
+            with DECISIONS_PATH.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"query": query, "route": route}, ensure_ascii=False) + "\n")
+    except OSError:
+        logger.exception("Failed to persist routing decision")
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from typing import Dict, Any
-from app.infrastructure.llm import get_lightweight_chat_model
+from typing import Dict, Any, Optional
+from app.infrastructure.llm import cached_prompt, get_lightweight_chat_model, record_usage
 from app.config.settings import settings
+from app.infrastructure import metrics
+from app.nodes.pre_router import classify_query, record_decision
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,27 +37,75 @@ OFF_TOPIC | DIRECT | PLAN
 """.strip()
 
 
+def _extract_query(state: Dict[str, Any]) -> Any:
+    last_message = state["messages"][-1]
+    if isinstance(last_message, dict):
+        return last_message.get("content", "")
+    return getattr(last_message, "content", "")
+
+
+def _fast_route(query: Any) -> Optional[Dict[str, Any]]:
+    """
+    Settle the route locally when the pre-router is confident enough, else None.
+    """
+    if not settings.ROUTER_FAST_PATH_ENABLED:
+        return None
+
+    fast_route, confidence = classify_query(query)
+    if fast_route and confidence >= settings.ROUTER_FAST_PATH_THRESHOLD:
+        metrics.increment("router.fast_path")
+        logger.debug(f"Pre-router settled {fast_route} (confidence={confidence:.2f})")
+        return {
+            "route": fast_route,
+            "query": query,
+        }
+
+    return None
+
+
+def _parse_route(out: str, query: Any) -> Dict[str, Any]:
+    if out.startswith("OFF_TOPIC"):
+        route = "OFF_TOPIC"
+    elif out.startswith("PLAN"):
+        route = "PLAN"
+    elif out.startswith("DIRECT"):
+        route = "DIRECT"
+    else:
+        route = "PLAN"
+
+    if out.startswith(route):
+        record_decision(query, route)
+
+    return {
+        "route": route,
+        "query": query,
+    }
+
+
 def router_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Routes the conversation based on the latest user message.
     Analyzes whether the request is OFF_TOPIC, DIRECT, or PLAN.
+    Obvious turns are settled by the local pre-router; only ambiguous turns invoke the router model.
     
     inputs: 'messages'
     outputs: 'route', 'query'
     """
-    model = get_lightweight_chat_model()
+    query = _extract_query(state)
 
-    last_message = state["messages"][-1]
-    if isinstance(last_message, dict):
-        query = last_message.get("content", "")
-    else:
-        query = getattr(last_message, "content", "")
+    fast = _fast_route(query)
+    if fast:
+        return fast
+
+    metrics.increment("router.llm")
+    model = get_lightweight_chat_model()
 
     logger.debug(f"Router model will be invoked with the query: {query}")
-    messages = [{"role": "system", "content": ROUTER_SYSTEM}] + state["messages"]
+    messages = cached_prompt(ROUTER_SYSTEM, state["messages"], model)
 
     try:
         response = model.invoke(messages, timeout=30)
+        record_usage("router", [response])
         out = response.content.strip().upper()
         logger.debug(settings.SUCCESS_GENERIC)
 
@@ -63,16 +113,33 @@ def router_node(state: Dict[str, Any]) -> Dict[str, Any]:
         logger.exception(settings.FAILED_GENERIC)
         raise exc
 
-    if out.startswith("OFF_TOPIC"):
-        route = "OFF_TOPIC"
-    elif out.startswith("PLAN"):
-        route = "PLAN"
-    elif out.startswith("DIRECT"):
-        route = "DIRECT"
-    else:
-        route = "PLAN"
+    return _parse_route(out, query)
 
-    return {
-        "route": route,
-        "query": query,
-    }
\ No newline at end of file
+
+async def arouter_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async counterpart of router_node (same inputs and outputs).
+    """
+    query = _extract_query(state)
+
+    fast = _fast_route(query)
+    if fast:
+        return fast
+
+    metrics.increment("router.llm")
+    model = get_lightweight_chat_model()
+
+    logger.debug(f"Router model will be invoked with the query: {query}")
+    messages = cached_prompt(ROUTER_SYSTEM, state["messages"], model)
+
+    try:
+        response = await model.ainvoke(messages, timeout=30)
+        record_usage("router", [response])
+        out = response.content.strip().upper()
+        logger.debug(settings.SUCCESS_GENERIC)
+
+    except Exception as exc:
+        logger.exception(settings.FAILED_GENERIC)
+        raise exc
+
+    return _parse_route(out, query)
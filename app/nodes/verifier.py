@@ -18,15 +18,7 @@ INVALID: <one short reason>
 """.strip()
 
 
-def verifier_node(state: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    validates the correctness of the proposed answer based on consistency and sensibility.
-    inputs: 'query', 'execution', 'messages'
-    outputs: 'verified' (bool)
-    """
-
-    model = get_verifier_model()
-
+def _build_messages(state: Dict[str, Any]) -> list:
     query = state.get("query") or []
     execution = state.get("execution") or ""
 
@@ -36,12 +28,23 @@ def verifier_node(state: Dict[str, Any]) -> Dict[str, Any]:
         f"Proposed answer:\n{execution}\n"
     )
 
-    messages = (
+    return (
         [{"role": "system", "content": VERIFIER_SYSTEM}]
         + state["messages"]
         + [{"role": "user", "content": verifier_prompt}]
     )
 
+
+def verifier_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    validates the correctness of the proposed answer based on consistency and sensibility.
+    inputs: 'query', 'execution', 'messages'
+    outputs: 'verified' (bool)
+    """
+
+    model = get_verifier_model()
+    messages = _build_messages(state)
+
     try:
         verdict = model.invoke(messages).content.strip()
         logger.debug(settings.SUCCESS_GENERIC)
@@ -51,4 +54,24 @@ def verifier_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     verified = verdict.startswith("VERIFIED")
 
-    return {"verified": verified}
\ No newline at end of file
+    return {"verified": verified}
+
+
+async def averifier_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async counterpart of verifier_node (same inputs and outputs).
+    """
+
+    model = get_verifier_model()
+    messages = _build_messages(state)
+
+    try:
+        verdict = (await model.ainvoke(messages)).content.strip()
+        logger.debug(settings.SUCCESS_GENERIC)
+    except Exception as exc:
+        logger.exception(settings.FAILED_GENERIC)
+        raise exc
+
+    verified = verdict.startswith("VERIFIED")
+
+    return {"verified": verified}
@@ -0,0 +1,164 @@
+from __future__ import annotations
+import asyncio
+import contextvars
+import logging
+import threading
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Optional
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import ToolMessage
+from app.config.settings import settings
+from app.infrastructure import metrics
+
+"""
+Parallel tool runner for the executor agent.
+When the model requests several tools in one step, the agent's tool node fans them out and this middleware
+runs each call with at most TOOL_MAX_WORKERS calls in flight (threads on the sync path, coroutines on the
+async path), enforcing a per-tool timeout. Results keep the order of the original tool calls, so a multi-tool
+step takes as long as its slowest tool instead of the sum of all of them.
+The timeout is measured from when the call starts running; time spent waiting for a free slot does not count.
+A Python thread cannot be cancelled, so on the sync path a timed-out call is abandoned rather than stopped:
+it keeps running on its own thread until it returns, but gives its slot back immediately, so a hanging
+upstream cannot starve later calls. At most TOOL_MAX_ABANDONED such calls may be left running; beyond that
+new calls are refused with an error result, so live tool threads never exceed TOOL_MAX_WORKERS + TOOL_MAX_ABANDONED.
+On the async path the timed-out coroutine is cancelled.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def _release_once(semaphore: threading.Semaphore) -> Callable[[], None]:
+    # The slot is freed by whichever comes first: the call finishing or the caller abandoning it
+    lock = threading.Lock()
+    released = False
+
+    def release() -> None:
+        nonlocal released
+        with lock:
+            if released:
+                return
+            released = True
+        semaphore.release()
+
+    return release
+
+
+class ParallelToolRunner(AgentMiddleware):
+
+    def __init__(
+        self,
+        *,
+        max_workers: Optional[int] = None,
+        max_abandoned: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+    ):
+        super().__init__()
+        self.max_workers = max_workers or settings.TOOL_MAX_WORKERS
+        self.max_abandoned = settings.TOOL_MAX_ABANDONED if max_abandoned is None else max_abandoned
+        self.default_timeout = default_timeout or settings.TOOL_TIMEOUT_SECONDS
+        self.timeouts = settings.TOOL_TIMEOUTS if timeouts is None else timeouts
+
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        # Timed-out sync calls whose thread is still running
+        self._abandoned = 0
+        self._abandoned_lock = threading.Lock()
+        # asyncio primitives are bound to a loop, so keep one semaphore per running loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    # ------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------
+
+    def _timeout_for(self, name: str) -> float:
+        return self.timeouts.get(name, self.default_timeout)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_workers)
+        return self._semaphores[loop]
+
+    @staticmethod
+    def _timeout_message(request, timeout: float) -> ToolMessage:
+        name = request.tool_call["name"]
+        metrics.increment(f"tools.timeout.{name}")
+        logger.warning(f"Tool '{name}' timed out after {timeout}s")
+
+        return ToolMessage(
+            content=f"Tool '{name}' timed out after {timeout:g} seconds. Continue without this result.",
+            tool_call_id=request.tool_call["id"],
+            name=name,
+            status="error",
+        )
+
+    @staticmethod
+    def _refused_message(request) -> ToolMessage:
+        name = request.tool_call["name"]
+        metrics.increment(f"tools.refused.{name}")
+        logger.warning(f"Tool '{name}' refused: too many timed-out tool calls are still running")
+
+        return ToolMessage(
+            content=f"Tool '{name}' is temporarily unavailable. Continue without this result.",
+            tool_call_id=request.tool_call["id"],
+            name=name,
+            status="error",
+        )
+
+    # ------------------------------------------------------------
+    # Middleware hooks
+    # ------------------------------------------------------------
+
+    def wrap_tool_call(self, request, handler: Callable[[Any], Any]):
+        timeout = self._timeout_for(request.tool_call["name"])
+
+        self._slots.acquire()  # waiting for a free slot does not count against the timeout
+        release = _release_once(self._slots)
+
+        if self._abandoned >= self.max_abandoned:
+            # Upstreams are hanging: do not start yet another thread that would likely be abandoned too
+            release()
+            return self._refused_message(request)
+
+        future: Future = Future()
+        state = {"done": False, "abandoned": False}
+        # Preserve callbacks/config carried in context vars
+        ctx = contextvars.copy_context()
+
+        def run() -> None:
+            try:
+                future.set_result(ctx.run(handler, request))
+            except BaseException as exc:
+                future.set_exception(exc)
+            finally:
+                release()
+                with self._abandoned_lock:
+                    state["done"] = True
+                    if state["abandoned"]:
+                        self._abandoned -= 1
+
+        threading.Thread(target=run, name="orbi-tool", daemon=True).start()
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Abandon the call: it finishes in the background, but no longer holds a slot
+            with self._abandoned_lock:
+                if not state["done"]:
+                    state["abandoned"] = True
+                    self._abandoned += 1
+            release()
+            metrics.increment(f"tools.abandoned.{request.tool_call['name']}")
+            return self._timeout_message(request, timeout)
+
+    async def awrap_tool_call(self, request, handler: Callable[[Any], Awaitable[Any]]):
+        timeout = self._timeout_for(request.tool_call["name"])
+
+        async with self._semaphore():
+            try:
+                return await asyncio.wait_for(handler(request), timeout=timeout)
+            except asyncio.TimeoutError:
+                return self._timeout_message(request, timeout)
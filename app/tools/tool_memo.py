@@ -0,0 +1,145 @@
+from __future__ import annotations
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import ToolMessage
+from app.config.settings import settings
+from app.infrastructure import metrics
+from app.infrastructure.response_cache import SQLiteResponseCache
+
+"""
+Per-conversation memoization of tool results for the executor agent.
+A tool call is keyed by the conversation's thread_id, the tool name and its canonicalized arguments
+(validated against the tool's schema, so omitted defaults and explicit defaults are the same call).
+Successful results are kept in a SQLite side table under the cache directory for the tool's TTL
+(settings.TOOL_MEMO_TTLS), so a repeated lookup later in the same conversation - also after a restart -
+is answered without running the tool. Errors, timeouts and partial failures are never memoized.
+"""
+
+logger = logging.getLogger(__name__)
+
+MEMO_PATH = settings.CACHE_DIR / settings.TOOL_MEMO_FILE_NAME
+
+
+def _thread_id(request) -> Optional[str]:
+    config = getattr(request.runtime, "config", None) or {}
+    thread_id = (config.get("configurable") or {}).get("thread_id")
+    return str(thread_id) if thread_id is not None else None
+
+
+def _canonical_args(request) -> str:
+    args = request.tool_call.get("args") or {}
+    schema = getattr(request.tool, "args_schema", None)
+
+    if isinstance(schema, type) and hasattr(schema, "model_validate"):
+        try:
+            args = schema.model_validate(args).model_dump(mode="json")
+        except ValueError:
+            pass  # invalid arguments: the tool call itself will report the error
+
+    return json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _is_failure(message: Any) -> bool:
+    """
+    True for results that must not be memoized: error statuses and error payloads (whole or partial).
+    """
+    if not isinstance(message, ToolMessage) or message.status == "error":
+        return True
+
+    try:
+        payload = json.loads(message.content) if isinstance(message.content, str) else message.content
+    except ValueError:
+        return False
+
+    if not isinstance(payload, dict):
+        return False
+
+    if "error" in payload or payload.get("errors") or payload.get("failed"):
+        return True
+
+    # Batch tools report failures per entry
+    return any(isinstance(value, dict) and "error" in value for value in payload.values())
+
+
+class ToolMemoizer(AgentMiddleware):
+
+    def __init__(
+        self,
+        *,
+        store: Optional[SQLiteResponseCache] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: Optional[float] = None,
+    ):
+        super().__init__()
+        self.store = store or SQLiteResponseCache(MEMO_PATH)
+        self.ttls = settings.TOOL_MEMO_TTLS if ttls is None else ttls
+        self.default_ttl = settings.TOOL_MEMO_DEFAULT_TTL_SECONDS if default_ttl is None else default_ttl
+
+    # ------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------
+
+    def _key(self, request) -> Optional[str]:
+        """
+        Memo key for the call, or None if it must not be memoized (no thread, TTL of 0, disabled).
+        """
+        name = request.tool_call["name"]
+        thread_id = _thread_id(request)
+
+        if not settings.TOOL_MEMO_ENABLED or thread_id is None or self.ttls.get(name, self.default_ttl) <= 0:
+            return None
+        return f"{thread_id}|{name}|{_canonical_args(request)}"
+
+    def _lookup(self, request, key: str) -> Optional[ToolMessage]:
+        name = request.tool_call["name"]
+        content = self.store.get(key)
+
+        if content is None:
+            metrics.increment(f"tools.memo.miss.{name}")
+            return None
+
+        metrics.increment(f"tools.memo.hit.{name}")
+        return ToolMessage(content=content, tool_call_id=request.tool_call["id"], name=name)
+
+    def _remember(self, request, key: str, result: Any) -> None:
+        if _is_failure(result):
+            return
+
+        name = request.tool_call["name"]
+        try:
+            self.store.set(key, result.content, self.ttls.get(name, self.default_ttl))
+        except Exception:
+            # Memoization is an optimization; never fail the tool call over it
+            logger.warning(f"Could not memoize result of tool '{name}'", exc_info=True)
+
+    # ------------------------------------------------------------
+    # Middleware hooks
+    # ------------------------------------------------------------
+
+    def wrap_tool_call(self, request, handler: Callable[[Any], Any]):
+        key = self._key(request)
+        if key is None:
+            return handler(request)
+
+        cached = self._lookup(request, key)
+        if cached is not None:
+            return cached
+
+        result = handler(request)
+        self._remember(request, key, result)
+        return result
+
+    async def awrap_tool_call(self, request, handler: Callable[[Any], Awaitable[Any]]):
+        key = self._key(request)
+        if key is None:
+            return await handler(request)
+
+        cached = self._lookup(request, key)
+        if cached is not None:
+            return cached
+
+        result = await handler(request)
+        self._remember(request, key, result)
+        return result
@@ -1,21 +1,163 @@
-from typing import List, Optional, Dict, Any
-from langchain.tools import tool
+from typing import List, Optional, Dict, Any, Callable, Awaitable
+from langchain.tools import tool, BaseTool
 from datetime import date
-from datetime import datetime
-from app.domain.climate import fetch_climate_data
-from app.domain.flight_search import search_flights
+from datetime import datetime, time
+from app.domain.climate import fetch_climate_data, afetch_climate_data
+from app.domain.flight_search import search_flights, asearch_flights, search_flight_matrix, asearch_flight_matrix
 from app.domain.travel_warnings import fetch_travel_warnings
-from app.domain.travel_recommendations import get_travel_recommendations
-from app.domain.timezone_service import get_current_time_by_timezone
-from app.domain.entry_requirements import get_visa_requirements
-from app.domain.embassies import get_israeli_embassies
+from app.domain.travel_recommendations import get_travel_recommendations, aget_travel_recommendations
+from app.domain.timezone_service import get_current_time_by_timezone, aget_current_time_by_timezone, get_current_times
+from app.domain.entry_requirements import (
+    get_visa_requirements,
+    aget_visa_requirements,
+    get_visa_requirements_batch,
+    aget_visa_requirements_batch,
+)
+from app.domain.embassies import get_israeli_embassies, aget_israeli_embassies
+from app.domain.itinerary import ItineraryStop, build_itinerary_briefing, abuild_itinerary_briefing
 
 """
 Tools for retrieving travel-related information.
 Notice that the description of each tool is very important, as it guides the agent on when to use it.
 The tool description is not 1-to-1 with the function docstring, as it may contain additional instructions and context for the agent.
+
+I/O-bound tools also carry a native coroutine, so `ainvoke` (async graph path) awaits the async domain
+function instead of running the sync one in a worker thread. In-memory tools keep the default behavior.
 """
 
+
+def _with_coroutine(coroutine: Callable[..., Awaitable[Any]]) -> Callable[[BaseTool], BaseTool]:
+    """
+    Attach an async implementation to a @tool. The coroutine must accept the same arguments.
+    """
+    def decorator(t: BaseTool) -> BaseTool:
+        t.coroutine = coroutine
+        return t
+
+    return decorator
+
+
+# ------------------------------------------------------------
+# Async implementations (used via ainvoke)
+# ------------------------------------------------------------
+
+async def _aget_place_climate(place_name: str, month: str) -> Dict[str, Any]:
+    return await afetch_climate_data(place_name=place_name, month=month)
+
+
+def _time_or_none(value: Optional[str]) -> Optional[time]:
+    return time.fromisoformat(value) if value else None
+
+
+async def _asearch_flights_tool(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: Optional[str] = None,
+    adults: int = 1,
+    max_results: int = 20,
+    sort_by: str = "price",
+    max_stops: Optional[int] = None,
+    depart_after: Optional[str] = None,
+    depart_before: Optional[str] = None,
+    top_n: int = 5,
+):
+    return await asearch_flights(
+        origin=origin,
+        destination=destination,
+        departure_date=date.fromisoformat(departure_date),
+        return_date=date.fromisoformat(return_date) if return_date else None,
+        adults=adults,
+        max_results=max_results,
+        sort_by=sort_by,
+        max_stops=max_stops,
+        depart_after=_time_or_none(depart_after),
+        depart_before=_time_or_none(depart_before),
+        top_n=top_n,
+        compact=True,
+    )
+
+
+async def _asearch_flight_matrix_tool(
+    origins: List[str],
+    destinations: List[str],
+    departure_date_from: str,
+    departure_date_to: Optional[str] = None,
+    trip_length_days: Optional[int] = None,
+    adults: int = 1,
+):
+    return await asearch_flight_matrix(
+        origins=origins,
+        destinations=destinations,
+        departure_from=date.fromisoformat(departure_date_from),
+        departure_to=date.fromisoformat(departure_date_to) if departure_date_to else None,
+        trip_length_days=trip_length_days,
+        adults=adults,
+    )
+
+
+async def _atravel_recommendations_tool(
+    city: str,
+    country_code: Optional[str] = None,
+    k: int = 5,
+):
+    return await aget_travel_recommendations(city=city, country_code=country_code, k=k)
+
+
+async def _aget_current_time(timezone: str) -> dict:
+    return await aget_current_time_by_timezone(timezone)
+
+
+async def _aget_entry_requirements(
+    passport_country_code: str,
+    destination_country_code: str,
+) -> Dict[str, Any]:
+    return await aget_visa_requirements(
+        passport_country_code=passport_country_code,
+        destination_country_code=destination_country_code,
+    )
+
+
+async def _aget_entry_requirements_batch_tool(
+    passport_country_code: str,
+    destination_country_codes: List[str],
+) -> Dict[str, Dict[str, Any]]:
+    return await aget_visa_requirements_batch(
+        passport_country_code=passport_country_code,
+        destination_country_codes=destination_country_codes,
+    )
+
+
+def _itinerary_stops(stops: List[Dict[str, str]]) -> List[ItineraryStop]:
+    return [
+        ItineraryStop(
+            city=stop["city"],
+            country_code=stop["country_code"],
+            arrival=date.fromisoformat(stop["arrival_date"]),
+            departure=date.fromisoformat(stop["departure_date"]) if stop.get("departure_date") else None,
+        )
+        for stop in stops
+    ]
+
+
+async def _aitinerary_briefing_tool(
+    stops: List[Dict[str, str]],
+    passport_country_code: str = "IL",
+) -> Dict[str, Any]:
+    return await abuild_itinerary_briefing(_itinerary_stops(stops), passport_country_code=passport_country_code)
+
+
+async def _aget_israeli_embassy_contacts(
+    country: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    return await aget_israeli_embassies(country=country)
+
+
+# ------------------------------------------------------------
+# Tools
+# ------------------------------------------------------------
+
+@_with_coroutine(_aget_place_climate)
 @tool
 def get_place_climate(place_name: str, month: str) -> str:
     """
@@ -29,6 +171,7 @@ def get_place_climate(place_name: str, month: str) -> str:
     return fetch_climate_data(place_name=place_name,month=month)
 
 
+@_with_coroutine(_asearch_flights_tool)
 @tool
 def search_flights_tool(
     origin: str,
@@ -36,14 +179,24 @@ def search_flights_tool(
     departure_date: str,
     return_date: Optional[str] = None,
     adults: int = 1,
-    max_results: int = 5,
+    max_results: int = 20,
+    sort_by: str = "price",
+    max_stops: Optional[int] = None,
+    depart_after: Optional[str] = None,
+    depart_before: Optional[str] = None,
+    top_n: int = 5,
 ):
     """
     Search for available commercial flight offers between two cities.
 
     Inputs use IATA airport or city codes (e.g., "TLV", "JFK").
     Dates must be in YYYY-MM-DD format.
-    Returns flight options with price, duration, and segment details.
+    Ranking and filters are applied before results are returned:
+    - sort_by: "price" (cheapest), "duration" (fastest), "stops" (fewest stops) or "departure" (earliest)
+    - max_stops: e.g. 0 for direct flights only
+    - depart_after / depart_before: local departure time window, HH:MM
+    - top_n: number of offers to return; max_results: offers to consider
+    Returns short offer summaries (price, duration, stops, route, times, flight numbers).
     Use when the user asks about flight availability, prices, or routes.
     """
     return search_flights(
@@ -53,9 +206,48 @@ def search_flights_tool(
         return_date=date.fromisoformat(return_date) if return_date else None,
         adults=adults,
         max_results=max_results,
+        sort_by=sort_by,
+        max_stops=max_stops,
+        depart_after=_time_or_none(depart_after),
+        depart_before=_time_or_none(depart_before),
+        top_n=top_n,
+        compact=True,
+    )
+
+
+@_with_coroutine(_asearch_flight_matrix_tool)
+@tool
+def search_flight_matrix_tool(
+    origins: List[str],
+    destinations: List[str],
+    departure_date_from: str,
+    departure_date_to: Optional[str] = None,
+    trip_length_days: Optional[int] = None,
+    adults: int = 1,
+):
+    """
+    Compare flight prices across flexible dates and several airports in ONE call.
+
+    Inputs:
+    - origins / destinations: lists of IATA airport or city codes (e.g. ["TLV"], ["ATH", "SKG"])
+    - departure_date_from / departure_date_to: inclusive departure date range, YYYY-MM-DD
+    - trip_length_days: for round trips, nights between departure and return (omit for one-way)
+
+    Returns a price matrix {"ORIGIN-DEST": {date: cheapest price}} and the cheapest offers overall.
+    Use instead of repeated search_flights_tool calls for "cheapest way to ...", "which day is cheapest"
+    or nearby-airport questions. At most ~30 airport/date combinations per call.
+    """
+    return search_flight_matrix(
+        origins=origins,
+        destinations=destinations,
+        departure_from=date.fromisoformat(departure_date_from),
+        departure_to=date.fromisoformat(departure_date_to) if departure_date_to else None,
+        trip_length_days=trip_length_days,
+        adults=adults,
     )
 
 
+@_with_coroutine(_atravel_recommendations_tool)
 @tool
 def travel_recommendations_tool(
     city: str,
@@ -76,11 +268,13 @@ def travel_recommendations_tool(
     )
 
 
+@_with_coroutine(_aget_current_time)
 @tool
 def get_current_time(timezone: str) -> dict:
     """
-    Retrieve the current local time and timezone metadata using a real-time API.
+    Retrieve the current local time and timezone metadata, computed from the IANA timezone database.
     ALWAYS use this tool to get date or time in a SPECIFIED place or timezone in the world.
+    For several places at once, use get_current_times_tool instead.
 
 
     Input:
@@ -111,6 +305,23 @@ def get_current_time(timezone: str) -> dict:
     return get_current_time_by_timezone(timezone)
 
 
+@tool
+def get_current_times_tool(timezones: List[str]) -> dict:
+    """
+    Current local time in several places at once (e.g. "what time is it in Tokyo, Paris and New York?").
+    Use instead of calling get_current_time once per place.
+
+    Input:
+        timezones (list[str]): Timezones in Area/Location format, one per place,
+                               e.g. ["Asia/Tokyo", "Europe/Paris", "America/New_York"]
+
+    Output:
+        {timezone: same fields as get_current_time} for each timezone;
+        an invalid timezone maps to {"error": str}.
+    """
+    return get_current_times(timezones)
+
+
 @tool
 def get_current_local_datetime() -> str:
     """
@@ -126,7 +337,7 @@ def get_travel_warnings(country: str) -> List[str]:
     Returns official Israeli travel warning recommendations for a given country.
 
     Input:
-    - country: English country name (e.g., "Italy", "Japan", "United States")
+    - country: Country name (e.g., "Italy", "Japan", "United States"); ISO codes such as "JP" or "USA" also work
 
     Output:
     - A list of travel warning recommendation strings.
@@ -138,6 +349,7 @@ def get_travel_warnings(country: str) -> List[str]:
     return sorted(recommendations)
 
 
+@_with_coroutine(_aget_entry_requirements)
 @tool
 def get_entry_requirements(
     passport_country_code: str,
@@ -162,6 +374,61 @@ def get_entry_requirements(
     )
 
 
+@_with_coroutine(_aget_entry_requirements_batch_tool)
+@tool
+def get_entry_requirements_batch_tool(
+    passport_country_code: str,
+    destination_country_codes: List[str],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Return visa and entry requirements for one passport across several destinations
+    (multi-country trips). Use instead of calling get_entry_requirements once per country.
+
+    Inputs:
+    - passport_country_code: ISO 3166-1 alpha-2 code of the passport country (e.g. "IL")
+    - destination_country_codes: ISO 3166-1 alpha-2 codes of the destinations (e.g. ["TH", "VN", "KH"])
+
+    Output:
+    - {destination code: same fields as get_entry_requirements}; a failed lookup maps to {"error": str}
+
+    Information is best-effort and may change; users must verify with official sources.
+    """
+    return get_visa_requirements_batch(
+        passport_country_code=passport_country_code,
+        destination_country_codes=destination_country_codes,
+    )
+
+
+@_with_coroutine(_aitinerary_briefing_tool)
+@tool
+def itinerary_briefing_tool(
+    stops: List[Dict[str, str]],
+    passport_country_code: str = "IL",
+) -> Dict[str, Any]:
+    """
+    One-call briefing for a trip through several destinations: travel warnings, visa / entry requirements
+    and Israeli embassy contacts per country, plus historical climate per stop for the travel dates.
+    USE THIS instead of calling get_travel_warnings, get_entry_requirements, get_israeli_embassy_contacts
+    and get_place_climate separately for each country of a multi-destination trip.
+
+    Inputs:
+    - stops: stops in travel order, each {"city": str, "country_code": ISO alpha-2 code,
+             "arrival_date": "YYYY-MM-DD", "departure_date": "YYYY-MM-DD" (optional)}
+             e.g. [{"city": "Bangkok", "country_code": "TH", "arrival_date": "2025-02-01"}]
+    - passport_country_code: ISO alpha-2 code of the traveler's passport (default "IL")
+
+    Output:
+    - "stops": per stop, the climate for each month of the stay
+    - "countries": per country code, travel_warnings, entry (visa summary, link, mandatory registration)
+      and embassies
+    - "errors": lookups that failed (their sections are empty); fall back to the single-purpose tools for those
+
+    Information is best-effort and may change; users must verify with official sources.
+    """
+    return build_itinerary_briefing(_itinerary_stops(stops), passport_country_code=passport_country_code)
+
+
+@_with_coroutine(_aget_israeli_embassy_contacts)
 @tool
 def get_israeli_embassy_contacts(
     country: Optional[str] = None,
@@ -180,9 +447,13 @@ TRAVEL_TOOLS = [
     get_place_climate,
     travel_recommendations_tool,
     search_flights_tool,
+    search_flight_matrix_tool,
     get_current_time,
+    get_current_times_tool,
     get_current_local_datetime,
     get_travel_warnings,
     get_entry_requirements,
-    get_israeli_embassy_contacts
+    get_entry_requirements_batch_tool,
+    get_israeli_embassy_contacts,
+    itinerary_briefing_tool,
 ]
\ No newline at end of file
@@ -0,0 +1,124 @@
+from __future__ import annotations
+import argparse
+import json
+import math
+import random
+import timeit
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict
+from app.domain.climate_stats import aggregate_monthly, np
+
+"""
+Micro-benchmark: climate aggregation engine vs the original per-row loop.
+
+Record a real ERA5 payload once (the same request the climate tool makes) and pass it with --payload:
+    curl -o era5_paris.json "https://archive-api.open-meteo.com/v1/era5?latitude=48.75&longitude=2.25\
+&start_date=2010-01-01&end_date=2020-12-31&daily=temperature_2m_mean,precipitation_sum&timezone=UTC"
+    python -m benchmarks.bench_climate_aggregation --payload era5_paris.json
+
+Without --payload, a deterministic payload of the same shape (2010-2020, ~4,000 days, 1% gaps) is generated.
+"""
+
+# ------------------------------------------------------------
+# Reference implementation (before the aggregation engine)
+# ------------------------------------------------------------
+
+def legacy_aggregate_month(data: Dict[str, Any], month_num: int) -> Dict[str, float]:
+    dates = data["daily"]["time"]
+    temps = data["daily"]["temperature_2m_mean"]
+    rain = data["daily"]["precipitation_sum"]
+
+    month_temps = []
+    rain_by_year = defaultdict(float)
+
+    for d, t, r in zip(dates, temps, rain):
+        dt = datetime.fromisoformat(d)
+        if dt.month == month_num:
+            month_temps.append(t)
+            rain_by_year[dt.year] += r
+
+    return {
+        "average_temperature_c": round(sum(month_temps) / len(month_temps), 1),
+        "average_precipitation_mm": round(sum(rain_by_year.values()) / len(rain_by_year), 1),
+    }
+
+# ------------------------------------------------------------
+# Payload
+# ------------------------------------------------------------
+
+def synthetic_payload(seed: int = 7) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    start, end = date(2010, 1, 1), date(2020, 12, 31)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    def seasonal(d: date) -> float:
+        return 12 + 8 * math.sin(2 * math.pi * (d.timetuple().tm_yday - 110) / 365)
+
+    return {
+        "daily": {
+            "time": [d.isoformat() for d in days],
+            "temperature_2m_mean": [
+                None if rng.random() < 0.01 else round(seasonal(d) + rng.gauss(0, 3), 1) for d in days
+            ],
+            "precipitation_sum": [
+                None if rng.random() < 0.01 else round(max(0.0, rng.gauss(0.5, 3)), 1) for d in days
+            ],
+        }
+    }
+
+
+def _without_gaps(data: Dict[str, Any]) -> Dict[str, Any]:
+    # The legacy loop cannot handle None gaps, so it runs on a gap-filled copy
+    daily = data["daily"]
+    return {
+        "daily": {
+            "time": daily["time"],
+            "temperature_2m_mean": [0.0 if v is None else v for v in daily["temperature_2m_mean"]],
+            "precipitation_sum": [0.0 if v is None else v for v in daily["precipitation_sum"]],
+        }
+    }
+
+# ------------------------------------------------------------
+# Runner
+# ------------------------------------------------------------
+
+def _best_ms(func, repeat: int, number: int) -> float:
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payload", help="Path to a recorded Open-Meteo ERA5 JSON response")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        data = synthetic_payload()
+
+    legacy_data = _without_gaps(data)
+    rows = len(data["daily"]["time"])
+
+    cases = {
+        "legacy loop, 1 month": lambda: legacy_aggregate_month(legacy_data, 5),
+        "legacy loop, 12 months": lambda: [legacy_aggregate_month(legacy_data, m) for m in range(1, 13)],
+        "engine (python), 12 months": lambda: aggregate_monthly(data["daily"], use_numpy=False),
+    }
+    if np is not None:
+        cases["engine (numpy), 12 months"] = lambda: aggregate_monthly(data["daily"], use_numpy=True)
+
+    print(f"payload: {args.payload or 'synthetic'} ({rows} daily rows)")
+    timings = {name: _best_ms(func, args.repeat, args.number) for name, func in cases.items()}
+
+    # Speedup is against answering all 12 months with the legacy loop
+    baseline = timings["legacy loop, 12 months"]
+    for name, ms in timings.items():
+        print(f"{name:<30} {ms:8.3f} ms   x{baseline / ms:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
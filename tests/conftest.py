@@ -0,0 +1,26 @@
+import pytest
+from app.infrastructure.rate_limit import reset_limiters
+from app.infrastructure.resilience import reset_resilience_state
+from app.nodes import pre_router
+
+
+@pytest.fixture(autouse=True)
+def fresh_http_resilience():
+    """
+    Circuit breakers, latency samples and rate limiters are process-wide;
+    start every test from a clean state so failures in one test cannot open a circuit for the next.
+    """
+    reset_resilience_state()
+    reset_limiters()
+    yield
+    reset_resilience_state()
+    reset_limiters()
+
+
+@pytest.fixture(autouse=True)
+def isolated_router_decisions(monkeypatch, tmp_path):
+    """
+    Routing decisions recorded by any test go to a temporary log, never to the cache directory.
+    """
+    monkeypatch.setattr(pre_router, "DECISIONS_PATH", tmp_path / "router_decisions.jsonl")
+    monkeypatch.setattr(pre_router, "_CLASSIFIER", None)
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+import pytest
+from app.domain import climate, climate_normals
+from app.domain.climate_normals import ClimateNormalsStore, compute_monthly_normals, grid_cell
+
+
+def _payload(years=(2010, 2011)):
+    start, end = date(years[0], 1, 1), date(years[-1], 12, 31)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return {
+        "daily": {
+            "time": [d.isoformat() for d in days],
+            "temperature_2m_mean": [float(d.month) for d in days],
+            "precipitation_sum": [1.0 for _ in days],
+        }
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ClimateNormalsStore(path=tmp_path / "normals.sqlite3")
+    yield s
+    s.close()
+
+
+def test_compute_monthly_normals_covers_all_months_in_one_pass():
+    normals = compute_monthly_normals(_payload())
+
+    assert sorted(normals) == list(range(1, 13))
+    assert normals[5]["average_temperature_c"] == 5.0
+    assert normals[5]["average_precipitation_mm"] == 31.0
+    assert normals[2]["average_precipitation_mm"] == 28.0
+
+
+def test_compute_monthly_normals_skips_missing_values():
+    data = _payload()
+    data["daily"]["temperature_2m_mean"][0] = None
+    data["daily"]["precipitation_sum"][0] = None
+
+    assert compute_monthly_normals(data)[1]["average_temperature_c"] == 1.0
+
+
+def test_grid_cell_snaps_nearby_points_together():
+    assert grid_cell(48.8534, 2.3488) == grid_cell(48.86, 2.30) == (48.75, 2.25)
+
+
+def test_store_persists_normals(tmp_path, store):
+    store.put((48.75, 2.25), {5: {"average_temperature_c": 15.2, "average_precipitation_mm": 70.1}})
+    store.close()
+
+    reopened = ClimateNormalsStore(path=tmp_path / "normals.sqlite3")
+    try:
+        assert reopened.get((48.75, 2.25))[5]["average_temperature_c"] == 15.2
+        assert reopened.get((0.0, 0.0)) is None
+    finally:
+        reopened.close()
+
+
+def test_fetch_monthly_climate_downloads_once_per_cell(monkeypatch, store):
+    calls = []
+
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return _payload()
+
+    def fake_get(url, **kwargs):
+        calls.append(kwargs["params"])
+        return FakeResponse()
+
+    monkeypatch.setattr(climate_normals, "_normals_store", store)
+    monkeypatch.setattr(climate, "http_get", fake_get)
+
+    may = climate._fetch_monthly_climate(48.8534, 2.3488, 5)
+    december = climate._fetch_monthly_climate(48.86, 2.30, 12)
+
+    assert may["average_temperature_c"] == 5.0
+    assert december["average_temperature_c"] == 12.0
+    assert len(calls) == 1
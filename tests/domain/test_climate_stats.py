@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+import pytest
+from app.domain.climate_stats import aggregate_monthly
+
+
+def _daily(years=(2010, 2011)):
+    start, end = date(years[0], 1, 1), date(years[-1], 12, 31)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return {
+        "time": [d.isoformat() for d in days],
+        # May 2010 averages 14.0, May 2011 averages 16.0
+        "temperature_2m_mean": [float(d.month) + (2.0 if d.year == 2011 else 0.0) + 9.0 * (d.month == 5) for d in days],
+        # every other day is rainy
+        "precipitation_sum": [2.0 if d.day % 2 else 0.0 for d in days],
+    }
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_aggregate_monthly_statistics(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+
+    may = aggregate_monthly(_daily(), use_numpy=use_numpy)[5]
+
+    assert may["average_temperature_c"] == 15.0
+    assert may["min_temperature_c"] == 14.0
+    assert may["max_temperature_c"] == 16.0
+    assert may["temperature_p10_c"] == 14.0
+    assert may["temperature_p90_c"] == 16.0
+    assert may["average_rainy_days"] == 16.0
+    assert may["average_precipitation_mm"] == 32.0
+    assert may["temperature_yoy_variance"] == 1.0
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_aggregate_monthly_masks_missing_values(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+
+    daily = _daily()
+    daily["temperature_2m_mean"][:31] = [None] * 31  # January 2010
+    daily["precipitation_sum"][0] = None
+
+    result = aggregate_monthly(daily, use_numpy=use_numpy)
+
+    assert result[1]["average_temperature_c"] == 3.0  # only January 2011 remains
+    assert result[1]["temperature_yoy_variance"] == 0.0
+
+
+def test_numpy_and_python_paths_agree():
+    pytest.importorskip("numpy")
+    daily = _daily((2010, 2011, 2012))
+    daily["precipitation_sum"][100] = None
+
+    assert aggregate_monthly(daily, use_numpy=True) == aggregate_monthly(daily, use_numpy=False)
+
+
+def test_empty_series_returns_no_months():
+    assert aggregate_monthly({"time": [], "temperature_2m_mean": [], "precipitation_sum": []}) == {}
@@ -76,3 +76,65 @@ def test_get_visa_requirements_both_codes_unknown():
     # Still returns normalized structure
     assert "visa" in result
     assert isinstance(result["visa"], dict)
+
+
+def _raw(passport, destination):
+    return {
+        "data": {
+            "passport": {"code": passport},
+            "destination": {"code": destination},
+            "visa_rules": {"primary_rule": {"name": "Visa-free", "duration": "30 days"}},
+        }
+    }
+
+
+def _isolated(monkeypatch, tmp_path):
+    from app.domain import entry_requirements
+    from app.domain.visa_matrix import VisaMatrix
+
+    matrix = VisaMatrix(path=tmp_path / "visa.sqlite3")
+    monkeypatch.setattr(entry_requirements, "get_visa_matrix", lambda: matrix)
+
+    calls = []
+
+    def fake_fetch(passport, destination):
+        calls.append((passport, destination))
+        if destination == "ZZ":
+            raise entry_requirements.VisaServiceError("Failed to fetch visa requirements")
+        return _raw(passport, destination)
+
+    monkeypatch.setattr(entry_requirements, "_fetch_raw", fake_fetch)
+    return entry_requirements, calls
+
+
+def test_repeat_lookup_is_served_from_the_matrix(monkeypatch, tmp_path):
+    entry_requirements, calls = _isolated(monkeypatch, tmp_path)
+
+    first = entry_requirements.get_visa_requirements("IL", "TH")
+    second = entry_requirements.get_visa_requirements("il", "th")
+
+    assert first == second
+    assert second["visa"]["summary"] == "Visa-free – 30 days"
+    assert calls == [("IL", "TH")]
+
+
+def test_batch_lookup_reports_failures_per_destination(monkeypatch, tmp_path):
+    entry_requirements, calls = _isolated(monkeypatch, tmp_path)
+    entry_requirements.get_visa_requirements("IL", "TH")
+
+    result = entry_requirements.get_visa_requirements_batch("IL", ["TH", "vn", "ZZ", "VN"])
+
+    assert list(result) == ["TH", "VN", "ZZ"]
+    assert result["VN"]["destination"] == {"code": "VN"}
+    assert "error" in result["ZZ"]
+    assert sorted(calls) == [("IL", "TH"), ("IL", "VN"), ("IL", "ZZ")]
+
+
+def test_prewarm_fills_missing_pairs_within_budget(monkeypatch, tmp_path):
+    entry_requirements, calls = _isolated(monkeypatch, tmp_path)
+    entry_requirements.get_visa_requirements("IL", "TH")
+
+    summary = entry_requirements.prewarm_visa_matrix(["IL"], ["TH", "VN", "JP", "IL"], max_calls=1)
+
+    assert summary == {"pending": 2, "fetched": 1, "failed": 0}
+    assert len(calls) == 2
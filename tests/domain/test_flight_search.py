@@ -51,3 +51,197 @@ def test_search_flights_invalid_departure_date_raises_domain_error():
             destination="CDG",
             departure_date="not-a-date",  # type: ignore
         )
+
+
+# ============================================================
+# Offer model & ranking (offline)
+# ============================================================
+
+def _raw_offer(offer_id, price, duration, departures):
+    return {
+        "id": offer_id,
+        "price": {"total": price, "currency": "EUR"},
+        "itineraries": [{
+            "duration": duration,
+            "segments": [
+                {
+                    "departure": {"iataCode": "TLV", "at": at},
+                    "arrival": {"iataCode": "ATH", "at": at},
+                    "carrierCode": "A3",
+                    "number": str(n),
+                }
+                for n, at in enumerate(departures)
+            ],
+        }],
+    }
+
+
+RAW_OFFERS = [
+    _raw_offer("cheap-slow", "120.00", "PT9H10M", ["2030-05-01T06:00:00", "2030-05-01T11:00:00"]),
+    _raw_offer("direct", "180.50", "PT2H", ["2030-05-01T14:30:00"]),
+    _raw_offer("late", "150.00", "PT2H5M", ["2030-05-01T22:00:00"]),
+]
+
+
+def test_parse_offers_keeps_normalized_shape():
+    from app.domain.flight_search import _normalize_offers, _parse_offers
+
+    offer = _parse_offers(RAW_OFFERS)[0]
+    assert offer.duration_minutes == 550
+    assert offer.stops == 1
+    assert not hasattr(offer, "__dict__")
+
+    normalized = _normalize_offers(RAW_OFFERS)[1]
+    assert normalized["total_price"] == "180.50"
+    assert normalized["segments"][0]["flight_number"] == "0"
+
+
+def test_rank_offers_sorts_and_filters():
+    from datetime import time
+    from app.domain.flight_search import _parse_offers, rank_offers
+
+    offers = _parse_offers(RAW_OFFERS)
+
+    assert [o.id for o in rank_offers(offers)] == ["cheap-slow", "late", "direct"]
+    assert [o.id for o in rank_offers(offers, sort_by="duration")] == ["direct", "late", "cheap-slow"]
+    assert [o.id for o in rank_offers(offers, max_stops=0)] == ["late", "direct"]
+    assert [o.id for o in rank_offers(offers, depart_after=time(8), depart_before=time(20))] == ["direct"]
+
+    with pytest.raises(FlightSearchError):
+        rank_offers(offers, sort_by="comfort")
+
+
+def test_search_flights_compact_top_n(monkeypatch):
+    from app.domain import flight_search
+
+    monkeypatch.setattr(flight_search, "_fetch_flight_offers", lambda **kwargs: RAW_OFFERS)
+
+    result = flight_search.search_flights("TLV", "ATH", date(2030, 5, 1), sort_by="stops", top_n=1, compact=True)
+
+    assert result == [{
+        "id": "late",
+        "price": "150.00 EUR",
+        "duration": "2h 05m",
+        "stops": 0,
+        "route": "TLV-ATH",
+        "departure": "2030-05-01T22:00:00",
+        "arrival": "2030-05-01T22:00:00",
+        "flights": "A30",
+    }]
+
+
+# ============================================================
+# Batch search (offline: search_flight_offers is faked)
+# ============================================================
+
+def _offer(price, departure_date, carrier="A3", number="1"):
+    from app.domain.flight_search import FlightOffer, FlightSegment
+
+    at = f"{departure_date.isoformat()}T08:00:00"
+    return FlightOffer(
+        id="x",
+        price=float(price),
+        currency="EUR",
+        duration_minutes=120,
+        duration="PT2H",
+        segments=(FlightSegment("TLV", "ATH", at, at, carrier, number),),
+    )
+
+
+@pytest.fixture
+def fake_offers(monkeypatch):
+    from app.domain import flight_search
+
+    calls = []
+
+    def fake_search_flight_offers(origin, destination, departure_date, **kwargs):
+        calls.append((origin, destination, departure_date))
+        if destination == "SKG":
+            raise FlightSearchError("upstream failed")
+        # Same itinerary for both origins -> de-duplicated in "cheapest"
+        return [_offer(100 + departure_date.day, departure_date), _offer(300, date(2030, 5, 1), "LY", "2")]
+
+    async def fake_asearch_flight_offers(**kwargs):
+        return fake_search_flight_offers(**kwargs)
+
+    monkeypatch.setattr(flight_search, "search_flight_offers", fake_search_flight_offers)
+    monkeypatch.setattr(flight_search, "asearch_flight_offers", fake_asearch_flight_offers)
+    return calls
+
+
+def test_search_flight_matrix_builds_price_matrix(fake_offers):
+    from app.domain.flight_search import search_flight_matrix
+
+    result = search_flight_matrix(
+        [" tlv", "TLV", "ETM"], ["ATH", "SKG"], date(2030, 5, 1), date(2030, 5, 2),
+    )
+
+    assert result["searches"] == 8 == len(fake_offers)
+    assert result["currency"] == "EUR"
+    assert result["prices"]["TLV-ATH"] == {"2030-05-01": 101.0, "2030-05-02": 102.0}
+    assert result["prices"]["ETM-SKG"] == {"2030-05-01": None, "2030-05-02": None}
+    assert len(result["failed"]) == 4
+    assert [o["price"] for o in result["cheapest"]] == ["101.00 EUR", "102.00 EUR", "300.00 EUR"]
+
+
+def test_search_flight_matrix_rejects_too_many_combinations(fake_offers, monkeypatch):
+    from app.domain import flight_search
+
+    monkeypatch.setattr(flight_search.settings, "FLIGHT_MATRIX_MAX_QUERIES", 3)
+
+    with pytest.raises(FlightSearchError):
+        flight_search.search_flight_matrix(["TLV"], ["ATH"], date(2030, 5, 1), date(2030, 5, 4))
+    assert fake_offers == []
+
+
+def test_asearch_flight_matrix_matches_sync(fake_offers):
+    import asyncio
+    from app.domain import flight_search
+
+    args = (["TLV"], ["ATH", "SKG"], date(2030, 5, 1))
+
+    assert asyncio.run(flight_search.asearch_flight_matrix(*args, trip_length_days=7)) == \
+        flight_search.search_flight_matrix(*args, trip_length_days=7)
+
+
+@pytest.mark.parametrize("error", [
+    {"error": "Amadeus temporarily unavailable", "details": "rate limit exceeded"},
+    {"error": "Amadeus API error", "status_code": 500, "details": "internal"},
+])
+def test_search_flight_matrix_reports_client_errors_as_failed(monkeypatch, error):
+    from app.domain import flight_search
+
+    class FakeClient:
+        def get(self, path, params):
+            return error if params["destinationLocationCode"] == "SKG" else {"data": []}
+
+    monkeypatch.setattr(flight_search, "get_amadeus_client", lambda: FakeClient())
+
+    result = flight_search.search_flight_matrix(["TLV"], ["ATH", "SKG"], date(2030, 5, 1))
+
+    assert result["failed"] == ["TLV-SKG 2030-05-01"]
+    assert result["prices"] == {"TLV-ATH": {"2030-05-01": None}, "TLV-SKG": {"2030-05-01": None}}
+
+
+def test_rejected_query_has_no_offers():
+    from app.domain.flight_search import _offers_from
+
+    assert _offers_from({"error": "Amadeus API error", "status_code": 400, "details": "INVALID FORMAT"}) == []
+
+
+def test_every_offer_search_pins_the_currency(monkeypatch):
+    from app.domain import flight_search
+
+    requested = []
+
+    class FakeClient:
+        def get(self, path, params):
+            requested.append(params["currencyCode"])
+            return {"data": []}
+
+    monkeypatch.setattr(flight_search, "get_amadeus_client", lambda: FakeClient())
+    monkeypatch.setattr(flight_search.settings, "FLIGHT_CURRENCY_CODE", "USD")
+
+    flight_search.search_flight_matrix(["TLV", "ETM"], ["ATH"], date(2030, 5, 1), date(2030, 5, 2))
+
+    assert requested == ["USD"] * 4
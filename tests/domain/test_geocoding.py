@@ -0,0 +1,83 @@
+import pytest
+from app.domain import climate, geocoding
+from app.domain.geocoding import GeocodeIndex, normalize_place_name
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = GeocodeIndex(index_path=tmp_path / "geocode.sqlite3")
+    yield idx
+    idx.close()
+
+
+def test_normalize_place_name_strips_case_accents_and_punctuation():
+    assert normalize_place_name("  São-Paulo ") == "sao paulo"
+    assert normalize_place_name("ZÜRICH") == "zurich"
+
+
+def test_gazetteer_resolves_major_city_and_alias(index):
+    paris = index.lookup("paris")
+    nyc = index.lookup("NYC")
+
+    assert paris["country"] == "France"
+    assert nyc["name"] == "New York"
+
+
+def test_fuzzy_match_and_country_filter(index):
+    assert index.lookup("Barcelonna")["name"] == "Barcelona"
+    assert index.lookup("Paris, France")["country_code"] == "FR"
+    assert index.lookup("Paris", country_code="US") is None
+    assert index.lookup("ThisCityDoesNotExist") is None
+
+
+def test_remembered_places_persist_across_instances(tmp_path):
+    path = tmp_path / "geocode.sqlite3"
+    first = GeocodeIndex(index_path=path)
+    first.remember("Hallstatt", {
+        "name": "Hallstatt", "country": "Austria", "country_code": "AT",
+        "latitude": 47.5622, "longitude": 13.6493,
+    })
+    first.close()
+
+    second = GeocodeIndex(index_path=path)
+    try:
+        assert second.lookup("hallstatt")["country"] == "Austria"
+    finally:
+        second.close()
+
+
+def test_climate_geocode_skips_network_for_known_places(monkeypatch, index):
+    monkeypatch.setattr(geocoding, "_geocode_index", index)
+    monkeypatch.setattr(climate, "http_get", lambda *a, **k: pytest.fail("network call"))
+
+    assert climate._geocode("Dublin")["country"] == "Ireland"
+
+
+PARIS_TEXAS = {
+    "name": "Paris", "country": "United States", "country_code": "US",
+    "latitude": 33.66, "longitude": -95.55,
+}
+
+
+def test_country_filtered_result_does_not_answer_bare_name(tmp_path):
+    path = tmp_path / "geocode.sqlite3"
+    first = GeocodeIndex(index_path=path)
+    first.remember("Paris", PARIS_TEXAS, country_code="US")
+
+    assert first.lookup("Paris", country_code="US")["country_code"] == "US"
+    assert first.lookup("Paris")["country_code"] == "FR"
+    first.close()
+
+    second = GeocodeIndex(index_path=path)
+    try:
+        assert second.lookup("Paris")["country_code"] == "FR"
+        assert second.lookup("Paris", country_code="US")["latitude"] == 33.66
+    finally:
+        second.close()
+
+
+def test_hinted_result_does_not_answer_bare_name(index):
+    index.remember("Springfield, US", {**PARIS_TEXAS, "name": "Springfield"})
+
+    assert index.lookup("Springfield, US")["country_code"] == "US"
+    assert index.lookup("Springfield") is None
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import date
+import pytest
+from app.domain import itinerary
+from app.domain.itinerary import ItineraryError, ItineraryStop, build_itinerary_briefing, abuild_itinerary_briefing
+
+
+STOPS = [
+    ItineraryStop("Bangkok", "th", date(2025, 1, 28), date(2025, 2, 3)),
+    ItineraryStop("Chiang Mai", "TH", date(2025, 2, 3)),
+    ItineraryStop("Hanoi", "VN", date(2025, 2, 10)),
+]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def warnings(country):
+        calls.append(("warnings", country))
+        return {"Exercise caution"}
+
+    def visa(passport, destination):
+        calls.append(("visa", passport, destination))
+        if destination == "VN":
+            raise itinerary.VisaServiceError("Failed to fetch visa requirements")
+        return {"visa": {"summary": "Visa-free – 30 days", "primary_rule": {"link": None}}, "mandatory_registration": None}
+
+    def embassies(country):
+        calls.append(("embassies", country))
+        return [{"city": "Bangkok", "type": "Embassy", "phone": "+66", "email": "a@b", "address": "x"}]
+
+    def climate(city, month):
+        calls.append(("climate", city, month))
+        return {"month": f"M{month}", "average_temperature_c": 27.0, "average_precipitation_mm": 10.0}
+
+    async def aembassies(country):
+        return embassies(country)
+
+    async def avisa(passport, destination):
+        return visa(passport, destination)
+
+    async def aclimate(city, month):
+        return climate(city, month)
+
+    monkeypatch.setattr(itinerary, "fetch_travel_warnings", warnings)
+    monkeypatch.setattr(itinerary, "get_visa_requirements", visa)
+    monkeypatch.setattr(itinerary, "get_israeli_embassies", embassies)
+    monkeypatch.setattr(itinerary, "fetch_climate_data", climate)
+    monkeypatch.setattr(itinerary, "aget_visa_requirements", avisa)
+    monkeypatch.setattr(itinerary, "aget_israeli_embassies", aembassies)
+    monkeypatch.setattr(itinerary, "afetch_climate_data", aclimate)
+    return calls
+
+
+def test_briefing_looks_up_each_country_once(calls):
+    briefing = build_itinerary_briefing(STOPS, "il")
+
+    assert briefing["passport"] == "IL"
+    assert list(briefing["countries"]) == ["TH", "VN"]
+    assert sum(1 for c in calls if c[0] == "visa") == 2
+    assert ("warnings", "Thailand") in calls and ("embassies", "Vietnam") in calls
+
+    thailand = briefing["countries"]["TH"]
+    assert thailand["travel_warnings"] == ["Exercise caution"]
+    assert thailand["entry"] == {"visa": "Visa-free – 30 days", "link": None, "mandatory_registration": None}
+    assert thailand["embassies"] == [{"city": "Bangkok", "type": "Embassy", "phone": "+66", "email": "a@b"}]
+
+
+def test_climate_covers_every_month_of_a_stay(calls):
+    briefing = build_itinerary_briefing(STOPS)
+
+    bangkok = briefing["stops"][0]
+    assert [c["month"] for c in bangkok["climate"]] == ["M1", "M2"]
+    assert "average_precipitation_mm" not in bangkok["climate"][0]
+    assert briefing["stops"][1]["departure_date"] is None
+
+
+def test_failed_lookup_is_reported_without_failing_the_briefing(calls):
+    briefing = build_itinerary_briefing(STOPS)
+
+    assert briefing["countries"]["VN"]["entry"] is None
+    assert briefing["countries"]["VN"]["travel_warnings"] == ["Exercise caution"]
+    assert briefing["errors"] == ["entry (VN): Failed to fetch visa requirements"]
+
+
+def test_async_briefing_matches_sync(calls):
+    assert asyncio.run(abuild_itinerary_briefing(STOPS)) == build_itinerary_briefing(STOPS)
+
+
+def test_rejects_invalid_itineraries(monkeypatch):
+    monkeypatch.setattr(itinerary.settings, "ITINERARY_MAX_STOPS", 2)
+
+    with pytest.raises(ItineraryError):
+        build_itinerary_briefing([])
+    with pytest.raises(ItineraryError):
+        build_itinerary_briefing(STOPS)
+    with pytest.raises(ItineraryError):
+        build_itinerary_briefing([ItineraryStop("Rome", "IT", date(2025, 5, 2), date(2025, 5, 1))])
@@ -17,7 +17,7 @@ def test_get_current_time_invalid_format_raises():
 
 def test_get_current_time_unknown_timezone_raises():
     """
-    Valid format but unknown timezone is rejected by the API.
+    Valid format but unknown timezone is rejected (not in tzdata).
     """
     with pytest.raises(WorldTimeServiceError):
         get_current_time_by_timezone("Invalid/Timezone")
@@ -25,11 +25,74 @@ def test_get_current_time_unknown_timezone_raises():
 
 def test_get_current_time_valid_timezone_returns_dict():
     """
-    Valid timezone returns current time data,
-    assuming WorldTimeAPI is reachable.
+    Valid timezone returns current time data, computed locally.
     """
     result = get_current_time_by_timezone("Europe/London")
 
     assert isinstance(result, dict)
     assert "datetime" in result
-    assert "timezone" in result
\ No newline at end of file
+    assert "timezone" in result
+
+def test_local_time_matches_worldtimeapi_schema_during_dst():
+    from datetime import datetime, timezone
+    from app.domain.timezone_service import _local_time_data
+
+    now = datetime(2024, 7, 1, 12, 0, tzinfo=timezone.utc)
+    result = _local_time_data("Europe/London", now)
+
+    assert result["abbreviation"] == "BST"
+    assert result["datetime"] == "2024-07-01T13:00:00+01:00"
+    assert result["utc_offset"] == "+01:00"
+    assert result["dst"] is True
+    assert result["dst_offset"] == 3600
+    assert result["raw_offset"] == 0
+    assert result["dst_from"] == "2024-03-31T01:00:00+00:00"
+    assert result["dst_until"] == "2024-10-27T01:00:00+00:00"
+    assert result["day_of_week"] == 1  # Monday (0 = Sunday)
+    assert result["day_of_year"] == 183
+    assert result["week_number"] == 27
+    assert result["unixtime"] == int(now.timestamp())
+
+
+def test_local_time_southern_hemisphere_and_no_dst():
+    from datetime import datetime, timezone
+    from app.domain.timezone_service import _local_time_data
+
+    now = datetime(2024, 1, 15, 0, 0, tzinfo=timezone.utc)
+
+    sydney = _local_time_data("Australia/Sydney", now)
+    assert sydney["dst"] is True
+    assert sydney["utc_offset"] == "+11:00"
+    assert sydney["dst_from"] == "2023-09-30T16:00:00+00:00"
+    assert sydney["dst_until"] == "2024-04-06T16:00:00+00:00"
+
+    kolkata = _local_time_data("Asia/Kolkata", now)
+    assert kolkata["dst"] is False
+    assert kolkata["utc_offset"] == "+05:30"
+    assert kolkata["dst_from"] is None and kolkata["dst_until"] is None
+
+
+def test_get_current_times_batch_reports_errors_per_zone():
+    from app.domain.timezone_service import get_current_times
+
+    result = get_current_times(["Asia/Tokyo", "Invalid/Timezone", "UTC"])
+
+    assert list(result) == ["Asia/Tokyo", "Invalid/Timezone", "UTC"]
+    assert result["Asia/Tokyo"]["utc_offset"] == "+09:00"
+    assert "error" in result["Invalid/Timezone"]
+    assert "error" in result["UTC"]
+
+
+def test_cross_check_logs_mismatch_and_keeps_local_result(monkeypatch, caplog):
+    from app.domain import timezone_service
+
+    monkeypatch.setattr(timezone_service.settings, "TIMEZONE_REMOTE_CROSSCHECK", True)
+    monkeypatch.setattr(
+        timezone_service, "_fetch_time_data",
+        lambda tz: {"utc_offset": "+05:00", "dst": False, "abbreviation": "XXX"},
+    )
+
+    result = get_current_time_by_timezone("Asia/Tokyo")
+
+    assert result["utc_offset"] == "+09:00"
+    assert "disagrees with WorldTimeAPI" in caplog.text
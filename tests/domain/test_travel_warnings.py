@@ -1,4 +1,10 @@
-from app.domain.travel_warnings import fetch_travel_warnings
+import json
+import os
+import time
+import pytest
+from app.domain import travel_warnings
+from app.infrastructure import dataset_cache
+from app.domain.travel_warnings import build_country_index, fetch_travel_warnings, resolve_country
 
 
 def test_fetch_travel_warnings_known_country():
@@ -11,3 +17,95 @@ def test_fetch_travel_warnings_unknown_country():
     result = fetch_travel_warnings("Atlantis")
 
     assert result == set()
+
+
+
+def test_resolve_country_accepts_names_codes_and_aliases():
+    france = travel_warnings.COUNTRY_EN_TO_HE["france"]
+
+    assert resolve_country("France") == france
+    assert resolve_country("  FR ") == france
+    assert resolve_country("FRA") == france
+    assert resolve_country(france) == france
+    assert resolve_country("U.S.A.") == resolve_country("United States of America") == resolve_country("US")
+    assert resolve_country("The Netherlands") == resolve_country("Holland")
+    assert resolve_country("Türkiye") == resolve_country("turkey")
+    assert resolve_country("Atlantis") is None
+
+
+def test_build_country_index_groups_recommendations():
+    records = [
+        {"country": "צרפת", "recommendations": "a"},
+        {"country": "צרפת", "recommendations": "b"},
+        {"country": "צרפת", "recommendations": "a"},
+        {"country": "ספרד", "recommendations": ""},
+    ]
+
+    assert build_country_index(records) == {"צרפת": frozenset({"a", "b"})}
+
+
+def test_fetch_travel_warnings_uses_index(monkeypatch):
+    hebrew = travel_warnings.COUNTRY_EN_TO_HE["japan"]
+    warnings = travel_warnings._Warnings([], {hebrew: frozenset({"Exercise caution"})})
+    monkeypatch.setattr(travel_warnings, "_get_warnings", lambda: warnings)
+
+    assert travel_warnings.fetch_travel_warnings("JP") == {"Exercise caution"}
+    assert travel_warnings.fetch_travel_warnings("Atlantis") == set()
+
+
+# ============================================================
+# Lazy loading
+# ============================================================
+
+@pytest.fixture
+def isolated_dataset(monkeypatch, tmp_path):
+    cache_file = tmp_path / "travel_warnings_cache.json"
+    monkeypatch.setattr(dataset_cache, "_REGISTRY", {})
+    monkeypatch.setattr(travel_warnings, "_DATASET", dataset_cache.DatasetCache(
+        "travel_warnings",
+        cache_file,
+        travel_warnings.CACHE_TTL.total_seconds(),
+        fetch=lambda: travel_warnings.fetch_travel_warnings_from_api(),
+        prepare=travel_warnings._prepare,
+    ))
+    return cache_file
+
+
+def test_first_use_loads_from_cache_without_network(monkeypatch, isolated_dataset):
+    hebrew = travel_warnings.COUNTRY_EN_TO_HE["france"]
+    isolated_dataset.write_text(json.dumps([{"country": hebrew, "recommendations": "Stay alert"}]), encoding="utf-8")
+    monkeypatch.setattr(travel_warnings, "fetch_travel_warnings_from_api", lambda: pytest.fail("network call"))
+
+    assert fetch_travel_warnings("France") == {"Stay alert"}
+
+
+def test_stale_cache_is_served_while_refreshing_in_background(monkeypatch, isolated_dataset):
+    hebrew = travel_warnings.COUNTRY_EN_TO_HE["france"]
+    isolated_dataset.write_text(json.dumps([{"country": hebrew, "recommendations": "old"}]), encoding="utf-8")
+    two_days_ago = time.time() - 2 * 24 * 3600
+    os.utime(isolated_dataset, (two_days_ago, two_days_ago))
+
+    monkeypatch.setattr(
+        travel_warnings,
+        "fetch_travel_warnings_from_api",
+        lambda: [{"country": hebrew, "recommendations": "new"}],
+    )
+
+    assert fetch_travel_warnings("France") == {"old"}
+
+    deadline = time.time() + 2
+    while fetch_travel_warnings("France") != {"new"} and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert fetch_travel_warnings("France") == {"new"}
+    assert "new" in isolated_dataset.read_text(encoding="utf-8")
+
+
+def test_missing_cache_and_api_failure_raises_domain_error(monkeypatch, isolated_dataset):
+    def fail():
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(travel_warnings, "fetch_travel_warnings_from_api", fail)
+
+    with pytest.raises(travel_warnings.TravelWarningsServiceError):
+        fetch_travel_warnings("France")
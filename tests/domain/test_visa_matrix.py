@@ -0,0 +1,51 @@
+import time
+from app.domain.visa_matrix import VisaMatrix
+
+
+RULES = {"passport": {"code": "IL"}, "destination": {"code": "TH"}, "visa": {"summary": "Visa-free – 30 days"}}
+
+
+def test_put_and_get_survive_a_new_process(tmp_path):
+    path = tmp_path / "visa.sqlite3"
+    VisaMatrix(path=path).put("il", " th ", RULES)
+
+    assert VisaMatrix(path=path).get("IL", "TH") == RULES
+
+
+def test_returned_rules_are_copies(tmp_path):
+    matrix = VisaMatrix(path=tmp_path / "visa.sqlite3")
+    matrix.put("IL", "TH", RULES)
+
+    matrix.get("IL", "TH")["visa"]["summary"] = "changed"
+
+    assert matrix.get("IL", "TH")["visa"]["summary"] == "Visa-free – 30 days"
+
+
+def test_expired_and_other_version_entries_are_misses(tmp_path):
+    path = tmp_path / "visa.sqlite3"
+    VisaMatrix(path=path, version="1").put("IL", "TH", RULES)
+
+    assert VisaMatrix(path=path, version="2").get("IL", "TH") is None
+    assert VisaMatrix(path=path, version="1", ttl_seconds=0).get("IL", "TH") is None
+
+
+def test_sees_pairs_written_by_another_worker(tmp_path):
+    path = tmp_path / "visa.sqlite3"
+    reader = VisaMatrix(path=path)
+    assert reader.get("IL", "TH") is None
+
+    VisaMatrix(path=path).put("IL", "TH", RULES)
+
+    assert reader.get("IL", "TH") == RULES
+
+
+def test_stale_pairs_lists_missing_first_then_oldest(tmp_path, monkeypatch):
+    matrix = VisaMatrix(path=tmp_path / "visa.sqlite3", ttl_seconds=100)
+
+    now = time.time()
+    monkeypatch.setattr("app.domain.visa_matrix.time.time", lambda: now - 500)
+    matrix.put("IL", "FR", RULES)  # stale
+    monkeypatch.setattr("app.domain.visa_matrix.time.time", lambda: now)
+    matrix.put("IL", "TH", RULES)  # fresh
+
+    assert matrix.stale_pairs(["IL"], ["FR", "TH", "JP", "IL"]) == [("IL", "JP"), ("IL", "FR")]
@@ -167,3 +167,48 @@ def test_graph_off_topic_path(monkeypatch):
 
     assert result["route"] == "OFF_TOPIC"
     assert result["final_answer"] == "final answer"
+
+
+# ------------------------------------------------------------
+# PLAN path (speculative finalization)
+# ------------------------------------------------------------
+
+def test_graph_speculative_plan_streams_answer_before_verdict(monkeypatch):
+    import time
+
+    def slow_invalid_verifier(state: State) -> dict:
+        time.sleep(0.2)
+        return {"verified": False}
+
+    monkeypatch.setattr(
+        "app.graph.graph.build_summarization_node",
+        lambda: (lambda state: {}),
+    )
+    monkeypatch.setattr(
+        "app.graph.graph.router_node",
+        lambda state: {"route": "PLAN", "query": "plan trip"},
+    )
+    monkeypatch.setattr(
+        "app.graph.graph.executor_node",
+        lambda state: {"execution": "executed", "tools_used": True},
+    )
+    monkeypatch.setattr(
+        "app.graph.graph.verifier_node",
+        slow_invalid_verifier,
+    )
+
+    graph = build_graph(checkpointer=None, speculative=True)
+
+    order = []
+    for update in graph.stream({"messages": []}, stream_mode="updates"):
+        order.extend(update.keys())
+
+    assert order.index("speculative_finalizer") < order.index("verifier")
+    assert order[-1] == "annotate"
+
+    result = graph.invoke({"messages": []})
+
+    assert "could not be fully verified" in result["final_answer"]
+    # The annotation replaces the speculative message instead of appending another one
+    assert len(result["messages"]) == 1
+    assert result["messages"][0].content == result["final_answer"]
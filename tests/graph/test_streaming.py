@@ -0,0 +1,176 @@
+import asyncio
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from app.graph.graph import build_graph
+from app.graph import streaming
+from app.graph.streaming import StreamEvent, stream_graph, astream_graph
+
+"""Verify translation of graph stream output into typed events, using fake nodes and a fake streaming model."""
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def _patch_direct_graph(monkeypatch):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="Irish stew and soda bread")]))
+
+    def fake_router(state):
+        return {"route": "DIRECT", "query": "food"}
+
+    async def afake_router(state):
+        return fake_router(state)
+
+    def fake_direct(state):
+        return {"execution": model.invoke(state["messages"]).content, "tools_used": False}
+
+    async def afake_direct(state):
+        return {"execution": (await model.ainvoke(state["messages"])).content, "tools_used": False}
+
+    monkeypatch.setattr("app.graph.graph.build_summarization_node", lambda: (lambda state: {}))
+    monkeypatch.setattr("app.graph.graph.router_node", fake_router)
+    monkeypatch.setattr("app.graph.graph.arouter_node", afake_router)
+    monkeypatch.setattr("app.graph.graph.direct_node", fake_direct)
+    monkeypatch.setattr("app.graph.graph.adirect_node", afake_direct)
+
+
+# ------------------------------------------------------------
+# Graph-level streaming
+# ------------------------------------------------------------
+
+def test_stream_graph_yields_route_tokens_and_final(monkeypatch):
+    _patch_direct_graph(monkeypatch)
+    graph = build_graph(checkpointer=None)
+
+    events = list(stream_graph(graph, {"messages": [{"role": "user", "content": "food?"}]}))
+    types = [e.type for e in events]
+
+    assert types[0] == "route"
+    assert events[0].data == {"route": "DIRECT"}
+    assert "token" in types
+    assert types[-1] == "final"
+
+    streamed = "".join(e.data["text"] for e in events if e.type == "token")
+    assert streamed == "Irish stew and soda bread"
+    assert events[-1].data["warnings"]  # DIRECT answers are never grounded
+
+
+def test_astream_graph_matches_sync_events(monkeypatch):
+    _patch_direct_graph(monkeypatch)
+    graph = build_graph(checkpointer=None)
+
+    async def collect():
+        return [e async for e in astream_graph(graph, {"messages": [{"role": "user", "content": "food?"}]})]
+
+    events = asyncio.run(collect())
+
+    assert [e.type for e in events][0] == "route"
+    assert "".join(e.data["text"] for e in events if e.type == "token") == "Irish stew and soda bread"
+    assert events[-1].type == "final"
+
+
+# ------------------------------------------------------------
+# Event translation
+# ------------------------------------------------------------
+
+def test_subgraph_updates_produce_tool_events():
+    events = streaming._to_events(
+        ("executor:abc",),
+        "updates",
+        {
+            "model": {"messages": [AIMessage(
+                content="",
+                tool_calls=[{"name": "get_travel_warnings", "args": {"country": "Ireland"}, "id": "t1"}],
+            )]},
+        },
+    )
+    events += streaming._to_events(
+        ("executor:abc",),
+        "updates",
+        {"tools": {"messages": [ToolMessage(content="[]", name="get_travel_warnings", tool_call_id="t1")]}},
+    )
+
+    assert events == [
+        StreamEvent("tool_started", {"name": "get_travel_warnings", "args": {"country": "Ireland"}, "id": "t1"}),
+        StreamEvent("tool_finished", {"name": "get_travel_warnings", "id": "t1", "status": "success"}),
+    ]
+
+
+def test_router_tokens_are_not_answer_tokens():
+    from langchain_core.messages import AIMessageChunk
+
+    events = streaming._to_events(
+        (),
+        "messages",
+        (AIMessageChunk(content="PLAN"), {"langgraph_node": "router"}),
+    )
+
+    assert events == []
+
+
+def test_annotation_update_produces_verdict_event():
+    events = streaming._to_events((), "updates", {"annotate": {"annotation": "***warning***"}})
+
+    assert events == [StreamEvent("verdict", {"verified": False, "annotation": "***warning***"})]
+
+
+def test_executor_narration_before_tool_calls_is_retracted():
+    from langchain_core.messages import AIMessageChunk
+
+    step_text = []
+    namespace = ("executor:abc",)
+
+    def token(text):
+        return streaming._to_events(namespace, "messages", (AIMessageChunk(content=text), {}), step_text)
+
+    def step(message):
+        return streaming._to_events(namespace, "updates", {"model": {"messages": [message]}}, step_text)
+
+    events = token("Let me check ") + token("the warnings...")
+    events += step(AIMessage(content="Let me check the warnings...", tool_calls=[
+        {"name": "get_travel_warnings", "args": {"country": "Ireland"}, "id": "t1"},
+    ]))
+
+    assert [e.type for e in events] == ["token", "token", "retract", "tool_started"]
+    assert events[2].data == {"text": "Let me check the warnings...", "node": "executor"}
+
+
+def test_executor_final_step_streams_token_by_token():
+    from langchain_core.messages import AIMessageChunk
+
+    step_text = []
+    namespace = ("executor:abc",)
+    chunks = ["Day 1: ", "Dublin. ", "Day 2: ", "Galway."]
+
+    events = []
+    for text in chunks:
+        events += streaming._to_events(namespace, "messages", (AIMessageChunk(content=text), {}), step_text)
+    events += streaming._to_events(
+        namespace, "updates", {"model": {"messages": [AIMessage(content="".join(chunks))]}}, step_text,
+    )
+
+    assert events == [StreamEvent("token", {"text": text, "node": "executor"}) for text in chunks]
+
+
+def test_render_event_drops_retracted_narration_from_answer(capsys):
+    from app.main import render_event
+
+    streamed = render_event(StreamEvent("token", {"text": "Let me check...", "node": "executor"}), "")
+    streamed = render_event(StreamEvent("retract", {"text": "Let me check...", "node": "executor"}), streamed)
+    streamed = render_event(StreamEvent("token", {"text": "All clear.", "node": "executor"}), streamed)
+    render_event(StreamEvent("final", {"final_answer": "All clear.", "warnings": []}), streamed)
+
+    assert streamed == "All clear."
+    assert "[final answer]" not in capsys.readouterr().out
+
+
+def test_render_event_reprints_final_answer_that_differs_from_stream(capsys):
+    from app.main import render_event
+
+    streamed = render_event(StreamEvent("token", {"text": "Draft", "node": "direct"}), "")
+    render_event(StreamEvent("final", {"final_answer": "Corrected\n\n---\n***w***", "warnings": ["***w***"]}), streamed)
+    assert capsys.readouterr().out.endswith("Corrected\n\n---\n***w***\n")
+
+    streamed = render_event(StreamEvent("token", {"text": "Same", "node": "direct"}), "")
+    render_event(StreamEvent("final", {"final_answer": "Same\n\n---\n***w***", "warnings": ["***w***"]}), streamed)
+    assert capsys.readouterr().out == "Same\n\n---\n***w***\n"
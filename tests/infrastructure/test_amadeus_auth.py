@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.infrastructure import amadeus_auth
+from app.infrastructure.amadeus_auth import AmadeusAuth
+
+
+class FakeTokenResponse:
+    def __init__(self, token, expires_in):
+        self._payload = {"access_token": token, "expires_in": expires_in}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture
+def token_endpoint(monkeypatch):
+    """
+    Counts token fetches; each fetch returns token-1, token-2, ...
+    """
+    calls = []
+    lock = threading.Lock()
+
+    def fake_post(url, **kwargs):
+        time.sleep(0.05)  # let concurrent callers pile up
+        with lock:
+            calls.append(url)
+            return FakeTokenResponse(f"token-{len(calls)}", 1800)
+
+    monkeypatch.setattr(amadeus_auth, "http_post", fake_post)
+    return calls
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_concurrent_callers_share_one_fetch(token_endpoint):
+    auth = AmadeusAuth()
+    tokens = []
+
+    threads = [threading.Thread(target=lambda: tokens.append(auth.get_access_token())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert tokens == ["token-1"] * 8
+    assert len(token_endpoint) == 1
+
+
+def test_token_in_refresh_window_is_served_and_refreshed_in_background(token_endpoint):
+    auth = AmadeusAuth()
+    auth.get_access_token()
+    auth._refresh_at = time.time() - 1  # enter the refresh window
+
+    assert auth.get_access_token() == "token-1"
+    assert auth.get_access_token() == "token-1"
+    assert _wait_for(lambda: auth._access_token == "token-2")
+    assert len(token_endpoint) == 2
+
+
+def test_invalidate_ignores_already_replaced_tokens(token_endpoint):
+    auth = AmadeusAuth()
+    auth.get_access_token()
+
+    auth.invalidate("token-0")
+    assert auth.get_access_token() == "token-1"
+
+    auth.invalidate("token-1")
+    assert auth.get_access_token() == "token-2"
+
+
+def test_async_callers_share_one_fetch(token_endpoint):
+    auth = AmadeusAuth()
+
+    async def run():
+        return await asyncio.gather(*(auth.aget_access_token() for _ in range(5)))
+
+    assert asyncio.run(run()) == ["token-1"] * 5
+    assert len(token_endpoint) == 1
+    assert auth._refresh_at < auth._expires_at
+
+
+def test_sync_and_async_callers_share_one_fetch(token_endpoint):
+    auth = AmadeusAuth()
+    tokens = []
+
+    threads = [threading.Thread(target=lambda: tokens.append(auth.get_access_token())) for _ in range(3)]
+    for t in threads:
+        t.start()
+    tokens.append(asyncio.run(auth.aget_access_token()))
+    for t in threads:
+        t.join()
+
+    assert tokens == ["token-1"] * 4
+    assert len(token_endpoint) == 1
@@ -1,4 +1,5 @@
 import pytest
+from app.config.settings import settings
 from app.infrastructure import amadeus_client
 
 
@@ -17,7 +18,7 @@ def test_get_amadeus_client_singleton(monkeypatch):
         pass
 
     class FakeClient:
-        def __init__(self, auth):
+        def __init__(self, auth, cache=None):
             self.auth = auth
             created_clients.append(self)
 
@@ -29,4 +30,157 @@ def test_get_amadeus_client_singleton(monkeypatch):
 
     assert c1 is c2
     assert len(created_clients) == 1
-    assert isinstance(c1.auth, FakeAuth)
\ No newline at end of file
+    assert isinstance(c1.auth, FakeAuth)
+
+# ============================================================
+# Async client
+# ============================================================
+
+def _mock_async_client(handler):
+    import httpx
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class FakeAsyncAuth:
+    async def aget_access_token(self):
+        return "token"
+
+
+def test_amadeus_aget_returns_json(monkeypatch):
+    import asyncio
+    import httpx
+    from app.infrastructure import amadeus_client_impl, async_http
+
+    def handler(request):
+        assert request.headers["Authorization"] == "Bearer token"
+        assert request.url.params["keyword"] == "PAR"
+        return httpx.Response(200, json={"data": [{"name": "Paris"}]})
+
+    monkeypatch.setattr(async_http, "get_async_http_client", lambda: _mock_async_client(handler))
+
+    client = amadeus_client_impl.AmadeusClient(FakeAsyncAuth())
+    result = asyncio.run(client.aget("/v1/reference-data/locations/cities", {"keyword": "PAR"}))
+
+    assert result == {"data": [{"name": "Paris"}]}
+
+
+def test_amadeus_aget_wraps_api_errors(monkeypatch):
+    import asyncio
+    import httpx
+    from app.infrastructure import amadeus_client_impl, async_http
+
+    monkeypatch.setattr(settings, "HTTP_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(
+        async_http,
+        "get_async_http_client",
+        lambda: _mock_async_client(lambda request: httpx.Response(429, text="Too many requests")),
+    )
+
+    client = amadeus_client_impl.AmadeusClient(FakeAsyncAuth())
+    result = asyncio.run(client.aget("/v2/shopping/flight-offers", {}))
+
+    assert result["error"] == "Amadeus API error"
+    assert result["status_code"] == 429
+
+
+def test_amadeus_aget_serves_repeated_queries_from_cache(monkeypatch):
+    import asyncio
+    import httpx
+    from app.infrastructure import amadeus_client_impl, async_http
+    from app.infrastructure.response_cache import MemoryResponseCache
+
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"data": [{"name": "Paris"}]})
+
+    monkeypatch.setattr(async_http, "get_async_http_client", lambda: _mock_async_client(handler))
+
+    client = amadeus_client_impl.AmadeusClient(FakeAsyncAuth(), cache=MemoryResponseCache())
+    path = "/v1/reference-data/locations/cities"
+
+    first = asyncio.run(client.aget(path, {"keyword": "PAR", "max": 1}))
+    second = asyncio.run(client.aget(path, {"max": 1, "keyword": " PAR"}))
+
+    assert first == second == {"data": [{"name": "Paris"}]}
+    assert len(calls) == 1
+
+
+def test_amadeus_errors_and_uncached_paths_are_not_cached(monkeypatch):
+    import asyncio
+    import httpx
+    from app.infrastructure import amadeus_client_impl, async_http
+    from app.infrastructure.response_cache import MemoryResponseCache
+
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        status = 400 if request.url.path.endswith("cities") else 200
+        return httpx.Response(status, json={"data": []})
+
+    monkeypatch.setattr(async_http, "get_async_http_client", lambda: _mock_async_client(handler))
+
+    client = amadeus_client_impl.AmadeusClient(FakeAsyncAuth(), cache=MemoryResponseCache())
+    for _ in range(2):
+        asyncio.run(client.aget("/v1/reference-data/locations/cities", {"keyword": "PAR"}))
+        asyncio.run(client.aget("/v9/not-configured", {}))
+
+    assert len(calls) == 4
+
+
+def test_amadeus_aget_retries_once_with_fresh_token_on_401(monkeypatch):
+    import asyncio
+    import httpx
+    from app.infrastructure import amadeus_client_impl, async_http
+
+    class RotatingAuth:
+        def __init__(self):
+            self.tokens = ["stale", "fresh"]
+            self.invalidated = []
+
+        async def aget_access_token(self):
+            return self.tokens[0]
+
+        def invalidate(self, token):
+            self.invalidated.append(token)
+            self.tokens.pop(0)
+
+    def handler(request):
+        if request.headers["Authorization"] == "Bearer stale":
+            return httpx.Response(401, text="invalid token")
+        return httpx.Response(200, json={"data": []})
+
+    monkeypatch.setattr(async_http, "get_async_http_client", lambda: _mock_async_client(handler))
+
+    auth = RotatingAuth()
+    client = amadeus_client_impl.AmadeusClient(auth)
+
+    assert asyncio.run(client.aget("/v2/shopping/flight-offers", {})) == {"data": []}
+    assert auth.invalidated == ["stale"]
+
+
+def test_amadeus_token_failures_return_error_dicts():
+    import asyncio
+    import requests
+    from app.infrastructure import amadeus_client_impl
+    from app.infrastructure.resilience import UpstreamUnavailableError
+
+    class FailingAuth:
+        def __init__(self, exc):
+            self.exc = exc
+
+        def get_access_token(self):
+            raise self.exc
+
+        async def aget_access_token(self):
+            raise self.exc
+
+    offline = amadeus_client_impl.AmadeusClient(FailingAuth(requests.ConnectionError("token endpoint down")))
+    assert offline.get("/v2/shopping/flight-offers", {})["error"] == "Network error while calling Amadeus API"
+    assert asyncio.run(offline.aget("/v2/shopping/flight-offers", {}))["error"] == "Network error while calling Amadeus API"
+
+    open_circuit = amadeus_client_impl.AmadeusClient(FailingAuth(UpstreamUnavailableError("circuit open")))
+    assert open_circuit.get("/v2/shopping/flight-offers", {})["error"] == "Amadeus temporarily unavailable"
+    assert asyncio.run(open_circuit.aget("/v2/shopping/flight-offers", {}))["error"] == "Amadeus temporarily unavailable"
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import pytest
+from app.infrastructure import dataset_cache
+from app.infrastructure.dataset_cache import DatasetCache, DatasetUnavailableError, atomic_write_text
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(dataset_cache, "_REGISTRY", {})
+
+
+def _make_stale(path):
+    old = time.time() - 3600
+    os.utime(path, (old, old))
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_atomic_write_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "data.json"
+    atomic_write_text(path, "[1]")
+    atomic_write_text(path, "[2]")
+
+    assert path.read_text() == "[2]"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_cold_load_fetches_once_and_prepares(tmp_path):
+    calls = []
+    cache = DatasetCache("demo", tmp_path / "demo.json", 60, fetch=lambda: calls.append(1) or [1, 2], prepare=sum)
+
+    assert cache.get() == 3
+    assert cache.get() == 3
+    assert len(calls) == 1
+    assert json.loads((tmp_path / "demo.json").read_text()) == [1, 2]
+
+
+def test_stale_copy_is_served_and_refreshed_once(tmp_path):
+    path = tmp_path / "demo.json"
+    path.write_text("[\"old\"]")
+    _make_stale(path)
+
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return ["new"]
+
+    cache = DatasetCache("demo", path, 60, fetch=fetch)
+
+    # Concurrent callers all get the stale copy; only one refresh runs
+    assert [cache.get() for _ in range(5)] == [["old"]] * 5
+    release.set()
+
+    assert _wait_for(lambda: cache.get() == ["new"])
+    assert len(calls) == 1
+
+    stats = dataset_cache.dataset_stats()["demo"]
+    assert stats["miss"] >= 1 and stats["stale"] >= 5 and stats["refresh"] >= 1
+    assert stats["age_seconds"] < 60
+
+
+def test_failed_refresh_keeps_stale_copy(tmp_path):
+    path = tmp_path / "demo.json"
+    path.write_text("[\"old\"]")
+    _make_stale(path)
+
+    def fail():
+        raise ConnectionError("offline")
+
+    cache = DatasetCache("demo", path, 60, fetch=fail)
+
+    assert cache.get() == ["old"]
+    assert _wait_for(lambda: dataset_cache.dataset_stats()["demo"]["refresh_error"] >= 1)
+    assert cache.get() == ["old"]
+
+
+def test_failed_refresh_backs_off_before_retrying(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_cache.settings, "DATASET_REFRESH_RETRY_SECONDS", 60)
+    path = tmp_path / "demo.json"
+    path.write_text("[\"old\"]")
+    _make_stale(path)
+
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise ConnectionError("offline")
+
+    cache = DatasetCache("demo", path, 60, fetch=fail)
+
+    cache.get()
+    assert _wait_for(lambda: calls and not cache._refresh_lock.locked())
+    for _ in range(20):
+        assert cache.get() == ["old"]
+    assert len(calls) == 1
+
+    # Once the retry interval has passed the next stale read tries again
+    cache._refresh_failed_at -= 60
+    cache.get()
+    assert _wait_for(lambda: len(calls) == 2)
+
+
+def test_cold_load_failure_raises_unavailable(tmp_path):
+    def fail():
+        raise ConnectionError("offline")
+
+    cache = DatasetCache("demo", tmp_path / "demo.json", 60, fetch=fail)
+
+    with pytest.raises(DatasetUnavailableError):
+        cache.get()
+    with pytest.raises(DatasetUnavailableError):
+        asyncio.run(cache.aget())
+
+
+def test_corrupt_binary_copy_is_rebuilt_from_json(tmp_path):
+    path = tmp_path / "demo.json"
+    path.write_text('[{"code": "IE"}]')
+    path.with_suffix(".orbd").write_bytes(b"ORBD\x00")  # truncated, and newer than the JSON
+
+    calls = []
+    cache = DatasetCache("demo", path, 60, fetch=lambda: calls.append(1) or [], binary=True)
+
+    assert [row["code"] for row in cache.get()] == ["IE"]
+    assert calls == []
+    assert dataset_cache.metrics.get_count("dataset.demo.corrupt") >= 1
+
+
+def test_unreadable_copies_fall_back_to_fetch(tmp_path):
+    path = tmp_path / "demo.json"
+    path.write_text('[{"code": "IE"')
+    path.with_suffix(".orbd").write_bytes(b"not a table")
+
+    cache = DatasetCache("demo", path, 60, fetch=lambda: [{"code": "FR"}], binary=True)
+
+    assert [row["code"] for row in cache.get()] == ["FR"]
+    assert json.loads(path.read_text()) == [{"code": "FR"}]
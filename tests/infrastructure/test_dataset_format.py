@@ -0,0 +1,78 @@
+import json
+import pytest
+from app.infrastructure import dataset_cache
+from app.infrastructure.dataset_cache import DatasetCache
+from app.infrastructure.dataset_format import ColumnarTable, encode_table, write_table
+
+
+RECORDS = [
+    {"country": "France", "city": "Paris", "phone": "+33 1"},
+    {"country": "Spain", "city": "Madrid", "phone": None},
+    {"country": "france", "city": "Marseille", "tags": ["consulate", "south"]},
+    {"country": "Japan", "city": "Tokyo", "phone": "+81 3", "staff": 12},
+]
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(dataset_cache, "_REGISTRY", {})
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_round_trip_preserves_rows(tmp_path, use_mmap):
+    path = tmp_path / "data.orbd"
+    write_table(path, RECORDS)
+    table = ColumnarTable(path, use_mmap=use_mmap)
+
+    assert len(table) == 4
+    assert table[0] == {"country": "France", "city": "Paris", "phone": "+33 1", "tags": None, "staff": None}
+    assert table[-1]["staff"] == 12
+    assert table[2]["tags"] == ["consulate", "south"]
+    assert table[1]["phone"] is None
+    assert [r["city"] for r in table] == ["Paris", "Madrid", "Marseille", "Tokyo"]
+
+
+def test_rows_for_uses_key_index_case_insensitively(tmp_path):
+    path = tmp_path / "data.orbd"
+    write_table(path, RECORDS, key="country")
+    table = ColumnarTable(path)
+
+    assert sorted(r["city"] for r in table.rows_for(" FRANCE ")) == ["Marseille", "Paris"]
+    assert table.rows_for("Atlantis") == []
+    assert table.keys() == ["france", "japan", "spain"]
+
+
+def test_binary_is_smaller_than_json():
+    records = [{"country": "France", "recommendations": "Exercise normal caution"}] * 500
+    assert len(encode_table(records)) < len(json.dumps(records, ensure_ascii=False).encode("utf-8"))
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "data.orbd"
+    path.write_bytes(b"[]")
+
+    with pytest.raises(ValueError):
+        ColumnarTable(path)
+
+
+def test_dataset_cache_loads_binary_copy(tmp_path):
+    path = tmp_path / "demo.json"
+    cache = DatasetCache("demo", path, 60, fetch=lambda: RECORDS, index_key="country", binary=True)
+
+    table = cache.get()
+    assert isinstance(table, ColumnarTable)
+    assert path.exists() and path.with_suffix(".orbd").exists()
+
+    # A fresh process (new cache object) reads the binary copy without fetching
+    reloaded = DatasetCache("demo", path, 60, fetch=lambda: pytest.fail("fetched"), binary=True).get()
+    assert len(reloaded.rows_for("spain")) == 1
+
+
+def test_dataset_cache_converts_existing_json(tmp_path):
+    path = tmp_path / "demo.json"
+    path.write_text(json.dumps(RECORDS))
+
+    cache = DatasetCache("demo", path, 60, fetch=lambda: pytest.fail("fetched"), index_key="country", binary=True)
+
+    assert [r["city"] for r in cache.get().rows_for("japan")] == ["Tokyo"]
+    assert path.with_suffix(".orbd").exists()
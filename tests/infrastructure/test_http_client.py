@@ -0,0 +1,143 @@
+import asyncio
+import io
+import httpx
+import pytest
+import requests
+from app.config.settings import settings
+from app.infrastructure import async_http, http_client
+
+
+@pytest.fixture(autouse=True)
+def reset_session():
+    """
+    Reset the shared session between tests.
+    """
+    http_client.close_http_session()
+    yield
+    http_client.close_http_session()
+
+
+# ============================================================
+# Sync session
+# ============================================================
+
+def test_get_http_session_singleton():
+    s1 = http_client.get_http_session()
+    s2 = http_client.get_http_session()
+
+    assert s1 is s2
+
+
+def test_close_http_session_creates_new_session_next_time():
+    s1 = http_client.get_http_session()
+    http_client.close_http_session()
+
+    assert http_client.get_http_session() is not s1
+
+
+def test_session_adapter_uses_pool_settings_and_leaves_retries_to_http_request():
+    adapter = http_client.get_http_session().get_adapter("https://data.gov.il/api")
+
+    assert adapter._pool_connections == settings.HTTP_POOL_CONNECTIONS
+    assert adapter._pool_maxsize == settings.HTTP_POOL_MAXSIZE
+    assert adapter.max_retries.total == 0
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+
+
+def _status_sequence(monkeypatch, statuses):
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = statuses[min(len(calls), len(statuses) - 1)]
+        response.raw = io.BytesIO(b"")
+        calls.append(method)
+        return response
+
+    limiter = CountingLimiter()
+    monkeypatch.setattr(settings, "HTTP_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(http_client, "limiter_for_url", lambda url: limiter)
+    monkeypatch.setattr(http_client.get_http_session(), "request", fake_request)
+    return calls, limiter
+
+
+def test_http_get_retries_retryable_statuses_with_a_rate_limit_slot_per_attempt(monkeypatch):
+    calls, limiter = _status_sequence(monkeypatch, [503, 429, 200])
+
+    assert http_client.http_get("https://example.com/x").status_code == 200
+    assert len(calls) == 3
+    assert limiter.acquired == 3
+
+
+def test_http_post_is_not_retried(monkeypatch):
+    calls, limiter = _status_sequence(monkeypatch, [503])
+
+    assert http_client.http_post("https://example.com/x").status_code == 503
+    assert len(calls) == 1 == limiter.acquired
+
+
+def test_host_timeout_uses_per_host_override_and_default(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_HOST_TIMEOUTS", {"data.gov.il": 20.0})
+
+    assert http_client.host_timeout("https://data.gov.il/api/3/action") == 20.0
+    assert http_client.host_timeout("https://example.com/x") == settings.HTTP_TIMEOUT
+
+
+def test_http_request_applies_host_timeout(monkeypatch):
+    seen = {}
+    ok = requests.Response()
+    ok.status_code = 200
+
+    def fake_request(method, url, **kwargs):
+        seen.update(kwargs, method=method)
+        return ok
+
+    monkeypatch.setattr(settings, "HTTP_HOST_TIMEOUTS", {"worldtimeapi.org": 7.0})
+    monkeypatch.setattr(http_client.get_http_session(), "request", fake_request)
+
+    assert http_client.http_get("http://worldtimeapi.org/api/timezone/Europe/Paris") is ok
+    assert seen == {"method": "GET", "timeout": 7.0}
+
+
+# ============================================================
+# Async client
+# ============================================================
+
+def test_ahttp_get_retries_retryable_statuses(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503 if len(calls) == 1 else 200, json={"ok": True})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(settings, "HTTP_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(async_http, "get_async_http_client", lambda: client)
+
+    response = asyncio.run(async_http.ahttp_get("https://example.com/x"))
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+def test_ahttp_post_is_not_retried(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(async_http, "get_async_http_client", lambda: client)
+
+    response = asyncio.run(async_http.ahttp_post("https://example.com/x"))
+
+    assert response.status_code == 503
+    assert len(calls) == 1
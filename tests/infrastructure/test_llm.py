@@ -96,3 +96,106 @@ def test_get_verifier_model_is_singleton(monkeypatch):
 
     assert v1 is v2
     assert len(created) == 1
+
+
+def test_cached_prompt_unchanged_for_other_models():
+    history = [{"role": "user", "content": "hi"}]
+
+    assert llm.cached_prompt("SYSTEM", history, object()) == [{"role": "system", "content": "SYSTEM"}, *history]
+
+
+def test_cached_prompt_tags_system_and_stable_history(monkeypatch):
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    monkeypatch.setattr(llm, "supports_prompt_caching", lambda model: True)
+    monkeypatch.setattr(llm.settings, "PROMPT_CACHE_MIN_TOKENS", 1)
+    history = [HumanMessage("first question"), AIMessage("first answer"), HumanMessage("follow-up")]
+
+    prompt = llm.cached_prompt("SYSTEM", history, object())
+
+    assert prompt[0]["content"] == [{"type": "text", "text": "SYSTEM", "cache_control": llm.cache_control()}]
+    assert prompt[2].content[-1]["cache_control"] == llm.cache_control()
+    # The latest turn and the caller's messages are left untouched
+    assert prompt[1] is history[0] and prompt[3] is history[2]
+    assert history[1].content == "first answer"
+
+
+def test_cached_prompt_skips_breakpoint_on_short_system_prompt(monkeypatch):
+    from app.nodes.direct import DIRECT_SYSTEM
+    from app.nodes.router import ROUTER_SYSTEM
+
+    monkeypatch.setattr(llm, "supports_prompt_caching", lambda model: True)
+
+    # Below Anthropic's minimum cacheable prefix: a breakpoint there could never produce a cache read
+    for system in (DIRECT_SYSTEM, ROUTER_SYSTEM):
+        assert llm.cached_prompt(system, [{"role": "user", "content": "hi"}], object())[0]["content"] == system
+
+
+def test_record_usage_and_report(monkeypatch):
+    from langchain_core.messages import AIMessage
+    from app.infrastructure import metrics
+
+    metrics.reset()
+    response = AIMessage(
+        "ok",
+        usage_metadata={
+            "input_tokens": 1000, "output_tokens": 10, "total_tokens": 1010,
+            "input_token_details": {"cache_read": 800, "cache_creation": 0},
+        },
+    )
+
+    llm.record_usage("router", [response, {"role": "user", "content": "ignored"}])
+
+    assert llm.prompt_cache_report()["router"] == {
+        "calls": 1, "input_tokens": 1000, "output_tokens": 10,
+        "cache_read_tokens": 800, "cache_write_tokens": 0, "cache_hit_ratio": 0.8,
+    }
+
+
+@pytest.fixture
+def anthropic_usage():
+    """
+    usage_metadata exactly as langchain-anthropic builds it from an Anthropic API usage block.
+    """
+    from anthropic.types import Usage
+    from langchain_anthropic.chat_models import _create_usage_metadata
+
+    return _create_usage_metadata(Usage(
+        input_tokens=50, output_tokens=20, cache_read_input_tokens=1200, cache_creation_input_tokens=300,
+    ))
+
+
+class FakeUsageModel:
+    def __init__(self, content, usage):
+        self.content = content
+        self.usage = usage
+
+    def invoke(self, *_args, **_kwargs):
+        from langchain_core.messages import AIMessage
+        return AIMessage(self.content, usage_metadata=self.usage)
+
+
+@pytest.mark.parametrize("node", ["router", "direct", "executor"])
+def test_each_node_records_anthropic_cache_usage(monkeypatch, anthropic_usage, node):
+    from langchain_core.messages import HumanMessage
+    from app.infrastructure import metrics
+    from app.nodes import direct, executor, router
+
+    metrics.reset()
+    state = {"messages": [HumanMessage("yes please")]}
+
+    if node == "router":
+        monkeypatch.setattr(router, "get_lightweight_chat_model", lambda **_: FakeUsageModel("DIRECT", anthropic_usage))
+        router.router_node(state)
+    elif node == "direct":
+        monkeypatch.setattr(direct, "get_lightweight_chat_model", lambda **_: FakeUsageModel("Sure.", anthropic_usage))
+        direct.direct_node(state)
+    else:
+        answer = FakeUsageModel("Done.", anthropic_usage).invoke()
+        executor._summarize_result({"messages": [*state["messages"], answer]}, len(state["messages"]))
+
+    usage = llm.prompt_cache_report()[node]
+    assert usage["input_tokens"] == 1550
+    assert usage["cache_read_tokens"] == 1200
+    assert usage["cache_write_tokens"] == 300
+    assert usage["cache_hit_ratio"] == round(1200 / 1550, 3)
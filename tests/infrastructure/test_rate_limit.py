@@ -0,0 +1,77 @@
+import asyncio
+import time
+import pytest
+from app.infrastructure import rate_limit
+from app.infrastructure.rate_limit import DailyQuota, ProviderLimiter, RateLimitExceededError, TokenBucket
+
+
+def test_bucket_allows_burst_then_spaces_calls():
+    bucket = TokenBucket(rate=10, burst=3)
+
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert waits[4] == pytest.approx(0.2, abs=0.02)
+
+
+def test_bucket_sheds_instead_of_queueing_too_long():
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.reserve()
+
+    with pytest.raises(RateLimitExceededError):
+        bucket.reserve(max_wait=0.5)
+
+    # A shed call reserves nothing: the next caller is still next in line
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_daily_quota_is_shared_and_enforced(tmp_path):
+    path = tmp_path / "quotas.sqlite3"
+    first, second = DailyQuota("demo", 3, path), DailyQuota("demo", 3, path)
+
+    first.consume()
+    second.consume()
+    first.consume()
+
+    with pytest.raises(RateLimitExceededError):
+        second.consume()
+    assert first.used() == 3
+    assert DailyQuota("other", 3, path).used() == 0
+
+
+def test_limiter_waits_without_blocking_the_loop(tmp_path):
+    limiter = ProviderLimiter("demo", rate=20, burst=1, max_wait=1, quota_path=tmp_path / "q.sqlite3")
+
+    async def run():
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.aacquire() for _ in range(3)))
+        return time.monotonic() - started
+
+    assert 0.08 <= asyncio.run(run()) < 0.5
+
+
+def test_limiter_for_url_maps_hosts_to_providers(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_LIMITERS", {})
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMITS", {"demo": {"rate": 5, "burst": 2}})
+    monkeypatch.setattr(rate_limit.settings, "RATE_LIMIT_HOSTS", {"api.example.com": "demo"})
+
+    limiter = rate_limit.limiter_for_url("https://api.example.com/v1/x?y=1")
+
+    assert limiter is rate_limit.get_limiter("demo")
+    assert limiter.quota is None
+    assert rate_limit.limiter_for_url("https://other.example.com/") is None
+
+
+def test_http_request_sheds_with_clear_error(monkeypatch):
+    from app.infrastructure import http_client
+
+    class Exhausted:
+        def acquire(self):
+            raise RateLimitExceededError("demo: daily quota of 1 calls is exhausted; try again later")
+
+    monkeypatch.setattr(http_client, "limiter_for_url", lambda url: Exhausted())
+    monkeypatch.setattr(http_client, "get_http_session", lambda: pytest.fail("request was sent"))
+
+    with pytest.raises(RateLimitExceededError, match="daily quota"):
+        http_client.http_get("https://api.example.com/")
@@ -0,0 +1,167 @@
+import asyncio
+import io
+import time
+import httpx
+import pytest
+import requests
+from app.config.settings import settings
+from app.infrastructure import async_http, http_client, resilience
+from app.infrastructure.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(resilience, "_BREAKERS", {})
+    monkeypatch.setattr(resilience, "_TRACKERS", {})
+    monkeypatch.setattr(settings, "HTTP_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(settings, "HTTP_HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(settings, "HTTP_HEDGE_MIN_DELAY", 0.05)
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+# ============================================================
+# Circuit breaker
+# ============================================================
+
+def test_breaker_opens_after_threshold_and_probes_after_reset():
+    breaker = CircuitBreaker("api.example.com", failure_threshold=2, reset_seconds=0.05)
+
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == resilience.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()  # the probe
+    assert breaker.state == resilience.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # others still fail fast while the probe runs
+
+    breaker.record_success()
+    assert breaker.snapshot() == {"state": "closed", "consecutive_failures": 0}
+
+
+def test_failed_probe_reopens_immediately():
+    breaker = CircuitBreaker("api.example.com", failure_threshold=5, reset_seconds=0.0)
+    for _ in range(5):
+        breaker.record_failure()
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == resilience.OPEN
+
+
+def test_http_request_fails_fast_once_host_is_down(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_BREAKER_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "HTTP_MAX_RETRIES", 0)  # one upstream call per request
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        calls.append(url)
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(http_client.get_http_session(), "request", fake_request)
+    url = "http://worldtimeapi.org/api/timezone/Europe/Paris"
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            http_client.http_get(url)
+    with pytest.raises(CircuitOpenError):
+        http_client.http_get(url)
+
+    assert len(calls) == 2
+    assert resilience.breaker_states()["worldtimeapi.org"]["state"] == "open"
+
+
+def test_ahttp_request_counts_5xx_as_failures(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_BREAKER_FAILURE_THRESHOLD", 1)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+    monkeypatch.setattr(async_http, "get_async_http_client", lambda: client)
+
+    response = asyncio.run(async_http.ahttp_get("https://api.example.com/x"))
+
+    assert response.status_code == 503
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(async_http.ahttp_get("https://api.example.com/x"))
+
+# ============================================================
+# Hedging
+# ============================================================
+
+def test_latency_tracker_needs_samples_and_floors_delay():
+    tracker = LatencyTracker(window=10)
+    tracker.record(0.001)
+    assert tracker.hedge_delay() is None
+
+    tracker.record(0.002)
+    tracker.record(0.2)
+    assert tracker.hedge_delay() == 0.2
+
+    assert resilience.hedge_delay("POST", "https://api.example.com/") is None
+
+
+def test_latency_is_tracked_per_endpoint():
+    for _ in range(3):
+        resilience.get_latency_tracker("api.example.com/v2/shopping/flight-offers").record(5.0)
+
+    assert resilience.hedge_delay("GET", "https://api.example.com/v2/shopping/flight-offers?max=5") == 5.0
+    assert resilience.hedge_delay("GET", "https://api.example.com/v1/reference-data/locations/cities") is None
+    assert resilience.endpoint_of(
+        "https://data.gov.il/api/3/action/datastore_search?limit=5", {"resource_id": "abc"}
+    ) == "data.gov.il/api/3/action/datastore_search?resource_id=abc"
+
+
+def test_slow_get_is_hedged_and_fastest_response_wins(monkeypatch):
+    fast, slow = _response(200), _response(200)
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        calls.append(url)
+        if len(calls) == 1:
+            time.sleep(0.5)  # stuck primary
+            return slow
+        return fast
+
+    monkeypatch.setattr(http_client.get_http_session(), "request", fake_request)
+    for _ in range(3):
+        resilience.get_latency_tracker("api.example.com/x").record(0.01)
+
+    started = time.monotonic()
+    assert http_client.http_get("https://api.example.com/x") is fast
+    assert time.monotonic() - started < 0.4
+    assert len(calls) == 2
+
+
+def test_async_hedge_cancels_the_slow_request(monkeypatch):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(0.5)
+            return httpx.Response(200, json={"from": "primary"})
+        return httpx.Response(200, json={"from": "hedge"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(async_http, "get_async_http_client", lambda: client)
+    for _ in range(3):
+        resilience.get_latency_tracker("api.example.com/x").record(0.01)
+
+    async def run():
+        started = time.monotonic()
+        response = await async_http.ahttp_get("https://api.example.com/x")
+        return response.json(), time.monotonic() - started
+
+    body, elapsed = asyncio.run(run())
+    assert body == {"from": "hedge"}
+    assert elapsed < 0.4
@@ -0,0 +1,71 @@
+from app.infrastructure.response_cache import (
+    MemoryResponseCache,
+    SQLiteResponseCache,
+    TieredResponseCache,
+    canonical_key,
+    ttl_for,
+)
+
+
+def test_canonical_key_ignores_param_order_spacing_and_none():
+    a = canonical_key("/v1/x", {"b": 2, "a": " PAR ", "c": None})
+    b = canonical_key("/v1/x", {"a": "PAR", "b": "2"})
+
+    assert a == b
+    assert canonical_key("/v1/x", {"flag": True}) == canonical_key("/v1/x", {"flag": "true"})
+    assert a != canonical_key("/v1/y", {"a": "PAR", "b": "2"})
+
+
+def test_ttl_for_uses_longest_prefix():
+    policies = {"/v1/reference-data": 100, "/v1/reference-data/locations/cities": 900, "/v2/off": 0}
+
+    assert ttl_for("/v1/reference-data/locations/cities", policies) == 900
+    assert ttl_for("/v1/reference-data/airlines", policies) == 100
+    assert ttl_for("/v2/off", policies) is None
+    assert ttl_for("/v3/other", policies) is None
+
+
+def test_memory_cache_expires_and_evicts_lru():
+    cache = MemoryResponseCache(max_entries=2)
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    cache.get("a")
+    cache.set("c", 3, 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("d", 4, -1)
+    assert cache.get("d") is None
+
+
+def test_memory_cache_hands_out_copies():
+    cache = MemoryResponseCache()
+    response = {"data": [{"iataCode": "PAR"}]}
+    cache.set("k", response, 60)
+
+    response["data"].clear()
+    cache.get("k")["data"].pop()
+
+    assert cache.get("k") == {"data": [{"iataCode": "PAR"}]}
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = tmp_path / "responses.sqlite3"
+    SQLiteResponseCache(path).set("k", {"data": [1]}, 60)
+    SQLiteResponseCache(path).set("old", {"data": []}, -1)
+
+    other = SQLiteResponseCache(path)
+    assert other.get("k") == {"data": [1]}
+    assert other.get("old") is None
+
+
+def test_tiered_cache_promotes_shared_hits(tmp_path):
+    shared = SQLiteResponseCache(tmp_path / "responses.sqlite3")
+    shared.set("k", {"v": 1}, 60)
+    tiered = TieredResponseCache(MemoryResponseCache(), shared)
+
+    assert tiered.get("k") == {"v": 1}
+    shared.close()
+    (tmp_path / "responses.sqlite3").unlink()
+    assert tiered.memory.get("k") == {"v": 1}
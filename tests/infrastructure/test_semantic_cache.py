@@ -0,0 +1,70 @@
+import pytest
+from app.infrastructure import metrics, semantic_cache
+from app.infrastructure.semantic_cache import SemanticCache, _dot, embed, normalize_query
+
+
+@pytest.fixture(params=["numpy", "pure_python"])
+def cache(request, monkeypatch):
+    if request.param == "pure_python":
+        monkeypatch.setattr(semantic_cache, "np", None)
+    elif semantic_cache.np is None:
+        pytest.skip("numpy not installed")
+
+    metrics.reset()
+    return SemanticCache(threshold=0.85, max_entries=3, ttl_seconds=60)
+
+
+def test_normalize_query():
+    assert normalize_query("  Tips for LONG-HAUL flights?") == "tips for long haul flights"
+
+
+def test_embedding_is_stable_and_normalized():
+    vector = embed("What food is Ireland famous for?")
+    assert vector == embed("what food is ireland famous for")
+    assert abs(sum(w * w for w in vector.values()) - 1.0) < 1e-9
+    assert embed("?!") == {}
+
+
+def test_paraphrase_hits_and_other_entity_misses(cache):
+    cache.store("What food is Ireland famous for?", "Irish stew")
+
+    assert cache.lookup("which foods is ireland famous for") == "Irish stew"
+    assert cache.lookup("What food is Italy famous for?") is None
+    assert metrics.get_count("semantic_cache.hit") == 1
+    assert metrics.get_count("semantic_cache.miss") == 1
+
+
+def test_negation_does_not_hit(cache):
+    cache.store("is it safe to drink tap water in Mexico", "Better not")
+
+    assert cache.lookup("is it not safe to drink tap water in Mexico") is None
+    assert cache.lookup("isn't it safe to drink tap water in Mexico") is None
+    assert cache.lookup("Is it safe to drink the tap water in Mexico?") == "Better not"
+
+
+def test_long_questions_about_other_cities_do_not_hit(cache):
+    question = "what are the best neighborhoods to stay in {} for a family trip with young kids in summer during the school holidays"
+    cache.store(question.format("Paris"), "Paris")
+
+    # Cosine similarity alone is above the threshold here
+    assert _dot(embed(question.format("Paris")), embed(question.format("Rome"))) > cache.threshold
+    assert cache.lookup(question.format("Rome")) is None
+
+
+def test_lru_eviction(cache):
+    for country in ("France", "Spain", "Japan"):
+        cache.store(f"what is {country} famous for", country)
+    cache.lookup("what is France famous for")  # France becomes most recently used
+    cache.store("what is Peru famous for", "Peru")
+
+    assert len(cache) == 3
+    assert cache.lookup("what is Spain famous for") is None
+    assert cache.lookup("what is France famous for") == "France"
+
+
+def test_expired_entries_are_dropped(cache, monkeypatch):
+    cache.store("tips for long haul flights", "Hydrate")
+    monkeypatch.setattr(semantic_cache.time, "time", lambda: 10**12)
+
+    assert cache.lookup("long haul flight tips") is None
+    assert len(cache) == 0
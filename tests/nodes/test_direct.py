@@ -68,4 +68,63 @@ def test_direct_node_returns_llm_response(monkeypatch):
     result = direct_node(state)
 
     assert result["execution"] == "Direct answer"
-    assert result["verified"] is False
\ No newline at end of file
+    assert result["verified"] is False
+
+# ============================================================
+# Async path
+# ============================================================
+
+class FakeAsyncLLM(FakeLLM):
+    async def ainvoke(self, *_args, **_kwargs):
+        return FakeResponse(self._content)
+
+
+def test_adirect_node_returns_llm_response(monkeypatch):
+    import asyncio
+    from app.nodes.direct import adirect_node
+
+    monkeypatch.setattr(
+        "app.nodes.direct.get_lightweight_chat_model",
+        lambda **_: FakeAsyncLLM("Async answer"),
+    )
+
+    result = asyncio.run(adirect_node({"messages": [{"role": "user", "content": "Hi"}]}))
+
+    assert result == {"execution": "Async answer", "verified": False}
+
+# ============================================================
+# Semantic cache
+# ============================================================
+
+def test_direct_node_serves_repeated_question_from_cache(monkeypatch):
+    from app.infrastructure.semantic_cache import SemanticCache
+
+    cache = SemanticCache(threshold=0.85, max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr("app.nodes.direct.get_semantic_cache", lambda: cache)
+    monkeypatch.setattr("app.nodes.direct.get_lightweight_chat_model", lambda **_: FakeLLM("Irish stew"))
+
+    direct_node({"messages": [{"role": "user", "content": "What food is Ireland famous for?"}]})
+
+    monkeypatch.setattr("app.nodes.direct.get_lightweight_chat_model", lambda **_: FakeLLM("regenerated"))
+    result = direct_node({"messages": [{"role": "user", "content": "which foods is ireland famous for"}]})
+
+    assert result == {"execution": "Irish stew", "verified": False}
+
+
+def test_direct_node_does_not_cache_follow_ups(monkeypatch):
+    from app.infrastructure.semantic_cache import SemanticCache
+
+    cache = SemanticCache(threshold=0.85, max_entries=10, ttl_seconds=60)
+    cache.store("Which neighborhood should we stay in?", "Another user's answer")
+    monkeypatch.setattr("app.nodes.direct.get_semantic_cache", lambda: cache)
+    monkeypatch.setattr("app.nodes.direct.get_lightweight_chat_model", lambda **_: FakeLLM("In Reykjavik, 101"))
+
+    history = [
+        {"role": "user", "content": "We're going to Reykjavik with the kids"},
+        {"role": "assistant", "content": "Great choice!"},
+    ]
+    for follow_up in ("What about the weather in March?", "Which neighborhood should we stay in?"):
+        result = direct_node({"messages": [*history, {"role": "user", "content": follow_up}]})
+        assert result["execution"] == "In Reykjavik, 101"
+
+    assert len(cache) == 1
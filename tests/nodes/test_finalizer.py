@@ -1,4 +1,8 @@
-from app.nodes.finalizer import finalizer_node
+from app.nodes.finalizer import (
+    finalizer_node,
+    speculative_finalizer_node,
+    verification_annotation_node,
+)
 
 
 # ============================================================
@@ -111,3 +115,45 @@ def test_finalizer_combines_multiple_warnings():
     assert "could not be fully verified" in final
     assert "not grounded in tool invocation" in final
     assert "---" in final
+
+
+# ============================================================
+# Speculative finalization
+# ============================================================
+
+def test_speculative_finalizer_omits_pending_verification_warning():
+    state = {
+        "execution": "Answer",
+        "verified": False,
+        "tools_used": True,
+        "route": "PLAN",
+    }
+
+    result = speculative_finalizer_node(state)
+
+    assert result["final_answer"] == "Answer"
+    assert result["messages"][0]["id"] == result["answer_message_id"]
+
+
+def test_verification_annotation_keeps_answer_when_verified():
+    result = verification_annotation_node(
+        {"execution": "Answer", "verified": True, "tools_used": True, "route": "PLAN"}
+    )
+
+    assert result == {"annotation": ""}
+
+
+def test_verification_annotation_replaces_message_when_invalid():
+    state = {
+        "execution": "Answer",
+        "verified": False,
+        "tools_used": True,
+        "route": "PLAN",
+        "answer_message_id": "msg-1",
+    }
+
+    result = verification_annotation_node(state)
+
+    assert "could not be fully verified" in result["final_answer"]
+    assert result["messages"][0]["id"] == "msg-1"
+    assert result["messages"][0]["content"] == result["final_answer"]
@@ -0,0 +1,178 @@
+import pytest
+from app.nodes import pre_router
+from app.nodes.router import router_node
+from app.infrastructure import metrics
+
+
+@pytest.fixture(autouse=True)
+def isolated_classifier(monkeypatch, tmp_path):
+    """
+    Use an empty decision log and a fresh classifier for every test.
+    """
+    monkeypatch.setattr(pre_router, "DECISIONS_PATH", tmp_path / "decisions.jsonl")
+    monkeypatch.setattr(pre_router, "_CLASSIFIER", None)
+    metrics.reset()
+
+
+class FakeResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:
+    def __init__(self, content: str):
+        self._content = content
+        self.calls = 0
+
+    def invoke(self, *_args, **_kwargs):
+        self.calls += 1
+        return FakeResponse(self._content)
+
+
+# ============================================================
+# Rules
+# ============================================================
+
+def test_classify_query_flight_request_is_plan():
+    route, confidence = pre_router.classify_query(
+        "Find me a flight from TLV to DUB next week"
+    )
+
+    assert route == "PLAN"
+    assert confidence >= 0.9
+
+
+def test_classify_query_off_topic():
+    route, _ = pre_router.classify_query(
+        "Do you think a book is a good gift for a friend's birthday?"
+    )
+
+    assert route == "OFF_TOPIC"
+
+
+def test_classify_query_evergreen_question_is_direct():
+    route, _ = pre_router.classify_query("What food is Ireland famous for?")
+
+    assert route == "DIRECT"
+
+
+def test_classify_query_short_follow_up_is_ambiguous():
+    assert pre_router.classify_query("yes please") == (None, 0.0)
+
+
+def test_classify_query_non_string_is_ambiguous():
+    assert pre_router.classify_query([{"type": "text", "text": "hi"}]) == (None, 0.0)
+
+
+# ============================================================
+# Classifier
+# ============================================================
+
+def test_classifier_learns_from_decisions(monkeypatch):
+    monkeypatch.setattr(pre_router.settings, "ROUTER_CLASSIFIER_MIN_SAMPLES", 4)
+
+    for _ in range(3):
+        pre_router.record_decision("recommend a romantic getaway in europe", "PLAN")
+    pre_router.record_decision("write me a limerick about cats", "OFF_TOPIC")
+
+    route, _ = pre_router._get_classifier().predict("recommend a romantic getaway")
+
+    assert route == "PLAN"
+    assert pre_router.DECISIONS_PATH.read_text(encoding="utf-8").count("\n") == 4
+
+    # No rule fires for this turn, so the classifier alone does not settle it
+    assert pre_router.classify_query("recommend a romantic getaway") == (None, 0.0)
+
+
+def _train(monkeypatch, samples: int = 60):
+    monkeypatch.setattr(pre_router.settings, "ROUTER_CLASSIFIER_MIN_SAMPLES", samples)
+
+    decisions = [
+        ("write me a python function to sort a list", "OFF_TOPIC"),
+        ("what is the integral of x squared", "OFF_TOPIC"),
+        ("find me a flight from TLV to DUB", "PLAN"),
+        ("is Ireland safe to visit in January", "PLAN"),
+        ("what is Italy famous for", "DIRECT"),
+        ("tips for long haul flights with kids", "DIRECT"),
+    ]
+    for i in range(samples):
+        query, route = decisions[i % len(decisions)]
+        pre_router.record_decision(query, route)
+
+
+@pytest.mark.parametrize("query", [
+    "tell me more about the second option please",
+    "and how about doing that for my sister too",
+    "yes please do that for me",
+])
+def test_trained_classifier_does_not_fast_path_follow_ups(monkeypatch, query):
+    _train(monkeypatch)
+
+    assert pre_router.classify_query(query) == (None, 0.0)
+
+
+def test_trained_classifier_confirms_rule_decision(monkeypatch):
+    _train(monkeypatch)
+
+    route, confidence = pre_router.classify_query("Find me a flight from TLV to DUB next week")
+
+    assert route == "PLAN"
+    assert confidence >= 0.9
+
+
+def test_modal_may_is_not_a_date():
+    assert not pre_router._DATE_RE.search("you may want to pack light")
+    assert pre_router._DATE_RE.search("flying out on may 14")
+    assert pre_router._DATE_RE.search("somewhere warm in may")
+
+
+# ============================================================
+# Router integration
+# ============================================================
+
+def test_router_fast_path_skips_llm(monkeypatch):
+    fake = FakeLLM("DIRECT")
+    monkeypatch.setattr("app.nodes.router.get_lightweight_chat_model", lambda **_: fake)
+
+    state = {"messages": [{"role": "user", "content": "Is Ireland safe to visit in January?"}]}
+    result = router_node(state)
+
+    assert result["route"] == "PLAN"
+    assert fake.calls == 0
+    assert metrics.get_count("router.fast_path") == 1
+
+
+def test_router_ambiguous_turn_uses_llm_and_records(monkeypatch):
+    fake = FakeLLM("DIRECT")
+    monkeypatch.setattr("app.nodes.router.get_lightweight_chat_model", lambda **_: fake)
+
+    state = {"messages": [{"role": "user", "content": "yes please"}]}
+    result = router_node(state)
+
+    assert result["route"] == "DIRECT"
+    assert fake.calls == 1
+    assert metrics.get_count("router.llm") == 1
+    assert '"route": "DIRECT"' in pre_router.DECISIONS_PATH.read_text(encoding="utf-8")
+
+
+def test_decision_log_rotates_and_classifier_reads_both_generations(monkeypatch):
+    monkeypatch.setattr(pre_router.settings, "ROUTER_DECISIONS_MAX_BYTES", 100)
+
+    for i in range(6):
+        pre_router.record_decision(f"recommend a romantic getaway number {i}", "PLAN")
+
+    # Each line is ~70 bytes: the log rotates every second write and only one old generation is kept
+    assert pre_router.DECISIONS_PATH.read_text(encoding="utf-8").count("\n") == 2
+    assert pre_router._previous_log_path().read_text(encoding="utf-8").count("\n") == 2
+
+    monkeypatch.setattr(pre_router, "_CLASSIFIER", None)
+    assert pre_router._get_classifier().samples == 4
+
+
+def test_decision_log_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(pre_router.settings, "ROUTER_DECISIONS_LOG_ENABLED", False)
+
+    pre_router.record_decision("write me a limerick about cats", "OFF_TOPIC")
+
+    assert not pre_router.DECISIONS_PATH.exists()
+    assert pre_router._get_classifier().samples == 1
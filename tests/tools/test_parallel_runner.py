@@ -0,0 +1,136 @@
+import asyncio
+import time
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from app.tools.parallel_runner import ParallelToolRunner
+
+
+# ============================================================
+# Helpers
+# ============================================================
+
+class FakeToolCallingModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **_kwargs):
+        return self
+
+
+RUNS = []  # (start, end) of every slow_a / slow_b call
+
+
+def _timed_sleep(seconds):
+    start = time.perf_counter()
+    time.sleep(seconds)
+    RUNS.append((start, time.perf_counter()))
+
+
+@tool
+def slow_a(x: str) -> str:
+    """Slow tool A."""
+    _timed_sleep(0.3)
+    return f"a:{x}"
+
+
+@tool
+def slow_b(x: str) -> str:
+    """Slow tool B."""
+    _timed_sleep(0.3)
+    return f"b:{x}"
+
+
+@tool
+def hangs(x: str) -> str:
+    """Tool that never finishes in time."""
+    time.sleep(2)
+    return "late"
+
+
+def _agent(tool_names, runner):
+    calls = [{"name": n, "args": {"x": str(i)}, "id": f"call-{i}"} for i, n in enumerate(tool_names)]
+    model = FakeToolCallingModel(messages=iter([
+        AIMessage(content="", tool_calls=calls),
+        AIMessage(content="done"),
+    ]))
+    return create_agent(model=model, tools=[slow_a, slow_b, hangs], middleware=[runner])
+
+
+def _tool_messages(result):
+    return [m for m in result["messages"] if isinstance(m, ToolMessage)]
+
+
+# ============================================================
+# Tests
+# ============================================================
+
+def test_tool_calls_run_concurrently_and_keep_order():
+    RUNS.clear()
+    agent = _agent(["slow_a", "slow_b", "slow_a"], ParallelToolRunner(max_workers=4, default_timeout=5, timeouts={}))
+
+    start = time.perf_counter()
+    result = agent.invoke({"messages": [{"role": "user", "content": "go"}]})
+    elapsed = time.perf_counter() - start
+
+    assert [m.content for m in _tool_messages(result)] == ["a:0", "b:1", "a:2"]
+    assert elapsed < 0.8  # sequential would take ~0.9s
+    # Every call started before any other finished
+    assert max(start for start, _ in RUNS) < min(end for _, end in RUNS)
+
+
+def test_tool_timeout_returns_error_message():
+    agent = _agent(["slow_a", "hangs"], ParallelToolRunner(max_workers=4, default_timeout=5, timeouts={"hangs": 0.5}))
+
+    result = agent.invoke({"messages": [{"role": "user", "content": "go"}]})
+    messages = _tool_messages(result)
+
+    assert messages[0].content == "a:0"
+    assert messages[1].status == "error"
+    assert "timed out" in messages[1].content
+
+
+def test_async_path_is_bounded_and_times_out():
+    agent = _agent(["slow_a", "hangs"], ParallelToolRunner(max_workers=1, default_timeout=5, timeouts={"hangs": 0.5}))
+
+    result = asyncio.run(agent.ainvoke({"messages": [{"role": "user", "content": "go"}]}))
+    messages = _tool_messages(result)
+
+    assert messages[0].content == "a:0"
+    assert messages[1].status == "error"
+
+
+def test_queue_wait_does_not_count_against_timeout():
+    # One slot: the second call waits ~0.3s for it, then runs 0.3s, within its 0.5s budget
+    agent = _agent(["slow_a", "slow_b"], ParallelToolRunner(max_workers=1, default_timeout=0.5, timeouts={}))
+
+    result = agent.invoke({"messages": [{"role": "user", "content": "go"}]})
+
+    assert [m.content for m in _tool_messages(result)] == ["a:0", "b:1"]
+
+
+def test_timed_out_call_gives_its_slot_back():
+    runner = ParallelToolRunner(max_workers=1, default_timeout=5, timeouts={"hangs": 0.2})
+    _agent(["hangs"], runner).invoke({"messages": [{"role": "user", "content": "go"}]})
+
+    # "hangs" is still sleeping in the background, yet the only slot is free again
+    start = time.perf_counter()
+    result = _agent(["slow_a"], runner).invoke({"messages": [{"role": "user", "content": "go"}]})
+
+    assert _tool_messages(result)[0].content == "a:0"
+    assert time.perf_counter() - start < 1.0
+
+
+def test_abandoned_calls_are_capped():
+    runner = ParallelToolRunner(max_workers=2, max_abandoned=1, default_timeout=5, timeouts={"hangs": 0.2})
+    _agent(["hangs"], runner).invoke({"messages": [{"role": "user", "content": "go"}]})
+
+    # One hanging call is already abandoned: new calls are refused instead of starting more threads
+    refused = _tool_messages(_agent(["slow_a"], runner).invoke({"messages": [{"role": "user", "content": "go"}]}))
+    assert refused[0].status == "error"
+    assert "unavailable" in refused[0].content
+
+    # Once the abandoned call returns, calls run again
+    deadline = time.perf_counter() + 3
+    while runner._abandoned and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    result = _agent(["slow_a"], runner).invoke({"messages": [{"role": "user", "content": "go"}]})
+    assert _tool_messages(result)[0].content == "a:0"
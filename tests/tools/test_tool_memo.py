@@ -0,0 +1,89 @@
+import asyncio
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from app.infrastructure.response_cache import SQLiteResponseCache
+from app.tools.tool_memo import ToolMemoizer
+
+
+# ============================================================
+# Helpers
+# ============================================================
+
+class FakeToolCallingModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **_kwargs):
+        return self
+
+
+CALLS = []
+
+
+@tool
+def warnings(country: str, detailed: bool = False) -> dict:
+    """Travel warnings for a country."""
+    CALLS.append(country)
+    if country == "Atlantis":
+        return {"error": "unknown country"}
+    return {"country": country, "warnings": ["Exercise caution"]}
+
+
+@tool
+def clock() -> str:
+    """Current time."""
+    CALLS.append("clock")
+    return "12:00"
+
+
+def _run(memo, thread_id, name, args, use_async=False):
+    model = FakeToolCallingModel(messages=iter([
+        AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": "call-1"}]),
+        AIMessage(content="done"),
+    ]))
+    agent = create_agent(model=model, tools=[warnings, clock], middleware=[memo])
+    inputs = {"messages": [{"role": "user", "content": "go"}]}
+    config = {"configurable": {"thread_id": thread_id}} if thread_id else {}
+
+    result = asyncio.run(agent.ainvoke(inputs, config)) if use_async else agent.invoke(inputs, config)
+    return [m for m in result["messages"] if isinstance(m, ToolMessage)][0]
+
+
+def _memo(tmp_path, **kwargs):
+    CALLS.clear()
+    return ToolMemoizer(store=SQLiteResponseCache(tmp_path / "memo.sqlite3"), ttls={"clock": 0}, default_ttl=60, **kwargs)
+
+
+# ============================================================
+# Tests
+# ============================================================
+
+def test_repeated_call_in_a_thread_is_memoized(tmp_path):
+    memo = _memo(tmp_path)
+
+    first = _run(memo, "t1", "warnings", {"country": "Ireland"})
+    second = _run(memo, "t1", "warnings", {"country": "Ireland", "detailed": False}, use_async=True)
+
+    assert CALLS == ["Ireland"]
+    assert second.content == first.content
+    assert second.tool_call_id == "call-1"
+
+
+def test_memo_is_scoped_to_the_thread_and_survives_restarts(tmp_path):
+    _run(_memo(tmp_path), "t1", "warnings", {"country": "Ireland"})
+
+    restarted = ToolMemoizer(store=SQLiteResponseCache(tmp_path / "memo.sqlite3"), default_ttl=60)
+    _run(restarted, "t1", "warnings", {"country": "Ireland"})
+    _run(restarted, "t2", "warnings", {"country": "Ireland"})
+
+    assert CALLS == ["Ireland", "Ireland"]
+
+
+def test_errors_zero_ttl_tools_and_threadless_calls_are_not_memoized(tmp_path):
+    memo = _memo(tmp_path)
+
+    for _ in range(2):
+        _run(memo, "t1", "warnings", {"country": "Atlantis"})
+        _run(memo, "t1", "clock", {})
+        _run(memo, None, "warnings", {"country": "Ireland"})
+
+    assert CALLS == ["Atlantis", "clock", "Ireland"] * 2
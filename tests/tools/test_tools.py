@@ -56,6 +56,27 @@ def test_search_flights_tool(monkeypatch):
     assert result[0]["id"] == "1"
 
 
+def test_search_flight_matrix_tool(monkeypatch):
+    captured = {}
+
+    def fake_search_flight_matrix(**kwargs):
+        captured.update(kwargs)
+        return {"prices": {"TLV-ATH": {"2025-01-01": 100.0}}, "cheapest": []}
+
+    monkeypatch.setattr(tools, "search_flight_matrix", fake_search_flight_matrix)
+
+    result = tools.search_flight_matrix_tool.invoke(
+        {
+            "origins": ["TLV"],
+            "destinations": ["ATH"],
+            "departure_date_from": "2025-01-01",
+            "departure_date_to": "2025-01-03",
+        }
+    )
+
+    assert result["prices"]["TLV-ATH"]["2025-01-01"] == 100.0
+    assert captured["departure_to"].isoformat() == "2025-01-03"
+
 def test_travel_recommendations_tool(monkeypatch):
     def fake_get_travel_recommendations(city, country_code, k):
         return {
@@ -161,3 +182,23 @@ def test_get_israeli_embassy_contacts_tool(monkeypatch):
 
     assert isinstance(result, list)
     assert result[0]["country"] == "France"
+
+
+def test_io_tools_use_native_coroutine_on_ainvoke(monkeypatch):
+    import asyncio
+
+    async def fake_afetch_climate_data(place_name, month):
+        return {"place": place_name, "month": month, "async": True}
+
+    def fail_sync(**_kwargs):
+        raise AssertionError("sync domain function must not be used on ainvoke")
+
+    monkeypatch.setattr(tools, "afetch_climate_data", fake_afetch_climate_data)
+    monkeypatch.setattr(tools, "fetch_climate_data", fail_sync)
+
+    result = asyncio.run(
+        tools.get_place_climate.ainvoke({"place_name": "Dublin", "month": "January"})
+    )
+
+    assert result["async"] is True
+    assert result["place"] == "Dublin"